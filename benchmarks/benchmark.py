@@ -0,0 +1,262 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import misc as m
+
+# Input sizes, in characters, from 10 B to 100 MB
+DEFAULT_SIZES = (10, 1_000, 100_000, 10_000_000, 100_000_000)
+
+# Key lengths, from a single letter to 256 letters
+DEFAULT_KEY_LENGTHS = (1, 16, 256)
+
+# Minimum time spent timing each case, in seconds, and bounds on the number of timed runs
+MIN_TIME = 0.2
+MIN_RUNS = 3
+MAX_RUNS = 1000
+
+# Allowed slowdown (or memory growth) over the baseline before a case is reported as a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+def random_text(size: int, seed: int = 0) -> str:
+    """
+    Builds a reproducible random text of the given length over the Spanish alphabet.
+
+    Parameters:
+        size (int): The number of characters.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        str: The random text.
+    """
+    rng = np.random.default_rng(seed)
+    return a.SPANISH.decode(rng.integers(0, len(a.SPANISH), size))
+
+
+def _cipher_case(needs_key_text):
+    """
+    Builds the setup of a cipher benchmark: the arguments of one call for a given size and key length.
+    """
+    def setup(size, key_length):
+        text = random_text(size)
+        key = random_text(key_length, seed=1) if needs_key_text else 7
+        return (text, key)
+    return setup
+
+
+def _decipher_case(encrypt):
+    """
+    Builds the setup of a decipher benchmark, whose input is the output of the matching cipher.
+    """
+    def setup(size, key_length):
+        key = random_text(key_length, seed=1)
+        return (encrypt(random_text(size), key), key)
+    return setup
+
+
+# A 3 x 3 Hill key whose matrix is invertible modulo 27
+HILL_KEY = 'GYBNQKURP'
+
+
+def _hill_case(size, key_length):
+    return (random_text(size), HILL_KEY)
+
+
+def _hill_decipher_case(size, key_length):
+    return (cm.hill_cipher(random_text(size), HILL_KEY), HILL_KEY)
+
+
+def _split_case(size, key_length):
+    return (random_text(size), key_length)
+
+
+def _columns_case(size, key_length):
+    return (m.split_sentence_into_columns(random_text(size), key_length),)
+
+
+def _lists_case(size, key_length):
+    rows = max(size // key_length, 1)
+    text = random_text(rows * key_length)
+    return ([text[start:start + rows] for start in range(0, len(text), rows)],)
+
+
+def _fill_case(size, key_length):
+    return (random_text(key_length, seed=1), size)
+
+
+# Benchmarked functions: name -> (function, setup(size, key_length) -> arguments, uses key length)
+CASES = {
+    'transposition_cipher': (cm.transposition_cipher, _cipher_case(True), True),
+    'transposition_decipher': (cm.transposition_decipher, _decipher_case(cm.transposition_cipher), True),
+    'caesar_cipher': (cm.caesar_cipher, _cipher_case(False), False),
+    'caesar_decipher': (cm.caesar_decipher, _cipher_case(False), False),
+    'vigenere_cipher': (cm.vigenere_cipher, _cipher_case(True), True),
+    'vigenere_decipher': (cm.vigenere_decipher, _decipher_case(cm.vigenere_cipher), True),
+    'hill_cipher': (cm.hill_cipher, _hill_case, False),
+    'hill_decipher': (cm.hill_decipher, _hill_decipher_case, False),
+    'split_sentence_into_columns': (m.split_sentence_into_columns, _split_case, True),
+    'columns_to_words': (m.columns_to_words, _columns_case, True),
+    'lists_to_columns': (m.lists_to_columns, _lists_case, True),
+    'fill_text': (m.fill_text, _fill_case, True),
+}
+
+
+def measure(function, arguments, min_time: float = MIN_TIME):
+    """
+    Times repeated calls of a function and measures the peak memory of one extra call.
+
+    The memory is traced in a separate call because tracemalloc slows the code it traces.
+
+    Parameters:
+        function (callable): The function to benchmark.
+        arguments (tuple): The arguments of every call.
+        min_time (float): The minimum total time spent in timed calls, in seconds.
+
+    Returns:
+        dict: The number of runs, the latency percentiles in seconds and the peak memory in bytes.
+    """
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < MIN_RUNS or (time.perf_counter() - started < min_time and len(latencies) < MAX_RUNS):
+        start = time.perf_counter()
+        function(*arguments)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(*arguments)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    return {
+        'runs': len(latencies),
+        'mean': float(latencies.mean()),
+        'p50': float(np.percentile(latencies, 50)),
+        'p90': float(np.percentile(latencies, 90)),
+        'p99': float(np.percentile(latencies, 99)),
+        'peak_memory': int(peak),
+    }
+
+
+def run(cases=None, sizes=DEFAULT_SIZES, key_lengths=DEFAULT_KEY_LENGTHS, min_time: float = MIN_TIME, log=None):
+    """
+    Runs the benchmarks for every combination of case, input size and key length.
+
+    Parameters:
+        cases (list of str): The names of the cases in CASES to run. Defaults to all of them.
+        sizes (sequence of int): The input sizes, in characters.
+        key_lengths (sequence of int): The key lengths. Cases that do not use a key run once per size.
+        min_time (float): The minimum time spent timing each combination, in seconds.
+        log (callable): Called with a line of progress after every combination.
+
+    Returns:
+        dict: The environment description under 'meta' and one entry per combination under 'results',
+        keyed as 'name[size=...,key=...]', with its measurements and throughput in bytes per second.
+    """
+    results = {}
+
+    for name in cases or CASES:
+        function, setup, uses_key = CASES[name]
+        for size in sizes:
+            for key_length in (key_lengths if uses_key else key_lengths[:1]):
+                case_id = f"{name}[size={size},key={key_length if uses_key else '-'}]"
+                measurement = measure(function, setup(size, key_length), min_time)
+                measurement['size'] = size
+                measurement['throughput'] = size / measurement['p50'] if measurement['p50'] else float('inf')
+                results[case_id] = measurement
+                if log is not None:
+                    log(f"{case_id}: p50 {measurement['p50'] * 1e3:.3f} ms, "
+                        f"{measurement['throughput'] / 1e6:.1f} MB/s, "
+                        f"peak {measurement['peak_memory'] / 1e6:.1f} MB")
+
+    meta = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def compare(results, baseline, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Compares benchmark results with a baseline.
+
+    Parameters:
+        results (dict): The output of run().
+        baseline (dict): A previous output of run().
+        threshold (float): The allowed relative growth of the median latency and the peak memory.
+
+    Returns:
+        list of str: A description of every regression; empty if there is none.
+    """
+    regressions = []
+
+    for case_id, current in results['results'].items():
+        previous = baseline.get('results', {}).get(case_id)
+        if previous is None:
+            continue
+        for metric in ('p50', 'peak_memory'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(
+                    f"{case_id}: {metric} {previous[metric]:.6g} -> {current[metric]:.6g} "
+                    f"(+{(current[metric] / previous[metric] - 1) * 100:.0f}%)")
+
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command line entry point: runs the benchmarks, optionally saving the results and checking
+    them against a baseline.
+
+    Parameters:
+        argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 1 if any case regressed past the threshold, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.benchmark',
+        description='Mide el rendimiento de los métodos de cifrado y las funciones auxiliares.')
+    parser.add_argument('cases', nargs='*', metavar='case',
+                        help=f"Casos a ejecutar (por defecto, todos): {', '.join(CASES)}.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--key-lengths', type=int, nargs='+', default=DEFAULT_KEY_LENGTHS)
+    parser.add_argument('--min-time', type=float, default=MIN_TIME)
+    parser.add_argument('--save', help='Guarda los resultados en este archivo JSON.')
+    parser.add_argument('--baseline', help='Compara los resultados con este archivo JSON.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    unknown = [case for case in args.cases if case not in CASES]
+    if unknown:
+        parser.error(f"casos desconocidos: {', '.join(unknown)}")
+
+    results = run(args.cases, args.sizes, args.key_lengths, args.min_time, log=print)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            regressions = compare(results, json.load(baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from benchmarks import benchmark as b
+from utils import alphabet as a
+
+# Repository root, used as the working directory of a spawned service
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_CONNECTIONS = 64
+DEFAULT_DURATION = 10.0
+DEFAULT_SIZE = 32
+
+# Number of leading letters of a text replaced by the number of its request, so that no two requests
+# send the same text (27 ** 6 different prefixes)
+TAG_LENGTH = 6
+
+
+async def request(reader, writer, verb: str, path: str, body: bytes = b''):
+    """
+    Sends one HTTP/1.1 request over a keep-alive connection and reads the response.
+
+    Parameters:
+    reader (asyncio.StreamReader): The connection.
+    writer (asyncio.StreamWriter): The connection.
+    verb (str): The HTTP method.
+    path (str): The requested path.
+    body (bytes): The request body.
+
+    Returns:
+    tuple: The status code and the response body.
+    """
+    writer.write(f"{verb} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+def tagged_text(text: str, number: int) -> str:
+    """
+    Replaces the first TAG_LENGTH letters of a text with the base-27 digits of a number.
+
+    Parameters:
+    text (str): The text.
+    number (int): The number written in the text.
+
+    Returns:
+    str: A text of the same length, different for every number below 27 ** TAG_LENGTH.
+    """
+    tag = []
+    for _ in range(min(TAG_LENGTH, len(text))):
+        number, digit = divmod(number, len(a.SPANISH))
+        tag.append(a.SPANISH[digit])
+    return ''.join(tag) + text[len(tag):]
+
+
+async def _client(host, port, body, numbers, path, deadline, latencies, failures):
+    """
+    Sends requests over one connection, each one after the previous answer, until the deadline.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            payload = body(next(numbers))
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, 'POST', path, payload)
+            latencies.append(time.perf_counter() - start)
+            failures[0] += status != 200
+    finally:
+        writer.close()
+
+
+async def generate_load(host: str, port: int, connections: int = DEFAULT_CONNECTIONS,
+                        duration: float = DEFAULT_DURATION, size: int = DEFAULT_SIZE,
+                        method: str = 'vigenere', key='LIMON', decrypt: bool = False, distinct: int = None) -> dict:
+    """
+    Sends requests to the service from many concurrent keep-alive connections.
+
+    Parameters:
+    host (str): The address of the service.
+    port (int): The port of the service.
+    connections (int): The number of concurrent connections.
+    duration (float): The number of seconds the load lasts.
+    size (int): The number of characters of every text.
+    method (str): The cipher of the requests.
+    key (int or str): The key of the requests.
+    decrypt (bool): If True, the requests decrypt instead of encrypt.
+    distinct (int): The number of different texts sent; every repetition can be answered from the
+    result cache of the service. Defaults to a different text per request, so the service ciphers
+    every one of them.
+
+    Returns:
+    dict: The number of requests and errors, the throughput in requests per second,
+    the latency percentiles in seconds and the statistics reported by the service.
+    """
+    if distinct is None:
+        text = b.random_text(size)
+
+        def body(number):
+            return json.dumps({'method': method, 'key': key, 'text': tagged_text(text, number)}).encode('utf-8')
+    else:
+        bodies = [json.dumps({'method': method, 'key': key, 'text': b.random_text(size, seed)}).encode('utf-8')
+                  for seed in range(distinct)]
+
+        def body(number):
+            return bodies[number % distinct]
+
+    numbers = itertools.count()
+    path = '/decrypt' if decrypt else '/encrypt'
+    latencies = []
+    failures = [0]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, body, numbers, path, started + duration, latencies, failures)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, stats = await request(reader, writer, 'GET', '/stats')
+    finally:
+        writer.close()
+
+    latencies = np.array(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': failures[0],
+        'throughput': len(latencies) / elapsed,
+        'p50': float(np.percentile(latencies, 50)),
+        'p90': float(np.percentile(latencies, 90)),
+        'p99': float(np.percentile(latencies, 99)),
+        'max': float(latencies.max()),
+        'service': json.loads(stats),
+    }
+
+
+def spawn_service(port: int):
+    """
+    Starts the service in a new process and waits until it accepts connections.
+
+    Parameters:
+    port (int): The port of the service.
+
+    Returns:
+    subprocess.Popen: The service process.
+
+    Raises:
+    RuntimeError: If the service exits before listening.
+    """
+    process = subprocess.Popen([sys.executable, '-m', 'service', '--port', str(port)], cwd=ROOT,
+                               stdout=subprocess.PIPE, text=True)
+    # The service prints its address once it is listening
+    if not process.stdout.readline():
+        process.kill()
+        raise RuntimeError("The service did not start.")
+    return process
+
+
+def main(argv=None):
+    """
+    Command line entry point: measures the throughput and latency of the local cipher service.
+
+    Parameters:
+    argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+    int: 1 if any request failed, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.load_generator',
+        description='Genera carga contra el servicio local de cifrado y mide su rendimiento y latencia.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--spawn', action='store_true', help='Inicia el servicio en otro proceso.')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='Longitud de cada texto.')
+    parser.add_argument('--method', default='vigenere')
+    parser.add_argument('--key', default='LIMON')
+    parser.add_argument('--decrypt', action='store_true')
+    parser.add_argument('--distinct', type=int,
+                        help='Número de textos diferentes enviados; las repeticiones las responde la caché '
+                             'del servicio (por defecto, todos los textos son distintos).')
+    parser.add_argument('--save', help='Guarda los resultados en este archivo JSON.')
+    args = parser.parse_args(argv)
+
+    key = int(args.key) if args.method == 'caesar' else args.key
+    process = spawn_service(args.port) if args.spawn else None
+
+    try:
+        results = asyncio.run(generate_load(args.host, args.port, args.connections, args.duration,
+                                            args.size, args.method, key, args.decrypt, args.distinct))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    service = results['service']
+    print(f"{results['requests']} requests, {results['errors']} errors, "
+          f"{results['throughput']:.0f} req/s")
+    print(f"latency p50 {results['p50'] * 1e3:.2f} ms, p90 {results['p90'] * 1e3:.2f} ms, "
+          f"p99 {results['p99'] * 1e3:.2f} ms, max {results['max'] * 1e3:.2f} ms")
+    print(f"service: {service['batches']} batches, average size {service['average_batch_size']:.1f}, "
+          f"max {service['max_batch_size']}, queue depth {service['queue_depth']}")
+    if service.get('cache'):
+        print(f"cache: {service['cache']['hits']} hits, {service['cache']['misses']} misses, "
+              f"{service['cache']['entries']} entries")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+
+    return 1 if results['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Repository root, used as the working directory of every measured process
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Small input given to the commands that cipher a text
+SAMPLE_TEXT = "HOLA MUNDO\n"
+
+# Measured commands: name -> (arguments after the interpreter, standard input, target median in seconds).
+# The targets are for a cold process on a typical desktop; the interpreter alone takes about 20 ms.
+COMMANDS = {
+    # Importing the entry point must not load the GUI, tkinter or NumPy
+    'import-main': (['-c', 'import main'], None, 0.05),
+    # Headless CLI that exits before ciphering: NumPy must not be loaded
+    'cli-help': (['-m', 'cli', '--help'], None, 0.10),
+    # Headless CLI ciphering a short text: pays for NumPy once, on first use
+    'cli-encrypt': (['-m', 'cli', 'encrypt', 'vigenere', 'CLAVE', '--passthrough'], SAMPLE_TEXT, 0.25),
+    # Headless record CLI processing one record
+    'cli-lines': (['-m', 'cli', 'encrypt', 'vigenere', 'CLAVE', '--format', 'lines'], SAMPLE_TEXT, 0.25),
+}
+
+# Number of timed runs of every command
+DEFAULT_RUNS = 10
+
+# Number of modules listed in the import time breakdown
+DEFAULT_TOP = 10
+
+
+def run_command(arguments, stdin=None, importtime: bool = False):
+    """
+    Runs the interpreter in a new process from the repository root.
+
+    Parameters:
+    arguments (list of str): The arguments given to the interpreter.
+    stdin (str): The standard input of the process, if any.
+    importtime (bool): Whether to run with -X importtime.
+
+    Returns:
+    tuple: The wall time of the process in seconds and its standard error.
+
+    Raises:
+    RuntimeError: If the process exits with an error.
+    """
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + arguments
+    start = time.perf_counter()
+    process = subprocess.run(command, input=stdin, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(arguments)} failed: {process.stderr.strip()}")
+    return elapsed, process.stderr
+
+
+def parse_importtime(output: str):
+    """
+    Parses the report written by -X importtime.
+
+    Parameters:
+    output (str): The standard error of a process run with -X importtime.
+
+    Returns:
+    list of tuple: (module, self seconds, cumulative seconds) for every imported module.
+    """
+    modules = []
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+
+    return modules
+
+
+def measure(name: str, runs: int = DEFAULT_RUNS, top: int = DEFAULT_TOP):
+    """
+    Times the cold start of one of the COMMANDS and breaks down its import time.
+
+    A first untimed run writes the bytecode caches, so every timed run starts from the same state.
+
+    Parameters:
+    name (str): The name of the command in COMMANDS.
+    runs (int): The number of timed runs.
+    top (int): The number of modules with the largest own import time to report.
+
+    Returns:
+    dict: The median and minimum wall time, the target, the total import time,
+    whether NumPy and tkinter were imported, and the slowest modules.
+    """
+    arguments, stdin, target = COMMANDS[name]
+
+    run_command(arguments, stdin)
+    times = [run_command(arguments, stdin)[0] for _ in range(runs)]
+
+    modules = parse_importtime(run_command(arguments, stdin, importtime=True)[1])
+    # Lazily imported packages only report their submodules, so any 'package.' prefix counts
+    imported = {module.split('.')[0] for module, _, _ in modules}
+    slowest = sorted(modules, key=lambda module: module[1], reverse=True)[:top]
+
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'target': target,
+        'import_time': sum(own for _, own, _ in modules),
+        'numpy': 'numpy' in imported,
+        'tkinter': 'tkinter' in imported,
+        'slowest': [[module, own] for module, own, _ in slowest],
+    }
+
+
+def main(argv=None):
+    """
+    Command line entry point: measures the cold start of every command and checks it against its target.
+
+    Parameters:
+    argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+    int: 1 if any command is slower than its target, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.startup',
+        description='Mide el tiempo de arranque en frío de la aplicación y de la línea de comandos.')
+    parser.add_argument('commands', nargs='*', metavar='command',
+                        help=f"Comandos a medir (por defecto, todos): {', '.join(COMMANDS)}.")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help='Número de módulos más lentos que se muestran.')
+    parser.add_argument('--save', help='Guarda los resultados en este archivo JSON.')
+    args = parser.parse_args(argv)
+
+    unknown = [command for command in args.commands if command not in COMMANDS]
+    if unknown:
+        parser.error(f"comandos desconocidos: {', '.join(unknown)}")
+
+    baseline, _ = run_command(['-c', 'pass'])
+    print(f"interpreter: {baseline * 1e3:.1f} ms")
+
+    results = {}
+    slow = []
+
+    for name in args.commands or COMMANDS:
+        result = results[name] = measure(name, args.runs, args.top)
+        loaded = [module for module in ('numpy', 'tkinter') if result[module]]
+        print(f"{name}: median {result['median'] * 1e3:.1f} ms (target {result['target'] * 1e3:.0f} ms), "
+              f"imports {result['import_time'] * 1e3:.1f} ms, loads {', '.join(loaded) or 'no heavy modules'}")
+        for module, own in result['slowest']:
+            print(f"    {own * 1e3:8.2f} ms  {module}")
+        if result['median'] > result['target']:
+            slow.append(name)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2)
+
+    for name in slow:
+        print(f"SLOW {name}: {results[name]['median'] * 1e3:.1f} ms > "
+              f"{results[name]['target'] * 1e3:.0f} ms", file=sys.stderr)
+
+    return 1 if slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
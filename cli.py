@@ -0,0 +1,390 @@
+import argparse
+import json
+import sys
+from methods import crypto_methods as cm
+from methods import streaming as st
+from utils import alphabet as a
+from utils import entry_validator as e
+
+# Maximum number of bytes read from the input at once in the record formats
+READ_SIZE = 1 << 20
+
+# Input formats: a whole text, one record per line, or one JSON object per line
+FORMATS = ('text', 'lines', 'jsonl')
+
+# Ciphers that can process many records with a single vectorized call
+BATCH_METHODS = ('caesar', 'vigenere', 'hill')
+
+
+def parse_key(method: str, key):
+    """
+    Converts a key given on the command line or in a JSON record to the type its cipher expects.
+
+    Parameters:
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    key (int or str): The key as given.
+
+    Returns:
+    int or str: An integer shift for Caesar, an uppercase string otherwise.
+
+    Raises:
+    ValueError: If a Caesar key is not an integer (booleans and fractional numbers are rejected).
+    TypeError: If the key has an unsupported type.
+    """
+    if method == 'caesar':
+        if isinstance(key, bool):
+            raise ValueError("The caesar key must be an integer.")
+        if isinstance(key, float):
+            if not key.is_integer():
+                raise ValueError("The caesar key must be an integer.")
+            return int(key)
+        return key if isinstance(key, int) else int(key)
+    if not isinstance(key, str):
+        raise TypeError(f"The {method} key must be a string.")
+    return key.upper()
+
+
+def positive_int(text: str) -> int:
+    """
+    Converts a command line argument that must be a positive integer.
+
+    Parameters:
+    text (str): The argument.
+
+    Returns:
+    int: The number.
+
+    Raises:
+    argparse.ArgumentTypeError: If the argument is not a positive integer.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"debe ser un entero positivo: {text!r}")
+    return value
+
+
+def clean_record(text: str) -> str:
+    """
+    Prepares a record as the graphical interface does: uppercase and without spaces.
+
+    Parameters:
+    text (str): The record as read.
+
+    Returns:
+    str: The record ready to be processed.
+    """
+    return text.upper().replace(' ', '')
+
+
+def read_batches(source, read_size: int = READ_SIZE):
+    """
+    Reads a binary stream line by line, grouping the lines that are already available.
+
+    Every read returns whatever the stream has ready (up to read_size bytes), so a busy pipe or a file
+    produces large batches while a slow producer gets each of its lines processed as soon as it arrives.
+
+    Parameters:
+    source (BinaryIO): The open binary stream, which must support read1() (e.g. sys.stdin.buffer).
+    read_size (int): The maximum number of bytes read at once.
+
+    Yields:
+    list: The complete lines read, without their line endings; a line that is not valid UTF-8 is replaced
+    by the ValueError describing it, so that it is reported as an invalid record.
+    """
+    pending = b''
+
+    while chunk := source.read1(read_size):
+        lines = (pending + chunk).split(b'\n')
+        # The last piece is an incomplete line, kept until the rest of it arrives
+        pending = lines.pop()
+        if lines:
+            yield [decode_line(line) for line in lines]
+
+    if pending:
+        yield [decode_line(pending)]
+
+
+def decode_line(line: bytes):
+    """
+    Decodes one line of a record format.
+
+    Parameters:
+    line (bytes): The line as read.
+
+    Returns:
+    str or ValueError: The line without its carriage return, or the error if it is not valid UTF-8.
+    """
+    try:
+        return line.decode('utf-8').rstrip('\r')
+    except UnicodeDecodeError as exp:
+        return ValueError(f"The line is not valid UTF-8 ({exp.reason} at byte {exp.start}).")
+
+
+def cipher_records(texts, keys, method: str, decrypt: bool = False, alphabet: a.Alphabet = a.SPANISH) -> list:
+    """
+    Encrypts or decrypts many records, each with its own key.
+
+    Caesar and Vigenère records are processed with a single vectorized call, and Hill records with one
+    matrix product per distinct key. If any record is invalid, or for transposition, the records are
+    processed one by one with compiled ciphers, which are cached per key, so that every invalid record
+    gets its own error.
+
+    Parameters:
+    texts (list of str): The records to be processed.
+    keys (list): The key of each record, as accepted by parse_key.
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    decrypt (bool): If True, the records are decrypted instead of encrypted.
+    alphabet (Alphabet): The alphabet the records and keys are written in.
+
+    Returns:
+    list: The processed text of each record, or the exception that prevented processing it.
+    """
+    if method in BATCH_METHODS:
+        try:
+            batch = cm.decrypt_batch if decrypt else cm.encrypt_batch
+            return batch(texts, [parse_key(method, key) for key in keys], method, alphabet)
+        except (ValueError, TypeError):
+            pass  # At least one record is invalid: find it below
+
+    results = []
+    for text, key in zip(texts, keys):
+        try:
+            cipher = cm.Cipher.compile(method, parse_key(method, key), alphabet)
+            results.append(cipher.decrypt(text) if decrypt else cipher.encrypt(text))
+        except (ValueError, TypeError, ArithmeticError) as exp:
+            results.append(exp)
+    return results
+
+
+def process_text(source, destination, method: str, key, decrypt: bool = False,
+                 chunk_size: int = st.DEFAULT_CHUNK_SIZE, passthrough: bool = False):
+    """
+    Encrypts or decrypts a whole text. Caesar and Vigenère are streamed chunk by chunk; transposition
+    and Hill need the whole text, which is read at once. Spaces and line breaks are removed (unless
+    passthrough copies them) and the result is written followed by a line break.
+
+    Parameters:
+    source (TextIO): The open text file to read.
+    destination (TextIO): The open text file where the result is written.
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    key (int or str): The key of the cipher.
+    decrypt (bool): If True, the text is decrypted instead of encrypted.
+    chunk_size (int): The number of characters per chunk of the streamed ciphers.
+    passthrough (bool): If True, the streamed ciphers copy characters outside the alphabet unchanged.
+
+    Raises:
+    ValueError: If the text or the key is invalid.
+    """
+    key = parse_key(method, key)
+
+    if method in st.STREAMABLE_METHODS:
+        st.process_stream(source, destination, method, key, decrypt=decrypt,
+                          chunk_size=chunk_size, passthrough=passthrough, upper=True, strip=True)
+        if not passthrough:
+            # Spaces and line breaks were removed, as in the records of the other ciphers
+            destination.write('\n')
+        return
+
+    cipher = cm.Cipher.compile(method, key)
+    text = clean_record(source.read().translate(st.WHITESPACE))
+    destination.write((cipher.decrypt(text) if decrypt else cipher.encrypt(text)) + '\n')
+
+
+def process_lines(source, destination, method: str, key, decrypt: bool = False, errors=None) -> int:
+    """
+    Encrypts or decrypts every line of a stream as a separate record with the same key,
+    writing one output line per input line as soon as each batch is processed.
+
+    Parameters:
+    source (BinaryIO): The open binary stream to read.
+    destination (TextIO): The open text file where the results are written.
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    key (int or str): The key of every record.
+    decrypt (bool): If True, the records are decrypted instead of encrypted.
+    errors (TextIO): Where invalid records are reported; their output line is left empty.
+    Defaults to the standard error.
+
+    Returns:
+    int: The number of invalid records.
+    """
+    errors = sys.stderr if errors is None else errors
+    failed = 0
+    line_number = 0
+
+    for lines in read_batches(source):
+        # Lines that could not be decoded keep their error; the others are processed together
+        valid = [position for position, line in enumerate(lines) if isinstance(line, str)]
+        results = list(lines)
+        processed = cipher_records([clean_record(lines[position]) for position in valid],
+                                   [key] * len(valid), method, decrypt)
+        for position, result in zip(valid, processed):
+            results[position] = result
+
+        output = []
+        for result in results:
+            line_number += 1
+            if isinstance(result, Exception):
+                failed += 1
+                print(f"Error en la línea {line_number}: {result}", file=errors)
+                result = ''
+            output.append(result)
+
+        destination.write('\n'.join(output) + '\n')
+        destination.flush()
+
+    return failed
+
+
+def process_jsonl(source, destination, method: str, key=None, decrypt: bool = False) -> int:
+    """
+    Encrypts or decrypts a stream of JSON records, one object per line, writing one JSON object
+    per record as soon as each batch is processed.
+
+    Every record has a 'text' and may override the 'key', 'method' and 'action' ('encrypt' or
+    'decrypt') given on the command line. An 'id', if present, is copied to the output, which holds
+    the processed 'text', or an 'error' message for invalid records.
+
+    Parameters:
+    source (BinaryIO): The open binary stream to read.
+    destination (TextIO): The open text file where the results are written.
+    method (str): The default cipher, one of crypto_methods.CIPHER_KINDS.
+    key (int or str): The default key.
+    decrypt (bool): If True, records without an 'action' are decrypted instead of encrypted.
+
+    Returns:
+    int: The number of invalid records.
+    """
+    failed = 0
+
+    for lines in read_batches(source):
+        outputs = [{} for _ in lines]
+        # Records that share a cipher and direction are processed together: (method, decrypt) -> positions
+        groups = {}
+        texts, keys = [], []
+
+        for position, line in enumerate(lines):
+            try:
+                if isinstance(line, Exception):
+                    raise line
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("The record must be a JSON object.")
+                if 'id' in record:
+                    outputs[position]['id'] = record['id']
+                record_method = record.get('method', method)
+                action = record.get('action', 'decrypt' if decrypt else 'encrypt')
+                if record_method not in cm.CIPHER_KINDS:
+                    raise ValueError(f"Unsupported cipher: {record_method!r}.")
+                if action not in ('encrypt', 'decrypt'):
+                    raise ValueError(f"Unsupported action: {action!r}.")
+                if not isinstance(record.get('text'), str):
+                    raise ValueError("The record has no text.")
+                if record.get('key', key) is None:
+                    raise ValueError("The record has no key.")
+                texts.append(clean_record(record['text']))
+            except (ValueError, AttributeError, TypeError) as exp:
+                outputs[position]['error'] = str(exp)
+                texts.append(None)
+                keys.append(None)
+                continue
+
+            keys.append(record.get('key', key))
+            groups.setdefault((record_method, action == 'decrypt'), []).append(position)
+
+        for (group_method, group_decrypt), positions in groups.items():
+            results = cipher_records([texts[position] for position in positions],
+                                     [keys[position] for position in positions], group_method, group_decrypt)
+            for position, result in zip(positions, results):
+                if isinstance(result, Exception):
+                    outputs[position]['error'] = str(result)
+                else:
+                    outputs[position]['text'] = result
+
+        failed += sum('error' in output for output in outputs)
+        destination.write(''.join(json.dumps(output, ensure_ascii=False) + '\n' for output in outputs))
+        destination.flush()
+
+    return failed
+
+
+def main(argv=None):
+    """
+    Command line entry point: encrypts or decrypts texts without the GUI, from files or the standard
+    input, as one whole text, one record per line or JSON records with their own keys.
+
+    A single process handles any number of records, so batch jobs and long-lived pipes
+    pay for the interpreter and the imports only once.
+
+    Parameters:
+    argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+    int: 0 on success, 1 if the input or any record is invalid.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m cli',
+        description='Cifra o descifra textos sin la interfaz gráfica, desde archivos o la entrada estándar.')
+    parser.add_argument('action', choices=('encrypt', 'decrypt'))
+    parser.add_argument('method', choices=cm.CIPHER_KINDS)
+    parser.add_argument('key', nargs='?',
+                        help='Clave del cifrado; opcional con --format jsonl si cada registro trae la suya.')
+    parser.add_argument('-i', '--input', action='append',
+                        help='Archivo de entrada; se puede repetir (por defecto, la entrada estándar).')
+    parser.add_argument('-o', '--output', help='Archivo de salida (por defecto, la salida estándar).')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text',
+                        help='text: todo el texto es un mensaje; lines: un registro por línea; '
+                             'jsonl: un objeto JSON por línea, con "text" y opcionalmente '
+                             '"key", "method", "action" e "id".')
+    parser.add_argument('--chunk-size', type=positive_int, default=st.DEFAULT_CHUNK_SIZE,
+                        help='Con --format text, número de caracteres procesados a la vez (César y Vigenère).')
+    parser.add_argument('--passthrough', action='store_true',
+                        help='Con --format text, copia sin cambios los caracteres fuera del alfabeto '
+                             '(César y Vigenère).')
+    args = parser.parse_args(argv)
+
+    if args.key is None and args.format != 'jsonl':
+        parser.error("se requiere una clave")
+    if args.key is not None and args.method == 'caesar':
+        try:
+            int(args.key)
+        except ValueError:
+            parser.error(e.NotIntegerError())
+
+    decrypt = args.action == 'decrypt'
+    binary = args.format != 'text'
+    destination = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    failed = 0
+
+    try:
+        for path in args.input or [None]:
+            if path is None:
+                source = sys.stdin.buffer if binary else sys.stdin
+            else:
+                source = open(path, 'rb') if binary else open(path, encoding='utf-8', newline='')
+
+            try:
+                if args.format == 'text':
+                    process_text(source, destination, args.method, args.key, decrypt,
+                                 args.chunk_size, args.passthrough)
+                elif args.format == 'lines':
+                    failed += process_lines(source, destination, args.method, args.key, decrypt)
+                else:
+                    failed += process_jsonl(source, destination, args.method, args.key, decrypt)
+            finally:
+                if path is not None:
+                    source.close()
+    except (ValueError, TypeError) as exp:
+        print(f"Error: {exp}", file=sys.stderr)
+        return 1
+    finally:
+        if args.output:
+            destination.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 
 def load_file(file_name: str, file_extension: str, directory: str = 'files') -> str:
@@ -27,3 +28,21 @@ def load_file(file_name: str, file_extension: str, directory: str = 'files') ->
 
     # Normalize the path for consistent use across operating systems
     return os.path.abspath(full_path)
+
+
+@lru_cache(maxsize=None)
+def read_text(file_name: str, file_extension: str = 'txt', directory: str = 'files') -> str:
+    """
+    Reads a static text file, such as the 'About' information, only the first time it is requested.
+    Later calls return the cached content without touching the disk.
+
+    Parameters:
+    file_name (str): The name of the file.
+    file_extension (str): The file's extension, without a dot (e.g., 'txt').
+    directory (str): Optional; the directory path. Defaults to 'files'.
+
+    Returns:
+    str: The content of the file.
+    """
+    with open(load_file(file_name, file_extension, directory), "r", encoding="utf-8") as file:
+        return file.read()
@@ -0,0 +1,142 @@
+from collections import namedtuple
+from methods import streaming as st
+from utils import alphabet as a
+from utils import entry_validator as e
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# A change of the output: output[start:end] is replaced by text; end is None when the whole output is replaced
+Patch = namedtuple('Patch', ['start', 'end', 'text'])
+
+
+def common_prefix_length(first: str, second: str) -> int:
+    """
+    Returns the length of the longest common prefix of two strings.
+
+    The candidate range is halved at every step and only its new half is compared, so the strings
+    are compared in C with O(n) work in total instead of one Python iteration per character.
+    """
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[low:middle] == second[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(first: str, second: str, limit: int) -> int:
+    """
+    Returns the length of the longest common suffix of two strings, up to limit characters
+    (so the suffix does not overlap a common prefix already found).
+    """
+    low, high = 0, min(len(first), len(second), limit)
+    first_length, second_length = len(first), len(second)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[first_length - middle:first_length - low] == second[second_length - middle:second_length - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+class LiveCipher:
+    """
+    Keeps the result of the text being typed up to date, recomputing only what every edit changes.
+
+    Caesar and Vigenère are position-local: letter i of the output depends only on letter i of the text
+    and on i modulo the key length. After an edit, only the letters between the common prefix and the
+    common suffix of the old and new texts are encrypted again, starting at the key position of the
+    prefix. An insertion or deletion moves the key position of everything after it, so with Vigenère
+    the suffix is kept only when the length changed by a multiple of the key length.
+
+    Transposition, and any change of the key, recomputes the whole output.
+    """
+
+    def __init__(self, method, function, decrypt=False, alphabet=a.SPANISH):
+        """
+        Parameters:
+            method (str): The cipher name.
+            function (callable): The cipher function, called with (text, key) to recompute the whole output
+                of the ciphers that cannot be updated in place.
+            decrypt (bool): Whether the function decrypts.
+            alphabet (Alphabet): The alphabet of the text and key.
+        """
+        self.method = method
+        self.function = function
+        self.decrypt = decrypt
+        self.alphabet = alphabet
+        self.reset()
+
+    @property
+    def incremental(self) -> bool:
+        """Whether the cipher output can be updated in place."""
+        return self.method in st.STREAMABLE_METHODS
+
+    def reset(self):
+        """Forgets the last text, so the next update recomputes the whole output."""
+        self.letters = None
+        self.key = None
+        self.cipher = None
+
+    def update(self, text, key):
+        """
+        Computes the change of the output for a new text or key.
+
+        Parameters:
+            text (str): The whole text, as typed; it is converted to uppercase and its spaces are removed.
+            key (int or str): The validated key.
+
+        Returns:
+            Patch: The range of the previous output to replace and its replacement, or an Exception
+            (as returned by the validators) if the text or key is invalid.
+        """
+        letters = text.upper().replace(' ', '')
+        if not self.incremental or self.letters is None or key != self.key or not letters:
+            return self._recompute(text, letters, key)
+
+        old = self.letters
+        prefix = common_prefix_length(old, letters)
+        suffix = common_suffix_length(old, letters, min(len(old), len(letters)) - prefix)
+        if (len(letters) - len(old)) % len(self.cipher.shifts):
+            suffix = 0
+
+        span = letters[prefix:len(letters) - suffix]
+        indices = self.alphabet.to_indices(span)
+        if np.any(indices == a.INVALID_INDEX):
+            # The full validation reports the position of the invalid character
+            return self._recompute(text, letters, key)
+
+        self.cipher.offset = prefix % len(self.cipher.shifts)
+        self.letters = letters
+        return Patch(prefix, len(old) - suffix, self.cipher.process(indices) if span else '')
+
+    def _recompute(self, text, letters, key):
+        """
+        Validates and processes the whole text.
+        """
+        self.reset()
+        indices = e.encode_input(text, self.alphabet)
+        if isinstance(indices, Exception):
+            return indices
+
+        if self.incremental:
+            try:
+                cipher = st.StreamCipher(self.method, key, decrypt=self.decrypt, alphabet=self.alphabet)
+            except (ValueError, TypeError):
+                return e.InvalidKeyError()
+            output = cipher.process(indices)
+        else:
+            cipher = None
+            try:
+                output = self.function(indices, key)
+            except ValueError as exp:
+                return exp
+            if isinstance(output, Exception):
+                return output
+
+        self.letters, self.key, self.cipher = letters, key, cipher
+        return Patch(0, None, output)
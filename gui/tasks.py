@@ -0,0 +1,85 @@
+import queue
+import threading
+from methods import streaming as st
+
+# Number of characters processed between two progress updates
+CHUNK_SIZE = 1 << 18
+
+
+class CipherTask(threading.Thread):
+    """
+    Runs a cipher in a background thread and reports its progress through a queue,
+    so the Tk event loop never waits for it.
+
+    Messages put in the queue are tuples: ('progress', fraction) while running, then exactly one of
+    ('done', result), ('error', exception) or ('cancelled', None).
+    """
+
+    def __init__(self, function, text, key, method=None, decrypt=False, chunk_size=CHUNK_SIZE):
+        """
+        Prepares the task; call start() to run it.
+
+        Parameters:
+            function (callable): The cipher function, called with (text, key) when the cipher
+                cannot be processed by chunks.
+            text (str or np.ndarray): The text, or its alphabet positions.
+            key (int or str): The key of the cipher.
+            method (str): The cipher name. Caesar and Vigenère are processed by chunks,
+                reporting progress and checking for cancellation between chunks.
+            decrypt (bool): Whether the function decrypts, used when processing by chunks.
+            chunk_size (int): The number of characters per chunk.
+        """
+        super().__init__(daemon=True)
+        self.function = function
+        self.text = text
+        self.key = key
+        self.method = method
+        self.decrypt = decrypt
+        self.chunk_size = chunk_size
+        self.messages = queue.Queue()
+        self.cancelled = threading.Event()
+
+    @property
+    def reports_progress(self) -> bool:
+        """Whether the task reports intermediate progress."""
+        return self.method in st.STREAMABLE_METHODS
+
+    def cancel(self):
+        """Asks the task to stop; a task that cannot be split discards its result instead."""
+        self.cancelled.set()
+
+    def run(self):
+        try:
+            if self.reports_progress:
+                result = self._run_by_chunks()
+            else:
+                result = self.function(self.text, self.key)
+
+            if self.cancelled.is_set():
+                self.messages.put(('cancelled', None))
+            elif isinstance(result, Exception):
+                # Some ciphers return their error instead of raising it
+                self.messages.put(('error', result))
+            else:
+                self.messages.put(('done', result))
+        except Exception as exp:
+            self.messages.put(('error', exp))
+
+    def _run_by_chunks(self):
+        """
+        Processes the text chunk by chunk, carrying the key position across chunks.
+
+        Returns:
+            str: The processed text, or None if the task was cancelled.
+        """
+        cipher = st.StreamCipher(self.method, self.key, decrypt=self.decrypt)
+        parts = []
+        length = len(self.text)
+
+        for start in range(0, length, self.chunk_size):
+            if self.cancelled.is_set():
+                return None
+            parts.append(cipher.process(self.text[start:start + self.chunk_size]))
+            self.messages.put(('progress', min(start + self.chunk_size, length) / length))
+
+        return ''.join(parts)
@@ -1,15 +1,29 @@
 import tkinter as tk
 from tkinter import font
 from methods import crypto_methods as cm
-from utils import misc as m
+from methods import result_cache as rc
+from utils import alphabet as a
 from utils import entry_validator as e
 from files import file_loader as f
+from gui import live as l
+from gui import tasks as t
 from tkinter import ttk
 from tkinter import scrolledtext
 
 
+# Milliseconds between two checks of a running cipher task
+POLL_INTERVAL = 50
+
+# Number of characters inserted in the output widget per event loop iteration
+OUTPUT_CHUNK_SIZE = 1 << 16
+
+# Milliseconds without typing before the live output is updated
+LIVE_DELAY = 150
+
+
 class CipherWindow:
-    def __init__(self, root, title, key_type, text_type, encrypt_func, decrypt_func, default_size):
+    def __init__(self, root, title, key_type, text_type, encrypt_func, decrypt_func, default_size, method=None,
+                 key_validator=None):
         """
         Initializes the CipherWindow class with attributes necessary for encryption/decryption.
 
@@ -21,6 +35,9 @@ class CipherWindow:
             encrypt_func (callable): Encryption function.
             decrypt_func (callable): Decryption function.
             default_size (str): Default size of the window.
+            method (str): Name of the cipher; Caesar and Vigenère report progress and can be cancelled midway.
+            key_validator (callable): Additional check of the key, returning the key or an Exception
+                (e.g. entry_validator.validate_hill_key).
         """
         self.root = root
         self.title = title
@@ -29,7 +46,9 @@ class CipherWindow:
         self.encrypt_func = encrypt_func
         self.decrypt_func = decrypt_func
         self.default_size = default_size
-        self.alphabet = m.create_spanish_alphabet()  # Custom Spanish alphabet
+        self.method = method
+        self.key_validator = key_validator
+        self.alphabet = a.SPANISH  # Shared Spanish alphabet
 
     def open_window(self):
         """
@@ -61,16 +80,23 @@ class CipherWindow:
         input_label = tk.Label(
             window, text="Introduce el texto:", font=("Arial", 10))
         input_label.pack(pady=5)
-        input_entry = tk.Entry(window, width=30)
+        text_variable = tk.StringVar(window)
+        input_entry = tk.Entry(window, width=30, textvariable=text_variable)
         input_entry.pack(pady=5)
 
         # Key input field label and entry
         input_label_key = tk.Label(
             window, text="Introduce la clave:", font=("Arial", 10))
         input_label_key.pack(pady=5)
-        input_key = tk.Entry(window, width=30)
+        key_variable = tk.StringVar(window)
+        input_key = tk.Entry(window, width=30, textvariable=key_variable)
         input_key.pack(pady=5)
 
+        # Live mode: the text is encrypted while it is typed
+        live_variable = tk.BooleanVar(window, value=False)
+        live_check = tk.Checkbutton(window, text="Cifrar al escribir", variable=live_variable)
+        live_check.pack()
+
         # Output area with a label, scrollable text, and custom scrollbar
         output_label = tk.Label(window, text="Resultado:", font=("Arial", 10))
         output_label.pack(pady=5)
@@ -114,18 +140,175 @@ class CipherWindow:
                 print(f"Error de validación: {exp}")
                 return exp
 
-        def display_message(message):
+        def validate_key(raw_key):
+            """
+            Validates the key by type, then with the key validator of the cipher, if any.
+
+            Parameters:
+                raw_key (str): Key to validate.
+
+            Returns:
+                str or Exception: Validated key or an Exception if validation fails.
+            """
+            result = validate_input(raw_key, self.key_type)
+            if isinstance(result, Exception) or self.key_validator is None:
+                return result
+            return self.key_validator(result)
+
+        # Progress of the running task and button to cancel it
+        progress_bar = ttk.Progressbar(window, length=250, maximum=1.0)
+        progress_bar.pack(pady=5)
+
+        running = {'task': None, 'request': None}  # Cipher task in progress, if any, and its cache key
+
+        # Output shown by the live mode, the pending live update and the message being inserted
+        live_cipher = l.LiveCipher(self.method, self.encrypt_func, alphabet=self.alphabet)
+        live_state = {'after': None, 'generation': 0, 'inserting': False}
+
+        def display_message(message, start=0, generation=None):
             """
             Displays a message in the output_text widget, clearing previous content.
+            Long messages are inserted in chunks across event loop iterations to keep the window responsive.
 
             Parameters:
                 message (str): Message to display.
+                start (int): Position of the message where insertion continues.
+                generation (int): The number of the message; a newer message stops the insertion of older ones.
             """
+            if not window.winfo_exists():
+                return
+            if start == 0:
+                live_state['generation'] += 1
+                live_state['inserting'] = True
+                generation = live_state['generation']
+            elif generation != live_state['generation']:
+                return
+
+            output_text.config(state="normal")
+            if start == 0:
+                output_text.delete("1.0", tk.END)
+            output_text.insert(tk.END, message[start:start + OUTPUT_CHUNK_SIZE])
+            output_text.config(state="disabled")
+
+            if start + OUTPUT_CHUNK_SIZE < len(message):
+                window.after(1, display_message, message, start + OUTPUT_CHUNK_SIZE, generation)
+            else:
+                live_state['inserting'] = False
+
+        def patch_output(patch):
+            """
+            Replaces the range of the output_text widget that a live update changed.
+
+            Parameters:
+                patch (Patch): The range of the output to replace and its new text.
+            """
+            if patch.end is None:
+                display_message(patch.text)
+                return
             output_text.config(state="normal")
-            output_text.delete("1.0", tk.END)
-            output_text.insert("1.0", message)
+            output_text.delete(f"1.0 + {patch.start} chars", f"1.0 + {patch.end} chars")
+            output_text.insert(f"1.0 + {patch.start} chars", patch.text)
             output_text.config(state="disabled")
 
+        def update_live():
+            """
+            Updates the output for the current text and key, re-encrypting only what the last edits changed.
+            """
+            live_state['after'] = None
+            if not window.winfo_exists() or not live_variable.get() or running['task'] is not None:
+                return
+            if live_state['inserting']:
+                # A long output is still being inserted; patch it once it is complete
+                schedule_live()
+                return
+
+            key = key_variable.get()
+            key_result = validate_key(key)
+            if isinstance(key_result, Exception):
+                live_cipher.reset()
+                display_message(f"Clave inválida: {key_result}")
+                return
+
+            key_value = key_result.upper() if self.key_type == str else int(key_result)
+            patch = live_cipher.update(text_variable.get(), key_value)
+            if isinstance(patch, Exception):
+                live_cipher.reset()
+                display_message(f"Error: {patch}")
+            else:
+                patch_output(patch)
+
+        def schedule_live(*_):
+            """
+            Schedules a live update once typing pauses for LIVE_DELAY milliseconds.
+            """
+            if live_state['after'] is not None:
+                window.after_cancel(live_state['after'])
+                live_state['after'] = None
+            if live_variable.get():
+                live_state['after'] = window.after(LIVE_DELAY, update_live)
+
+        def toggle_live():
+            """
+            Shows the live output right away when the live mode is turned on.
+            """
+            live_cipher.reset()
+            schedule_live()
+
+        text_variable.trace_add('write', schedule_live)
+        key_variable.trace_add('write', schedule_live)
+        live_check.config(command=toggle_live)
+
+        def set_running(task):
+            """
+            Records the running task and enables or disables the buttons accordingly.
+
+            Parameters:
+                task (CipherTask): The task that started, or None when it finished.
+            """
+            running['task'] = task
+            action_state = "disabled" if task else "normal"
+            encrypt_button.config(state=action_state)
+            decrypt_button.config(state=action_state)
+            cancel_button.config(state="normal" if task else "disabled")
+
+            progress_bar.stop()
+            if task is None:
+                progress_bar.config(mode="determinate", value=0)
+            elif task.reports_progress:
+                progress_bar.config(mode="determinate", value=0)
+            else:
+                progress_bar.config(mode="indeterminate")
+                progress_bar.start()
+
+        def poll_task(task):
+            """
+            Reads the messages of a running task and schedules the next check until it finishes.
+
+            Parameters:
+                task (CipherTask): The task to check.
+            """
+            if not window.winfo_exists():
+                task.cancel()
+                return
+
+            while not task.messages.empty():
+                kind, value = task.messages.get()
+                if kind == 'progress':
+                    progress_bar.config(value=value)
+                    continue
+
+                set_running(None)
+                if kind == 'done':
+                    rc.CACHE.put(*running['request'], value, decrypt=task.decrypt)
+                    display_message(value)
+                elif kind == 'error':
+                    display_message(f"Error: {value}")
+                else:
+                    display_message("Operación cancelada.")
+                return
+
+            window.after(POLL_INTERVAL, poll_task, task)
+
         def perform_action(action_func):
             """
             Validates inputs, handles errors, and performs encryption or decryption using the given function.
@@ -136,8 +319,12 @@ class CipherWindow:
             text = input_entry.get()
             key = input_key.get()
 
-            text_result = validate_input(text, self.text_type)
-            key_result = validate_input(key, self.key_type)
+            # The output no longer holds the live result
+            live_cipher.reset()
+
+            # The text is validated and encoded in a single pass; the ciphers accept the encoded array
+            text_result = e.encode_input(text, self.alphabet)
+            key_result = validate_key(key)
 
             error_messages = []
 
@@ -150,17 +337,40 @@ class CipherWindow:
             if error_messages:
                 display_message("\n".join(error_messages))
             else:
-                result = action_func(text_result.upper(), key_result.upper(
-                ) if self.key_type == str else int(key_result))
-                display_message(result)
+                key_value = key_result.upper() if self.key_type == str else int(key_result)
+                decrypt = action_func is self.decrypt_func
+
+                # Repeated operations are answered from the cache, keyed by the text as the ciphers read it
+                request = (self.method, key_value, text.upper().replace(' ', ''))
+                cached = rc.CACHE.get(*request, decrypt=decrypt)
+                if cached is not None:
+                    display_message(cached)
+                    return
+
+                # Run the cipher in a background thread and check on it from the event loop
+                task = t.CipherTask(action_func, text_result, key_value, method=self.method, decrypt=decrypt)
+                running['request'] = request
+                set_running(task)
+                task.start()
+                window.after(POLL_INTERVAL, poll_task, task)
+
+        def cancel_action():
+            """
+            Cancels the running task, if any.
+            """
+            if running['task'] is not None:
+                running['task'].cancel()
 
-        # Buttons for encryption and decryption
+        # Buttons for encryption, decryption and cancellation
         encrypt_button = tk.Button(
             window, text="Cifrar", command=lambda: perform_action(self.encrypt_func))
         encrypt_button.pack(pady=10)
         decrypt_button = tk.Button(
             window, text="Descifrar", command=lambda: perform_action(self.decrypt_func))
         decrypt_button.pack(pady=5)
+        cancel_button = tk.Button(
+            window, text="Cancelar", command=cancel_action, state="disabled")
+        cancel_button.pack(pady=5)
 
 
 def open_about_window():
@@ -180,7 +390,7 @@ def open_about_window():
                            font=title_font, anchor="center")
     title_label.pack(pady=10)
 
-    info_text = open(f.load_file('info_text', 'txt'), "r").read()
+    info_text = f.read_text('info_text', 'txt')
 
     text_widget = scrolledtext.ScrolledText(
     about_window, font=("Arial", 12), wrap="word")
@@ -199,7 +409,7 @@ def open_source_code_window():
     source_code_window.title("Código fuente")
     source_code_window.geometry("500x400")
 
-    info_text = open(f.load_file('source_code', 'txt'), "r").read()
+    info_text = f.read_text('source_code', 'txt')
 
     text_widget = scrolledtext.ScrolledText(
         source_code_window, font=("Arial", 10), wrap="word")
@@ -222,9 +432,9 @@ def open_main_window():
     global root
     root = tk.Tk()  # Initializes the root Tkinter window
     root.title("Opciones de Cifrado")  # Sets the window title
-    root.geometry("300x310")  # Defines the main window size
+    root.geometry("300x350")  # Defines the main window size
 
-    default_size = "500x370"  # Default size for encryption method windows
+    default_size = "500x500"  # Default size for encryption method windows
 
     # Main label in the main window
     label = tk.Label(
@@ -243,7 +453,8 @@ def open_main_window():
         encrypt_func=cm.transposition_cipher,
         # Decryption function for Transposition Cipher
         decrypt_func=cm.transposition_decipher,
-        default_size=default_size
+        default_size=default_size,
+        method='transposition'
     )
 
     # Caesar Cipher
@@ -254,7 +465,8 @@ def open_main_window():
         text_type=str,              # Specifies that the text is a string
         encrypt_func=cm.caesar_cipher,  # Encryption function for Caesar Cipher
         decrypt_func=cm.caesar_decipher,  # Decryption function for Caesar Cipher
-        default_size=default_size
+        default_size=default_size,
+        method='caesar'
     )
 
     # Vigenère Cipher
@@ -265,7 +477,21 @@ def open_main_window():
         text_type=str,              # Specifies that the text is a string
         encrypt_func=cm.vigenere_cipher,  # Encryption function for Vigenère Cipher
         decrypt_func=cm.vigenere_decipher,  # Decryption function for Vigenère Cipher
-        default_size=default_size
+        default_size=default_size,
+        method='vigenere'
+    )
+
+    # Hill Cipher
+    hill_window = CipherWindow(
+        root,
+        title="Cifrado de Hill",
+        key_type=str,               # Specifies that the key is a string of k * k letters
+        text_type=str,              # Specifies that the text is a string
+        encrypt_func=cm.hill_cipher,  # Encryption function for Hill Cipher
+        decrypt_func=cm.hill_decipher,  # Decryption function for Hill Cipher
+        default_size=default_size,
+        method='hill',
+        key_validator=e.validate_hill_key  # The key matrix must be invertible modulo 27
     )
 
     # Buttons for each encryption method, linking to each CipherWindow instance's open_window method
@@ -284,6 +510,11 @@ def open_main_window():
     )
     btn_vigenere.pack(pady=5)  # Adds padding for spacing
 
+    btn_hill = tk.Button(
+        root, text="Cifrado de Hill", command=hill_window.open_window
+    )
+    btn_hill.pack(pady=5)  # Adds padding for spacing
+
     # Additional buttons (not requiring a CipherWindow)
 
     # Button to open the source code window
@@ -1,10 +1,28 @@
-from methods import crypto_methods as cm
-from gui import windows as w
+import sys
 
 
-def main():
+def main(argv=None):
+    """
+    Opens the graphical interface or, when command line arguments are given, runs the headless
+    command line interface (see cli.py).
+
+    Parameters:
+    argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+    int: The exit status.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv:
+        import cli
+        return cli.main(argv)
+
+    # The GUI (and with it tkinter and NumPy) is only imported once the application is launched
+    from gui import windows as w
     w.open_main_window()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
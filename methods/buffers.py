@@ -0,0 +1,207 @@
+from methods import crypto_methods as cm
+from methods import out_of_core as ooc
+from utils import alphabet as a
+from utils import codec  # Registers the 'spanish27' codec
+from utils import instrumentation as i
+from utils import lazy
+from utils import misc as m
+
+np = lazy.lazy_import('numpy')
+
+# Number of bytes read from a file on every iteration of cipher_file
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def as_indices(buffer, writable: bool = False):
+    """
+    Views a bytes-like object as a uint8 array of alphabet positions, without copying it.
+
+    Parameters:
+    buffer (bytes, bytearray, memoryview or np.ndarray): A contiguous buffer, e.g. text encoded
+    with the 'spanish27' codec.
+    writable (bool): If True, the buffer must be writable (bytes are not).
+
+    Returns:
+    np.ndarray: A uint8 array sharing the memory of the buffer.
+
+    Raises:
+    TypeError: If writable is True and the buffer is read-only.
+    """
+    view = np.frombuffer(buffer, dtype=np.uint8)
+    if writable and not view.flags.writeable:
+        raise TypeError("The output buffer must be writable (e.g. a bytearray).")
+    return view
+
+
+def _check_positions(indices, alphabet):
+    """
+    Raises ValueError if any byte is not a position of the alphabet.
+    """
+    invalid = np.flatnonzero(indices >= len(alphabet))
+    if invalid.size:
+        raise ValueError(f"Byte {int(indices[invalid[0]])} at position {int(invalid[0])} "
+                         f"is not a letter of the alphabet.")
+
+
+@i.instrument(data='data')
+def cipher_buffer(method: str, data, key, decrypt: bool = False, out=None, offset: int = 0,
+                  alphabet: a.Alphabet = a.SPANISH):
+    """
+    Encrypts or decrypts a buffer of alphabet positions, one byte per letter as written by the
+    'spanish27' codec, without creating any string.
+
+    The result is written into out, which may be the input buffer itself to work in place.
+    Substitution ciphers never copy the data; transposition gathers it once.
+
+    Unlike transposition_cipher and transposition_decipher, the byte transposition does not separate
+    the columns or characters with spaces. Its output holds rows * len(key) bytes, the last row
+    being filled by wrapping to the beginning of the text, as in the text version. Hill fills its
+    last block the same way.
+
+    Parameters:
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    data (bytes, bytearray, memoryview or np.ndarray): The alphabet positions to be processed.
+    key (int or str): The key of the cipher.
+    decrypt (bool): If True, the data is decrypted instead of encrypted.
+    out (bytearray, memoryview or np.ndarray): A writable buffer for the result, which may share
+    memory with data. Defaults to a new bytearray.
+    offset (int): The key position of the first byte, to process a long text in consecutive buffers
+    (Vigenère only).
+    alphabet (Alphabet): The alphabet of the data and key. Defaults to the Spanish alphabet.
+
+    Returns:
+    bytearray, memoryview or np.ndarray: The buffer holding the result (out, if it was given).
+
+    Raises:
+    ValueError: If the key is invalid, a byte is outside the alphabet, out has the wrong size or
+    a Hill ciphertext is not made of whole blocks.
+    TypeError: If out is read-only.
+    """
+    cipher = cm.Cipher.compile(method, key, alphabet)
+    source = as_indices(data)
+    _check_positions(source, alphabet)
+
+    if method == 'transposition':
+        if decrypt:
+            positions = cm.transposition_decipher_indices(len(source), cipher.order, cipher.inverse_order)
+        else:
+            positions = cm.transposition_cipher_indices(len(source), cipher.order)
+        length = positions.size
+    elif method == 'hill':
+        size = len(cipher.matrix)
+        if decrypt and len(source) % size:
+            raise ValueError("The text length must be a multiple of the Hill block size.")
+        length = -(-len(source) // size) * size
+    else:
+        length = len(source)
+
+    if out is None:
+        out = bytearray(length)
+    target = as_indices(out, writable=True)
+    if len(target) != length:
+        raise ValueError(f"The output buffer must hold {length} bytes, not {len(target)}.")
+
+    if method == 'transposition':
+        # The gather reads every source byte before any is written, so the buffers may overlap
+        target[...] = source[positions.ravel()]
+        return out
+
+    if method == 'hill':
+        # The matrix product reads every source byte before any is written, so the buffers may overlap
+        matrix = cipher.inverse_matrix if decrypt else cipher.matrix
+        target[...] = cm.hill_transform(m.fill_text(source, length), matrix, len(alphabet))
+        return out
+
+    if not np.shares_memory(source, target):
+        target[...] = source
+
+    shifts = cipher.decrypt_shifts if decrypt else cipher.encrypt_shifts
+    shifted = cm.shift_indices(target, np.roll(shifts, -(offset % len(shifts))), len(alphabet))
+    # Alphabets of more than 128 letters are shifted in a wider copy
+    if shifted is not target:
+        target[...] = shifted
+    return out
+
+
+def encrypt_buffer(data, key, method: str = 'vigenere', **options):
+    """
+    Encrypts a buffer of alphabet positions. See cipher_buffer for the available options.
+
+    Returns:
+    bytearray, memoryview or np.ndarray: The buffer holding the result.
+    """
+    return cipher_buffer(method, data, key, decrypt=False, **options)
+
+
+def decrypt_buffer(data, key, method: str = 'vigenere', **options):
+    """
+    Decrypts a buffer of alphabet positions. See cipher_buffer for the available options.
+
+    Returns:
+    bytearray, memoryview or np.ndarray: The buffer holding the result.
+    """
+    return cipher_buffer(method, data, key, decrypt=True, **options)
+
+
+def cipher_file(source: str, destination: str, method: str, key, decrypt: bool = False,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, alphabet: a.Alphabet = a.SPANISH) -> int:
+    """
+    Encrypts or decrypts a file written with the 'spanish27' codec into another file of the same kind.
+
+    Substitution ciphers read every chunk into a single reused buffer, process it in place and write
+    it back, so the file goes from disk to disk without any string or per-chunk allocation.
+    Hill reads chunks of whole blocks.
+    Transposition goes through methods.out_of_core, which memory-maps both files.
+
+    Parameters:
+    source (str): The path of the file to read.
+    destination (str): The path of the file to write.
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    key (int or str): The key of the cipher.
+    decrypt (bool): If True, the file is decrypted instead of encrypted.
+    chunk_size (int): The number of bytes processed at once by the substitution ciphers.
+    alphabet (Alphabet): The alphabet of the file and key. Defaults to the Spanish alphabet.
+
+    Returns:
+    int: The number of bytes written.
+    """
+    # Transposition is a global permutation: it is applied on memory-mapped files instead
+    if method == 'transposition':
+        if decrypt:
+            return ooc.transposition_decipher_file(source, destination, key)
+        return ooc.transposition_cipher_file(source, destination, key)
+
+    if method == 'hill':
+        return _hill_file(source, destination, key, decrypt, chunk_size, alphabet)
+
+    with open(source, 'rb') as reader, open(destination, 'wb') as writer:
+        buffer = memoryview(bytearray(chunk_size))
+        written = 0
+        while size := reader.readinto(buffer):
+            chunk = buffer[:size]
+            cipher_buffer(method, chunk, key, decrypt, out=chunk, offset=written, alphabet=alphabet)
+            written += writer.write(chunk)
+        return written
+
+
+def _hill_file(source, destination, key, decrypt, chunk_size, alphabet):
+    """
+    Applies the Hill cipher to a file by chunks of whole blocks. When encrypting, the last block is
+    completed with the first bytes of the file, as cipher_buffer does for a whole text.
+    """
+    size = len(cm.Cipher.compile('hill', key, alphabet).matrix)
+    chunk_size = max(chunk_size // size, 1) * size
+
+    with open(source, 'rb') as reader, open(destination, 'wb') as writer:
+        buffer = memoryview(bytearray(chunk_size))
+        head = b''
+        written = 0
+        while length := reader.readinto(buffer):
+            chunk = buffer[:length]
+            if not written:
+                head = bytes(chunk[:size])
+            elif length % size and not decrypt:
+                chunk = bytearray(chunk) + head[:size - length % size]
+            written += writer.write(cipher_buffer('hill', chunk, key, decrypt, alphabet=alphabet))
+        return written
+
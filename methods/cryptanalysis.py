@@ -0,0 +1,513 @@
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import lazy
+from utils import misc as m
+from files import file_loader as f
+
+np = lazy.lazy_import('numpy')
+
+# Relative frequency (%) of each letter of the Spanish alphabet in Spanish text,
+# with accented vowels counted as their base letter. The frequencies are kept as a tuple,
+# so importing the module does not load NumPy.
+_SPANISH_PERCENTAGES = (
+    12.027,  # A
+    2.215,   # B
+    4.019,   # C
+    5.010,   # D
+    12.614,  # E
+    0.692,   # F
+    1.768,   # G
+    0.703,   # H
+    6.972,   # I
+    0.493,   # J
+    0.011,   # K
+    4.967,   # L
+    3.157,   # M
+    6.712,   # N
+    0.311,   # Ñ
+    9.510,   # O
+    2.510,   # P
+    0.877,   # Q
+    6.871,   # R
+    7.977,   # S
+    4.632,   # T
+    3.107,   # U
+    1.138,   # V
+    0.017,   # W
+    0.215,   # X
+    1.008,   # Y
+    0.467,   # Z
+)
+SPANISH_FREQUENCIES = tuple(percentage / sum(_SPANISH_PERCENTAGES) for percentage in _SPANISH_PERCENTAGES)
+
+# Number of ciphertext letters used to estimate the Vigenère key length
+DEFAULT_SAMPLE_SIZE = 1 << 18
+
+# Number of ciphertext letters counted at once when recovering the Vigenère key
+BLOCK_SIZE = 1 << 20
+
+# A candidate key together with its chi-squared distance to the expected letter frequencies
+Candidate = namedtuple('Candidate', ['key', 'score'])
+
+
+def letter_counts(text: str, alphabet: a.Alphabet = a.SPANISH):
+    """
+    Counts how many times each letter of the alphabet appears in a text, ignoring other characters.
+
+    Parameters:
+    text (str): The text to analyze.
+    alphabet (Alphabet): The alphabet whose letters are counted. Defaults to the Spanish alphabet.
+
+    Returns:
+    np.ndarray: An array with the number of occurrences of each letter, in alphabet order.
+    """
+    indices = alphabet.to_indices(text)
+    return np.bincount(indices[indices != a.INVALID_INDEX], minlength=len(alphabet))
+
+
+def chi_squared(observed, frequencies):
+    """
+    Computes the chi-squared distance between letter counts and the expected letter frequencies.
+
+    Parameters:
+    observed (np.ndarray): Letter counts; the last axis runs over the alphabet.
+    frequencies (sequence of float): The expected relative frequency of each letter, adding up to 1.
+
+    Returns:
+    np.ndarray: The chi-squared statistic of every row of observed (lower is closer).
+    """
+    expected = observed.sum(axis=-1, keepdims=True) * np.asarray(frequencies, dtype=np.float64)
+    return ((observed - expected) ** 2 / np.maximum(expected, 1e-12)).sum(axis=-1)
+
+
+def crack_caesar(text: str, alphabet: a.Alphabet = a.SPANISH, frequencies=SPANISH_FREQUENCIES) -> list:
+    """
+    Recovers the key of a Caesar ciphertext by trying every shift at once and ranking the
+    candidates by how closely their letter frequencies match the expected ones.
+
+    Deciphering with shift k turns ciphertext letter c into c - k, so the letter counts of every
+    candidate are a rotation of the ciphertext counts. All candidates are scored together from a
+    (len(alphabet), len(alphabet)) matrix of rotated counts, without deciphering the text.
+
+    Parameters:
+    text (str): The ciphertext. Characters outside the alphabet are ignored.
+    alphabet (Alphabet): The alphabet of the ciphertext. Defaults to the Spanish alphabet.
+    frequencies (sequence of float): The expected relative frequency of each letter. Defaults to Spanish.
+
+    Returns:
+    list of Candidate: Every possible key with its chi-squared score, best candidate first.
+    The plaintext of a candidate is caesar_decipher(text, candidate.key).
+    """
+    counts = letter_counts(text, alphabet)
+    alphabet_size = len(alphabet)
+
+    # Row k holds the plaintext letter counts obtained with shift k
+    shifts = np.arange(alphabet_size)
+    observed = counts[(shifts[:, np.newaxis] + shifts) % alphabet_size]
+
+    scores = chi_squared(observed, frequencies)
+    ranking = np.argsort(scores, kind='stable')
+    return [Candidate(int(key), float(scores[key])) for key in ranking]
+
+
+# Result of crack_vigenere: the recovered key, the evidence behind it and the time spent per stage
+VigenereAnalysis = namedtuple('VigenereAnalysis', [
+    'key', 'key_length', 'autocorrelation_key_length',
+    'index_of_coincidence', 'autocorrelation', 'timings'])
+
+
+def coincidences(indices, alphabet_size: int):
+    """
+    Counts, for every lag s, how many positions i satisfy indices[i] == indices[i + s].
+
+    The counts are the sum of the autocorrelations of the indicator vector of every letter,
+    computed with FFTs instead of comparing the text with each of its shifts.
+
+    Parameters:
+    indices (np.ndarray): The alphabet positions of the text.
+    alphabet_size (int): The number of letters in the alphabet.
+
+    Returns:
+    np.ndarray: An integer array where element s is the number of coincidences at lag s.
+    """
+    length = len(indices)
+    if not length:
+        return np.zeros(0, dtype=np.int64)
+
+    # Zero-pad to avoid circular wrap-around, rounding up to a fast FFT size
+    size = 1 << (2 * length - 1).bit_length()
+    power = np.zeros(size // 2 + 1)
+
+    for letter in np.flatnonzero(np.bincount(indices, minlength=alphabet_size)):
+        spectrum = np.fft.rfft(indices == letter, size)
+        power += spectrum.real ** 2 + spectrum.imag ** 2
+
+    return np.rint(np.fft.irfft(power, size)[:length]).astype(np.int64)
+
+
+def period_index_of_coincidence(counts, length: int, max_period: int):
+    """
+    Computes the average index of coincidence of the columns obtained by splitting a text
+    into every candidate period.
+
+    Two positions fall in the same column of period L exactly when their distance is a
+    multiple of L, so the coincidences of every column come from the lag counts at L, 2L, ...
+
+    Parameters:
+    counts (np.ndarray): The coincidences per lag returned by coincidences().
+    length (int): The number of letters of the text.
+    max_period (int): The largest period to evaluate.
+
+    Returns:
+    np.ndarray: An array where element L is the index of coincidence for period L (element 0 is NaN).
+    """
+    result = np.full(max_period + 1, np.nan)
+
+    for period in range(1, min(max_period, length - 1) + 1):
+        # Column sizes: 'longer' columns of quotient + 1 letters, the rest of quotient letters
+        quotient, longer = divmod(length, period)
+        pairs = longer * (quotient + 1) * quotient + (period - longer) * quotient * (quotient - 1)
+        if pairs:
+            result[period] = 2 * counts[period::period].sum() / pairs
+
+    return result
+
+
+def _first_peak(scores, alphabet_size: int):
+    """
+    Returns the smallest period whose score is close to the best one.
+
+    Multiples of the key length score as well as the key length itself, so the smallest
+    period within a quarter of the gap between the best score and random text is chosen.
+
+    Parameters:
+    scores (np.ndarray): A score per period; element 0 and unavailable periods are NaN.
+    alphabet_size (int): The number of letters in the alphabet.
+
+    Returns:
+    int: The estimated key length, or 0 if no period could be scored.
+    """
+    if np.isnan(scores).all():
+        return 0
+    random_score = 1 / alphabet_size
+    threshold = random_score + 0.75 * (np.nanmax(scores) - random_score)
+    return int(np.flatnonzero(np.nan_to_num(scores, nan=-np.inf) >= threshold)[0])
+
+
+def recover_vigenere_key(indices, key_length: int, alphabet: a.Alphabet = a.SPANISH,
+                         frequencies=SPANISH_FREQUENCIES) -> str:
+    """
+    Recovers a Vigenère key of known length by fitting the letter frequencies of every column.
+
+    Each column is a Caesar ciphertext, so all columns and all shifts are scored at once from a
+    (key_length, len(alphabet), len(alphabet)) matrix of rotated column counts.
+
+    Parameters:
+    indices (np.ndarray): The alphabet positions of the ciphertext letters.
+    key_length (int): The length of the key.
+    alphabet (Alphabet): The alphabet of the ciphertext. Defaults to the Spanish alphabet.
+    frequencies (sequence of float): The expected relative frequency of each letter. Defaults to Spanish.
+
+    Returns:
+    str: The most likely key.
+    """
+    alphabet_size = len(alphabet)
+    offsets = np.arange(key_length, dtype=np.int64) * alphabet_size
+    counts = np.zeros(key_length * alphabet_size, dtype=np.int64)
+
+    # Count every (column, letter) pair, in blocks that start at column 0
+    block_size = max(BLOCK_SIZE // key_length, 1) * key_length
+    for start in range(0, len(indices), block_size):
+        block = indices[start:start + block_size]
+        full = len(block) - len(block) % key_length
+        counts += np.bincount((block[:full].reshape(-1, key_length) + offsets).ravel(),
+                              minlength=len(counts))
+        counts[offsets[:len(block) - full] + block[full:]] += 1
+
+    # Element [c, k, p] holds the count of plaintext letter p in column c if its key letter is k
+    shifts = np.arange(alphabet_size)
+    observed = counts.reshape(key_length, alphabet_size)[:, (shifts[:, np.newaxis] + shifts) % alphabet_size]
+
+    return alphabet.decode(chi_squared(observed, frequencies).argmin(axis=1))
+
+
+def crack_vigenere(text: str, max_period: int = 100, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                   alphabet: a.Alphabet = a.SPANISH, frequencies=SPANISH_FREQUENCIES) -> VigenereAnalysis:
+    """
+    Estimates the key length of a Vigenère ciphertext and recovers the key.
+
+    The key length is estimated on the first sample_size letters, from the index of coincidence
+    of every candidate period and from the FFT autocorrelation of the text. The key is then
+    recovered from the letter frequencies of every column over the whole text.
+
+    Parameters:
+    text (str): The ciphertext. Characters outside the alphabet are ignored.
+    max_period (int): The largest key length considered.
+    sample_size (int): The number of letters used to estimate the key length.
+    alphabet (Alphabet): The alphabet of the ciphertext. Defaults to the Spanish alphabet.
+    frequencies (sequence of float): The expected relative frequency of each letter. Defaults to Spanish.
+
+    Returns:
+    VigenereAnalysis: The recovered key, the estimated key lengths, the index of coincidence
+    and normalized autocorrelation per period, and the seconds spent in each stage.
+    """
+    timings = {}
+    alphabet_size = len(alphabet)
+
+    start = time.perf_counter()
+    indices = alphabet.to_indices(text)
+    indices = indices[indices != a.INVALID_INDEX]
+    sample = indices[:sample_size]
+    timings['encode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counts = coincidences(sample, alphabet_size)
+    timings['autocorrelation'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_of_coincidence = period_index_of_coincidence(counts, len(sample), max_period)
+    key_length = _first_peak(index_of_coincidence, alphabet_size)
+
+    # Fraction of coinciding positions at every lag, used as an independent estimate
+    lags = np.arange(min(max_period, max(len(sample) - 1, 0)) + 1)
+    autocorrelation = np.full(max_period + 1, np.nan)
+    autocorrelation[lags[1:]] = counts[lags[1:]] / (len(sample) - lags[1:])
+    autocorrelation_key_length = _first_peak(autocorrelation, alphabet_size)
+    timings['key_length'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    key = recover_vigenere_key(indices, key_length, alphabet, frequencies) if key_length else ''
+    timings['key'] = time.perf_counter() - start
+
+    return VigenereAnalysis(key, key_length, autocorrelation_key_length,
+                            index_of_coincidence, autocorrelation, timings)
+
+
+# Result of a transposition key search: the column order, an equivalent key and its bigram score
+TranspositionSolution = namedtuple('TranspositionSolution', ['key', 'order', 'score'])
+
+
+def ngram_log_probabilities(corpus: str, n: int = 2, alphabet: a.Alphabet = a.SPANISH):
+    """
+    Builds a table with the log-probability of every n-gram of the alphabet from a sample text.
+
+    Accents are removed and characters outside the alphabet are dropped, and every count is
+    increased by one so that n-grams missing from the corpus keep a finite score.
+
+    Parameters:
+    corpus (str): The sample text.
+    n (int): The length of the n-grams. Defaults to bigrams.
+    alphabet (Alphabet): The alphabet of the n-grams. Defaults to the Spanish alphabet.
+
+    Returns:
+    np.ndarray: An array with n axes of len(alphabet) elements; element [x1, ..., xn] is the
+    log-probability of the n-gram x1...xn.
+    """
+    alphabet_size = len(alphabet)
+    indices = alphabet.to_indices(m.remove_accents(corpus)).astype(np.int64)
+    indices = indices[indices != a.INVALID_INDEX]
+
+    # Number every n-gram in base len(alphabet) and count them all at once
+    codes = np.zeros(max(len(indices) - n + 1, 0), dtype=np.int64)
+    for offset in range(n):
+        codes = codes * alphabet_size + indices[offset:len(indices) - n + 1 + offset]
+    counts = np.bincount(codes, minlength=alphabet_size ** n) + 1
+
+    return np.log(counts / counts.sum()).reshape((alphabet_size,) * n)
+
+
+@lru_cache(maxsize=None)
+def spanish_bigrams():
+    """
+    Returns the bigram log-probability table of the Spanish sample text shipped in files/.
+
+    The table is built on the first call and shared afterwards.
+
+    Returns:
+    np.ndarray: A (27, 27) array of bigram log-probabilities.
+    """
+    with open(f.load_file('spanish_corpus', 'txt'), encoding='utf-8') as corpus:
+        table = ngram_log_probabilities(corpus.read())
+    table.flags.writeable = False
+    return table
+
+
+def transposition_column_scores(text: str, key_length: int, bigrams, alphabet: a.Alphabet = a.SPANISH):
+    """
+    Scores every pair of ciphertext columns by how likely they are to be adjacent in the plaintext.
+
+    A candidate column order places the ciphertext columns side by side; its bigram score is the sum
+    of the scores of each pair of neighbouring columns, plus the pair formed by the last column of
+    a row and the first column of the next row. Both are precomputed here once.
+
+    Parameters:
+    text (str): The ciphertext produced by transposition_cipher. Spaces are ignored.
+    key_length (int): The length of the key.
+    bigrams (np.ndarray): A (len(alphabet), len(alphabet)) table of bigram log-probabilities.
+    alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+    tuple of np.ndarray: The (key_length, key_length) adjacent-column scores, where element [i, j]
+    scores column j right after column i in the same row, and the row-wrap scores, where element
+    [i, j] scores column j at the start of the row that follows one ending with column i.
+    """
+    indices = alphabet.encode(text.replace(' ', ''))
+    if len(indices) % key_length:
+        raise ValueError("The text length must be a multiple of the key length.")
+
+    # Ciphertext column c holds plaintext column order[c], one letter per row
+    columns = indices.reshape(key_length, -1).astype(np.intp)
+
+    adjacent = np.empty((key_length, key_length))
+    wrap = np.empty((key_length, key_length))
+    for column in range(key_length):
+        adjacent[column] = bigrams[columns[column], columns].sum(axis=1)
+        wrap[column] = bigrams[columns[column, :-1], columns[:, 1:]].sum(axis=1)
+    return adjacent, wrap
+
+
+def _score_orders(orders, adjacent, wrap):
+    """
+    Computes the bigram score of many column orders with index gathers.
+
+    Parameters:
+    orders (np.ndarray): A (candidates, key_length) array; row r lists the ciphertext column placed
+    at each plaintext position.
+    adjacent (np.ndarray): The adjacent-column scores of transposition_column_scores.
+    wrap (np.ndarray): The row-wrap scores of transposition_column_scores.
+
+    Returns:
+    np.ndarray: The score of every candidate.
+    """
+    return adjacent[orders[:, :-1], orders[:, 1:]].sum(axis=1) + wrap[orders[:, -1], orders[:, 0]]
+
+
+@lru_cache(maxsize=None)
+def _neighbourhood(key_length: int):
+    """
+    Lists every move of the hill climb as a reordering of positions: swapping two positions and
+    moving a block of consecutive positions somewhere else.
+
+    Parameters:
+    key_length (int): The length of the key.
+
+    Returns:
+    np.ndarray: A (moves, key_length) array; applying move r to an order is order[moves[r]].
+    """
+    identity = np.arange(key_length)
+    moves = set()
+
+    for i in range(key_length):
+        for j in range(i + 1, key_length):
+            swap = identity.copy()
+            swap[[i, j]] = swap[[j, i]]
+            moves.add(tuple(swap))
+
+        # Move the block starting at i, of every length, to every other position
+        for end in range(i + 1, key_length + 1):
+            block, rest = identity[i:end], np.delete(identity, np.s_[i:end])
+            for position in range(len(rest) + 1):
+                moves.add(tuple(np.concatenate((rest[:position], block, rest[position:]))))
+
+    moves.discard(tuple(identity))
+    return np.array(sorted(moves), dtype=np.intp).reshape(-1, key_length)
+
+
+def _hill_climb(adjacent, wrap, seed: int, max_steps: int):
+    """
+    Climbs from a random column order to a local optimum, taking the best move at every step.
+
+    Parameters:
+    adjacent (np.ndarray): The adjacent-column scores of transposition_column_scores.
+    wrap (np.ndarray): The row-wrap scores of transposition_column_scores.
+    seed (int): The seed of the random starting order.
+    max_steps (int): The maximum number of moves.
+
+    Returns:
+    tuple: The best score and the column order that reaches it.
+    """
+    key_length = len(adjacent)
+    order = np.random.default_rng(seed).permutation(key_length)
+    score = _score_orders(order[np.newaxis], adjacent, wrap)[0]
+    moves = _neighbourhood(key_length)
+
+    for _ in range(max_steps):
+        if not len(moves):
+            break
+        candidates = order[moves]
+        scores = _score_orders(candidates, adjacent, wrap)
+        best = scores.argmax()
+        if scores[best] <= score:
+            break
+        order, score = candidates[best], scores[best]
+
+    return float(score), order
+
+
+def _order_to_key(order, alphabet: a.Alphabet):
+    """
+    Builds a key whose transposition_order is the given column order.
+
+    Parameters:
+    order (np.ndarray): A permutation of range(key_length).
+    alphabet (Alphabet): The alphabet whose letters form the key.
+
+    Returns:
+    str: A key with distinct letters, or None if the key is longer than the alphabet.
+    """
+    if len(order) > len(alphabet):
+        return None
+    ranks = np.argsort(order)
+    return ''.join(sorted(alphabet.letters[:len(order)])[rank] for rank in ranks)
+
+
+def solve_transposition(text: str, key_length: int, restarts: int = 64, max_steps: int = 1000,
+                        workers: int = None, bigrams=None, on_improvement=None, seed: int = 0,
+                        alphabet: a.Alphabet = a.SPANISH) -> TranspositionSolution:
+    """
+    Searches the column order of a transposition ciphertext by hill climbing from random starts,
+    spreading the restarts over a pool of worker processes.
+
+    Candidates are never deciphered: the bigram scores of every pair of ciphertext columns are
+    computed once, and each candidate order is scored with index gathers over those tables.
+
+    Parameters:
+    text (str): The ciphertext produced by transposition_cipher.
+    key_length (int): The length of the key.
+    restarts (int): The number of random starting orders.
+    max_steps (int): The maximum number of moves of each climb.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    bigrams (np.ndarray): The bigram log-probability table. Defaults to spanish_bigrams().
+    on_improvement (callable): Called with the new TranspositionSolution whenever a restart
+    finishes with a better score than every previous one.
+    seed (int): The seed of the first restart; restart r uses seed + r.
+    alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+    TranspositionSolution: The best key found, its column order and its score. The plaintext is
+    transposition_decipher(text, solution.key).
+    """
+    if bigrams is None:
+        bigrams = spanish_bigrams()
+    adjacent, wrap = transposition_column_scores(text, key_length, bigrams, alphabet)
+
+    best = None
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(_hill_climb, adjacent, wrap, seed + restart, max_steps)
+                   for restart in range(restarts)]
+
+        for future in as_completed(futures):
+            score, order = future.result()
+            if best is None or score > best.score:
+                # The ciphertext column at each plaintext position is the rank of that key letter
+                key_order = np.argsort(order)
+                best = TranspositionSolution(_order_to_key(key_order, alphabet), key_order, score)
+                if on_improvement is not None:
+                    on_improvement(best)
+
+    return best
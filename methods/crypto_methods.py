@@ -1,184 +1,783 @@
-import numpy as np
+import math
+import operator
+from functools import lru_cache
 from utils import misc as m
 from utils import entry_validator as e
-from textwrap import wrap
+from utils import alphabet as a
+from utils import instrumentation as i
+from utils import lazy
 
+np = lazy.lazy_import('numpy')
 
-def transposition_cipher(text: str, key: str) -> str:
+
+def transposition_order(key: str):
+    """
+    Computes the column order of the transposition cipher: the position in the key of each
+    character once the key is sorted alphabetically.
+
+    A stable sort is used, so repeated letters keep their relative order and every column
+    appears exactly once.
+
+    Parameters:
+    key (str): The key used to define the column order.
+
+    Returns:
+    np.ndarray: A permutation of range(len(key)) with the key column read at each output position.
+
+    Raises:
+    ValueError: If the key is empty.
+    """
+    if not key:
+        raise ValueError("The key must not be empty.")
+    return np.argsort(m.text_to_codepoints(key), kind='stable')
+
+
+def transposition_cipher_indices(length: int, order):
+    """
+    Computes, for every character of the ciphered text, its position in the original text.
+
+    The text is laid out in rows as long as the key, wrapping back to its beginning to fill
+    the last row, and the columns are read in the given order.
+
+    Parameters:
+    length (int): The number of characters of the text, without spaces.
+    order (np.ndarray): The column order returned by transposition_order.
+
+    Returns:
+    np.ndarray: An array of shape (columns, rows) with the source position of each ciphered character.
+    """
+    columns = len(order)
+    rows = -(-length // columns)
+    return (np.arange(rows) * columns + order[:, np.newaxis]) % max(length, 1)
+
+
+def transposition_decipher_indices(length: int, order, ranks=None):
+    """
+    Computes, for every character of the deciphered text, its position in the ciphered text.
+
+    Parameters:
+    length (int): The number of characters of the ciphered text, without spaces.
+    order (np.ndarray): The column order returned by transposition_order.
+    ranks (np.ndarray): The inverse permutation of order (Cipher.inverse_order), if already computed.
+
+    Returns:
+    np.ndarray: An array of shape (rows, columns) with the source position of each deciphered character.
+
+    Raises:
+    ValueError: If the length is not a multiple of the key length.
+    """
+    columns = len(order)
+    if length % columns:
+        raise ValueError("The text length must be a multiple of the key length.")
+    rows = length // columns
+
+    # Output column j was written at the rank of key character j in the sorted key
+    if ranks is None:
+        ranks = np.argsort(order)
+    return ranks * rows + np.arange(rows)[:, np.newaxis]
+
+
+def encode_text(text, alphabet: a.Alphabet = a.SPANISH):
+    """
+    Returns the alphabet positions of a text, accepting texts that are already encoded.
+
+    Parameters:
+    text (str or np.ndarray): The text, or the array of alphabet positions returned by
+    entry_validator.encode_input or Alphabet.encode.
+    alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+    np.ndarray: A new uint8 array with the alphabet position of each character.
+
+    Raises:
+    ValueError: If a string contains characters outside the alphabet.
+    """
+    if isinstance(text, np.ndarray):
+        return text.astype(np.uint8)
+    return alphabet.encode(text)
+
+
+@i.instrument(data='text')
+def transposition_cipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Applies a columnar transposition cipher to the input text based on a given key.
 
     Parameters:
-    text (str): The text to be encrypted using the transposition cipher.
+    text (str or np.ndarray): The text to be encrypted using the transposition cipher, or its alphabet positions.
     key (str): The key used to define the column order. The key is sorted alphabetically to determine
     the reordering of columns.
+    alphabet (Alphabet): The alphabet used to decode an already encoded text. Defaults to the Spanish alphabet.
 
     Returns:
     ciphered_array (str): The encrypted text, where each "column" of the original text is rearranged
     according to the order defined by the sorted key.
     """
-    # Step 1: Divide text into columns based on the length of the key
-    text = m.split_sentence_into_columns(text, columns=len(key))
+    # Sort the key to determine the column rearrangement order
+    return _transpose(text, transposition_order(key), alphabet)
+
 
-    # Step 2: Sort the key to determine the column rearrangement order
-    indexes = [key.index(char) for char in sorted(list(key))]
+def _transpose(text, order, alphabet: a.Alphabet = a.SPANISH) -> str:
+    """
+    Applies the columnar transposition defined by a precomputed column order.
+
+    Parameters:
+    text (str or np.ndarray): The text to be encrypted, or its alphabet positions.
+    order (np.ndarray): The column order returned by transposition_order.
+    alphabet (Alphabet): The alphabet used to decode an already encoded text.
+
+    Returns:
+    str: The encrypted text, with the columns separated by spaces.
+    """
+    # Step 1: Remove spaces and view the text as a flat array of code points
+    text = _transposition_codepoints(text, alphabet)
 
-    # Step 3: Reorder columns in the text according to the sorted key's indexes
-    ciphered_array = m.columns_to_words(text[:, indexes])
+    # Step 2: Gather every column of the text in the sorted key's order at once
+    columns = text[transposition_cipher_indices(len(text), order)]
 
-    # Step 4: Combine columns to form the final ciphered text
-    return ' '.join(ciphered_array)
+    # Step 3: Separate the columns with spaces to form the final ciphered text
+    ciphered_array = np.full((columns.shape[0], columns.shape[1] + 1), ord(' '), dtype=np.uint32)
+    ciphered_array[:, :-1] = columns
+    return m.codepoints_to_text(ciphered_array.ravel()[:-1])
 
 
-def transposition_decipher(text: str, key: str) -> str:
+@i.instrument(data='text')
+def transposition_decipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Deciphers a text encoded using a columnar transposition cipher, where columns are reordered according to the specified key.
 
     Parameters:
-    text (str): The encrypted text to be deciphered. Spaces are removed for processing.
+    text (str or np.ndarray): The encrypted text to be deciphered, or its alphabet positions. Spaces are removed for processing.
     key (str): The key string used to determine the column order.
+    alphabet (Alphabet): The alphabet used to decode an already encoded text. Defaults to the Spanish alphabet.
 
     Returns:
     str: The deciphered text, with characters reordered back into their original form.
     """
-    # Remove spaces from the text for consistent processing
-    text = text.replace(' ', '')
+    # Determine the column order based on alphabetical ordering of the key
+    return _untranspose(text, transposition_order(key), alphabet)
+
 
-    # Calculate the number of rows needed to accommodate the text in columns based on the key length
-    rows = int(np.ceil(len(text) / len(key)))
+def _untranspose(text, order, alphabet: a.Alphabet = a.SPANISH, ranks=None) -> str:
+    """
+    Reverts the columnar transposition defined by a precomputed column order.
 
-    # Split the text into chunks representing rows in the transposition table
-    chunked_text = wrap(text, rows)
+    Parameters:
+    text (str or np.ndarray): The encrypted text, or its alphabet positions. Spaces are removed for processing.
+    order (np.ndarray): The column order returned by transposition_order.
+    alphabet (Alphabet): The alphabet used to decode an already encoded text.
+    ranks (np.ndarray): The inverse permutation of order, if already computed.
 
-    # Determine the column order based on alphabetical ordering of the key
-    indexes = [sorted(list(key)).index(char) for char in key]
+    Returns:
+    str: The deciphered text, with its characters separated by spaces.
+    """
+    # Remove spaces from the text and view it as a flat array of code points
+    text = _transposition_codepoints(text, alphabet)
+
+    # Gather every row of the original text at once
+    rows = text[transposition_decipher_indices(len(text), order, ranks)]
+
+    # Separate the characters with spaces to form the final deciphered text
+    deciphered_array = np.full((rows.size, 2), ord(' '), dtype=np.uint32)
+    deciphered_array[:, 0] = rows.ravel()
+    return m.codepoints_to_text(deciphered_array.ravel()[:-1])
+
+
+def _transposition_codepoints(text, alphabet):
+    """
+    Returns the code points of a text without spaces, decoding it first if it is already encoded.
+    """
+    if isinstance(text, np.ndarray):
+        return alphabet.codepoints[text]
+    return m.text_to_codepoints(text.replace(' ', ''))
+
+
+def shift_indices(indices, shifts, alphabet_size):
+    """
+    Shifts an array of alphabet positions by a key, wrapping around the alphabet.
+
+    The shifts are added with a single broadcast operation: the text is viewed as rows
+    as long as the key, so the key is never repeated to the length of the text.
+
+    Parameters:
+    indices (np.ndarray): A uint8 array with the alphabet position of each character. It is modified in place.
+    shifts (np.ndarray): A uint8 array with the shift for each key position, between 0 and alphabet_size - 1.
+    alphabet_size (int): The number of letters in the alphabet.
+
+    Returns:
+    np.ndarray: The shifted positions (the same array as indices, unless it had to be widened).
+    """
+    if not len(indices):
+        return indices
 
-    # Reorder the chunks according to the derived column order
-    chunked_text = [chunked_text[i] for i in indexes]
+    # The sum of two positions only fits in a uint8 for alphabets of up to 128 letters
+    if alphabet_size > 128:
+        indices = indices.astype(np.uint16)
 
-    # Use the utility function to transpose columns back into rows
-    deciphered_array = m.lists_to_columns(chunked_text)
+    full = len(indices) - len(indices) % len(shifts)
 
-    # Concatenate the transposed rows to form the final deciphered text
-    deciphered_text = [' '.join(row) for row in deciphered_array]
+    # Add the key to every complete row of the text, then to the remaining characters
+    indices[:full].reshape(-1, len(shifts))[...] += shifts
+    indices[full:] += shifts[:len(indices) - full]
 
-    return ' '.join(deciphered_text)
+    # Both operands are below alphabet_size, so a single modulo brings the sum back into range
+    indices %= alphabet_size
+    return indices
 
 
-def caesar_cipher(text: str, key: int) -> str:
+def key_shifts(method: str, key, alphabet: a.Alphabet = a.SPANISH, decrypt: bool = False):
+    """
+    Computes the shift applied at each key position by a substitution cipher.
+
+    Parameters:
+    method (str): The substitution cipher, either 'caesar' or 'vigenere'.
+    key (int or str): The Caesar shift or the Vigenère key.
+    alphabet (Alphabet): The alphabet the key is written in. Defaults to the Spanish alphabet.
+    decrypt (bool): If True, returns the shifts that undo the encryption.
+
+    Returns:
+    np.ndarray: A uint8 array with one shift per key position, between 0 and len(alphabet) - 1.
+
+    Raises:
+    ValueError: If the method is unknown, the Vigenère key is empty or contains characters outside the alphabet.
+    TypeError: If the Caesar key is not an integer.
+    """
+    alphabet_size = len(alphabet)
+
+    if method == 'caesar':
+        shifts = np.array([operator.index(key) % alphabet_size], dtype=np.uint8)
+    elif method == 'vigenere':
+        if not key:
+            raise ValueError("The key must not be empty.")
+        shifts = alphabet.encode(key)
+    else:
+        raise ValueError(f"Unsupported substitution cipher: {method!r}.")
+
+    # Shifting forward by the complement of each shift is the same as shifting it in reverse.
+    if decrypt:
+        shifts = (alphabet_size - shifts) % alphabet_size
+    return shifts
+
+
+@i.instrument(data='text')
+def caesar_cipher(text: str, key: int, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Encrypts the given text using a Caesar cipher with the provided key.
 
     Parameters:
-    text (str): The text to be encrypted.
+    text (str or np.ndarray): The text to be encrypted, or its alphabet positions.
     key (int): The number of positions to shift each character.
+    alphabet (Alphabet): The alphabet the text is written in. Defaults to the Spanish alphabet.
 
     Returns:
     str: The encrypted (ciphered) message.
     """
-    # Retrieve the Spanish alphabet, assuming this function provides the uppercase alphabet including 'Ñ'.
-    spanish_alphabet = m.create_spanish_alphabet()
+    alphabet_size = len(alphabet)
 
     try:
-        # Shift each character in the text by the key.
-        ciphered_text = [(spanish_alphabet.index((char)) + key) % len(spanish_alphabet)
-                         for char in text]
+        # Map the text to alphabet positions with a lookup table.
+        indices = encode_text(text, alphabet)
 
-        # Convert the shifted indices back to characters.
-        ciphered_text = [spanish_alphabet[index] for index in ciphered_text]
+        # Shift every position by the key at once.
+        shift = np.array([operator.index(key) % alphabet_size], dtype=np.uint8)
+        ciphered_text = shift_indices(indices, shift, alphabet_size)
     except Exception as exp:
         print(exp)
         return e.InvalidKeyError()
 
-    # Join and return the encrypted message as a string.
-    return ''.join(ciphered_text)
+    # Convert the shifted indices back to characters.
+    return alphabet.decode(ciphered_text)
 
 
-def caesar_decipher(text: str, key: int) -> str:
+@i.instrument(data='text')
+def caesar_decipher(text: str, key: int, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Decrypts the given text that was encrypted using a Caesar cipher with the provided key.
 
     Parameters:
-    text (str): The text to be decrypted.
+    text (str or np.ndarray): The text to be decrypted, or its alphabet positions.
     key (int): The number of positions used during encryption.
+    alphabet (Alphabet): The alphabet the text is written in. Defaults to the Spanish alphabet.
 
     Returns:
     str: The decrypted (deciphered) message.
     """
-    # Retrieve the Spanish alphabet, assuming this function provides the uppercase alphabet including 'Ñ'.
-    spanish_alphabet = m.create_spanish_alphabet()
+    alphabet_size = len(alphabet)
 
     try:
-        # Shift each character in the text by the key in the reverse direction.
-        deciphered_text = [(spanish_alphabet.index((char)) - key) % len(spanish_alphabet)
-                           for char in text]
+        # Map the text to alphabet positions with a lookup table.
+        indices = encode_text(text, alphabet)
 
-    # Convert the shifted indices back to characters.
-        deciphered_text = [spanish_alphabet[index]
-                           for index in deciphered_text]
+        # Shift every position by the key in the reverse direction.
+        shift = np.array([-operator.index(key) % alphabet_size], dtype=np.uint8)
+        deciphered_text = shift_indices(indices, shift, alphabet_size)
     except Exception as exp:
         print(exp)
         return e.InvalidKeyError()
 
-    # Join and return the decrypted message as a string.
-    return ''.join(deciphered_text)
+    # Convert the shifted indices back to characters.
+    return alphabet.decode(deciphered_text)
 
 
-def vigenere_cipher(text: str, key: str) -> str:
+@i.instrument(data='text')
+def vigenere_cipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Encrypts the given text using the Vigenère cipher with the provided key. 
-    It works with the Spanish alphabet, including 'Ñ'.
+    By default it works with the Spanish alphabet, including 'Ñ'.
 
     Parameters:
-    text (str): The plain text to be encrypted.
+    text (str or np.ndarray): The plain text to be encrypted, or its alphabet positions.
     key (str): The key used for encryption, repeated as necessary to match the length of the text.
+    alphabet (Alphabet): The alphabet the text and key are written in. Defaults to the Spanish alphabet.
 
     Returns:
     str: The encrypted (ciphered) message.
     """
-    # Retrieve the Spanish alphabet, assuming this function provides the uppercase alphabet including 'Ñ'.
-    spanish_alphabet = m.create_spanish_alphabet()
-
-    # Adjust the key to match the length of the text by repeating it.
-    key = m.fill_text(key, len(text))
+    # Map the text and the key to alphabet positions with a lookup table.
+    indices = encode_text(text, alphabet)
+    shifts = encode_text(key[:len(text)], alphabet)
 
     # Encrypt the text:
-    # For each character in the text, shift it by the position of the corresponding key character in the alphabet.
-    ciphered_text = [(spanish_alphabet.index((text[index])) + (spanish_alphabet.index((key[index]))))
-                     % len(spanish_alphabet) for index in range(len(text))]
+    # Each character is shifted by the position of the corresponding key character in the alphabet.
+    ciphered_text = shift_indices(indices, shifts, len(alphabet))
 
     # Convert the shifted indices back to characters.
-    ciphered_text = [spanish_alphabet[index] for index in ciphered_text]
-
-    # Join the list of characters to form the final encrypted message.
-    return ''.join(ciphered_text)
+    return alphabet.decode(ciphered_text)
 
 
-def vigenere_decipher(text: str, key: str) -> str:
+@i.instrument(data='text')
+def vigenere_decipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
     """
     Decrypts the given text that was encrypted using the Vigenère cipher with the provided key.
-    It works with the Spanish alphabet, including 'Ñ'.
+    By default it works with the Spanish alphabet, including 'Ñ'.
 
     Parameters:
-    text (str): The encrypted (ciphered) text to be decrypted.
+    text (str or np.ndarray): The encrypted (ciphered) text to be decrypted, or its alphabet positions.
     key (str): The key used during encryption, repeated as necessary to match the length of the text.
+    alphabet (Alphabet): The alphabet the text and key are written in. Defaults to the Spanish alphabet.
 
     Returns:
     str: The decrypted (deciphered) message.
     """
-    # Retrieve the Spanish alphabet, assuming this function provides the uppercase alphabet including 'Ñ'.
-    spanish_alphabet = m.create_spanish_alphabet()
+    alphabet_size = len(alphabet)
 
-    # Adjust the key to match the length of the text by repeating it.
-    key = m.fill_text(key, len(text))
+    # Map the text and the key to alphabet positions with a lookup table.
+    indices = encode_text(text, alphabet)
+    shifts = encode_text(key[:len(text)], alphabet)
 
     # Decrypt the text:
-    # For each character in the text, shift it by the position of the corresponding key character in reverse.
-    deciphered_text = [(spanish_alphabet.index((text[index])) - (spanish_alphabet.index((key[index]))))
-                       % len(spanish_alphabet) for index in range(len(text))]
+    # Shifting forward by the complement of each key character is the same as shifting it in reverse.
+    shifts = (alphabet_size - shifts) % alphabet_size
+    deciphered_text = shift_indices(indices, shifts, alphabet_size)
 
     # Convert the shifted indices back to characters.
-    deciphered_text = [spanish_alphabet[index] for index in deciphered_text]
+    return alphabet.decode(deciphered_text)
+
 
-    # Join the list of characters to form the final decrypted message.
-    return ''.join(deciphered_text)
+def hill_key_matrix(key: str, alphabet: a.Alphabet = a.SPANISH):
+    """
+    Builds the key matrix of the Hill cipher: the alphabet positions of the key letters, read row by row.
+
+    Parameters:
+    key (str): A key of k * k letters (4, 9, 16...), for blocks of k letters.
+    alphabet (Alphabet): The alphabet the key is written in. Defaults to the Spanish alphabet.
+
+    Returns:
+    np.ndarray: A (k, k) int64 matrix.
+
+    Raises:
+    ValueError: If the key is empty, its length is not a perfect square or it contains characters outside the alphabet.
+    """
+    if not key:
+        raise ValueError("The key must not be empty.")
+    size = math.isqrt(len(key))
+    if size * size != len(key):
+        raise ValueError("The Hill key length must be a perfect square (4, 9, 16...).")
+    return alphabet.encode(key).astype(np.int64).reshape(size, size)
+
+
+def modular_matrix_inverse(matrix, modulus: int):
+    """
+    Computes the inverse of an integer matrix modulo a number, which need not be prime (e.g. 27).
+
+    The inverse is the modular inverse of the determinant times the adjugate matrix, with every
+    determinant computed exactly over the integers.
+
+    Parameters:
+    matrix (np.ndarray): A square integer matrix.
+    modulus (int): The modulus, e.g. the number of letters in the alphabet.
+
+    Returns:
+    np.ndarray: The inverse matrix, with entries between 0 and modulus - 1.
+
+    Raises:
+    ValueError: If the determinant shares a factor with the modulus, so the matrix has no inverse.
+    """
+    size = len(matrix)
+    determinant = m.integer_determinant(matrix)
+    if math.gcd(determinant, modulus) != 1:
+        raise ValueError(f"The key matrix is not invertible modulo {modulus} "
+                         f"(its determinant is {determinant % modulus}).")
+
+    # The adjugate is the transposed matrix of cofactors
+    cofactors = [[(-1) ** (row + column)
+                  * m.integer_determinant(np.delete(np.delete(matrix, row, axis=0), column, axis=1)) % modulus
+                  for column in range(size)] for row in range(size)]
+    adjugate = np.array(cofactors, dtype=np.int64).T
+    return pow(determinant, -1, modulus) * adjugate % modulus
+
+
+def hill_transform(indices, matrix, alphabet_size: int):
+    """
+    Multiplies every block of the text by the key matrix, wrapping around the alphabet.
+
+    The text is viewed as an (n / k, k) block matrix, so all the blocks are transformed by a single
+    matrix product followed by a single modulo.
+
+    Parameters:
+    indices (np.ndarray): The alphabet positions of the text; its length must be a multiple of k.
+    matrix (np.ndarray): The (k, k) key matrix, or its modular inverse to decrypt.
+    alphabet_size (int): The number of letters in the alphabet.
+
+    Returns:
+    np.ndarray: A uint8 array (uint16 for alphabets of more than 256 letters) with the transformed positions.
+    """
+    size = len(matrix)
+    # Every product of the block matrix is a sum of k products of two positions: uint16 holds it for usual keys
+    largest = (alphabet_size - 1) ** 2 * size
+    dtype = np.uint16 if largest <= np.iinfo(np.uint16).max else np.int64
+
+    blocks = indices.reshape(-1, size).astype(dtype)
+    result = blocks @ matrix.T.astype(dtype)
+    result %= alphabet_size
+    return result.ravel().astype(np.uint8 if alphabet_size <= 256 else np.uint16)
+
+
+def _hill(text, matrix, alphabet: a.Alphabet, pad: bool) -> str:
+    """
+    Applies the Hill cipher with the given matrix to a whole text.
+
+    When pad is True, a text whose length is not a multiple of the block size is completed by wrapping
+    to its beginning, as transposition fills its last row; otherwise such a text raises ValueError.
+    """
+    indices = encode_text(text, alphabet)
+    size = len(matrix)
+    if len(indices) % size:
+        if not pad:
+            raise ValueError("The text length must be a multiple of the Hill block size.")
+        indices = m.fill_text(indices, -(-len(indices) // size) * size)
+    return alphabet.decode(hill_transform(indices, matrix, len(alphabet)))
+
+
+@i.instrument(data='text')
+def hill_cipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
+    """
+    Encrypts the given text using the Hill cipher: every block of k letters is multiplied by the
+    k x k key matrix, modulo the number of letters of the alphabet (27 for Spanish).
+
+    The key matrix and its inverse are computed once per key and cached (see Cipher.compile).
+
+    Parameters:
+    text (str or np.ndarray): The text to be encrypted, or its alphabet positions. If its length is not
+    a multiple of k, it is completed by wrapping to its beginning.
+    key (str): A key of k * k letters, read row by row, whose matrix is invertible modulo the alphabet size.
+    alphabet (Alphabet): The alphabet the text and key are written in. Defaults to the Spanish alphabet.
+
+    Returns:
+    str: The encrypted (ciphered) message.
+
+    Raises:
+    ValueError: If the key is invalid or not invertible, or the text contains characters outside the alphabet.
+    """
+    return _hill(text, Cipher.compile('hill', key, alphabet).matrix, alphabet, pad=True)
+
+
+@i.instrument(data='text')
+def hill_decipher(text: str, key: str, alphabet: a.Alphabet = a.SPANISH) -> str:
+    """
+    Decrypts the given text that was encrypted using the Hill cipher with the provided key, multiplying
+    every block by the inverse of the key matrix modulo the number of letters of the alphabet.
+
+    Parameters:
+    text (str or np.ndarray): The encrypted (ciphered) text, or its alphabet positions.
+    key (str): The key used during encryption.
+    alphabet (Alphabet): The alphabet the text and key are written in. Defaults to the Spanish alphabet.
+
+    Returns:
+    str: The decrypted (deciphered) message, including the letters that completed the last block.
+
+    Raises:
+    ValueError: If the key is invalid or not invertible, the text length is not a multiple of k,
+    or the text contains characters outside the alphabet.
+    """
+    return _hill(text, Cipher.compile('hill', key, alphabet).inverse_matrix, alphabet, pad=False)
+
+
+def _hill_batch(texts, keys, alphabet, decrypt):
+    """
+    Applies the Hill cipher to many texts, each with its own key.
+
+    The texts that share a key are laid out one after the other as a single block matrix, so every
+    distinct key costs one matrix product however many texts use it.
+
+    Parameters:
+    texts (sequence of str): The texts to be processed.
+    keys (sequence of str): One Hill key per text.
+    alphabet (Alphabet): The alphabet the texts and keys are written in.
+    decrypt (bool): If True, the texts are decrypted instead of encrypted.
+
+    Returns:
+    list of str: The processed texts, in the same order.
+    """
+    if len(texts) != len(keys):
+        raise ValueError("There must be exactly one key per text.")
+
+    groups = {}
+    for position, key in enumerate(keys):
+        groups.setdefault(key, []).append(position)
+
+    results = [None] * len(texts)
+    for key, positions in groups.items():
+        cipher = Cipher.compile('hill', key, alphabet)
+        matrix = cipher.inverse_matrix if decrypt else cipher.matrix
+        size = len(matrix)
+
+        # Complete (or reject) every text to whole blocks, then transform them all at once
+        parts = []
+        for position in positions:
+            indices = alphabet.encode(texts[position])
+            if len(indices) % size:
+                if decrypt:
+                    raise ValueError("The text length must be a multiple of the Hill block size.")
+                indices = m.fill_text(indices, -(-len(indices) // size) * size)
+            parts.append(indices)
+
+        lengths = [len(part) for part in parts]
+        output = alphabet.decode(hill_transform(np.concatenate(parts), matrix, len(alphabet)))
+        start = 0
+        for position, length in zip(positions, lengths):
+            results[position] = output[start:start + length]
+            start += length
+    return results
+
+
+def _substitute_batch(texts, keys, method, alphabet, decrypt):
+    """
+    Applies a substitution cipher to many texts, each with its own key, in one vectorized pass.
+
+    The texts are packed into a padded 2D matrix of alphabet positions, with one row per text,
+    and the key of every row is broadcast over it before a single modular add.
+
+    Parameters:
+    texts (sequence of str): The texts to be processed.
+    keys (sequence of int or str): One Caesar shift or Vigenère key per text.
+    method (str): The substitution cipher, either 'caesar' or 'vigenere'.
+    alphabet (Alphabet): The alphabet the texts and keys are written in.
+    decrypt (bool): If True, the texts are decrypted instead of encrypted.
+
+    Returns:
+    list of str: The processed texts, in the same order.
+    """
+    if len(texts) != len(keys):
+        raise ValueError("There must be exactly one key per text.")
+    if not len(texts):
+        return []
+
+    alphabet_size = len(alphabet)
+    dtype = np.uint8 if alphabet_size <= 128 else np.uint16
+
+    # Pack every text into one row of a padded matrix, in a single encoding pass
+    lengths = np.fromiter(map(len, texts), dtype=np.intp, count=len(texts))
+    mask = np.arange(lengths.max()) < lengths[:, np.newaxis]
+    indices = np.zeros(mask.shape, dtype=dtype)
+    indices[mask] = alphabet.encode(''.join(texts))
+
+    if method == 'caesar':
+        # One shift per row, broadcast over its columns
+        shifts = np.fromiter((operator.index(key) for key in keys), dtype=np.int64, count=len(keys))
+        shifts = (shifts % alphabet_size).astype(dtype)[:, np.newaxis]
+    elif method == 'vigenere':
+        # Pack the keys the same way, then repeat each one along its row
+        key_lengths = np.fromiter(map(len, keys), dtype=np.intp, count=len(keys))
+        if not key_lengths.all():
+            raise ValueError("The key must not be empty.")
+        key_mask = np.arange(key_lengths.max()) < key_lengths[:, np.newaxis]
+        key_indices = np.zeros(key_mask.shape, dtype=dtype)
+        key_indices[key_mask] = alphabet.encode(''.join(keys))
+
+        columns = np.arange(mask.shape[1]) % key_lengths[:, np.newaxis]
+        shifts = np.take_along_axis(key_indices, columns, axis=1)
+    else:
+        raise ValueError(f"Unsupported substitution cipher: {method!r}.")
+
+    # Shifting forward by the complement of each shift is the same as shifting it in reverse.
+    if decrypt:
+        shifts = (alphabet_size - shifts) % alphabet_size
+
+    indices += shifts
+    indices %= alphabet_size
+
+    # Decode every row at once and split the result back into the original texts
+    result = alphabet.decode(indices[mask])
+    ends = np.cumsum(lengths).tolist()
+    return [result[end - length:end] for end, length in zip(ends, lengths.tolist())]
+
+
+@i.instrument(data='texts')
+def encrypt_batch(texts, keys, method: str = 'vigenere', alphabet: a.Alphabet = a.SPANISH) -> list:
+    """
+    Encrypts many texts, each with its own key, in a single vectorized call.
+
+    Parameters:
+    texts (sequence of str): The texts to be encrypted.
+    keys (sequence of int or str): One Caesar shift, Vigenère key or Hill key per text.
+    method (str): The cipher, either 'caesar', 'vigenere' or 'hill'. Defaults to 'vigenere'.
+    alphabet (Alphabet): The alphabet the texts and keys are written in. Defaults to the Spanish alphabet.
+
+    Returns:
+    list of str: The encrypted texts, in the same order.
+    """
+    if method == 'hill':
+        return _hill_batch(texts, keys, alphabet, decrypt=False)
+    return _substitute_batch(texts, keys, method, alphabet, decrypt=False)
+
+
+@i.instrument(data='texts')
+def decrypt_batch(texts, keys, method: str = 'vigenere', alphabet: a.Alphabet = a.SPANISH) -> list:
+    """
+    Decrypts many texts, each with its own key, in a single vectorized call.
+
+    Parameters:
+    texts (sequence of str): The texts to be decrypted.
+    keys (sequence of int or str): One Caesar shift, Vigenère key or Hill key per text.
+    method (str): The cipher, either 'caesar', 'vigenere' or 'hill'. Defaults to 'vigenere'.
+    alphabet (Alphabet): The alphabet the texts and keys are written in. Defaults to the Spanish alphabet.
+
+    Returns:
+    list of str: The decrypted texts, in the same order.
+    """
+    if method == 'hill':
+        return _hill_batch(texts, keys, alphabet, decrypt=True)
+    return _substitute_batch(texts, keys, method, alphabet, decrypt=True)
+
+
+# Maximum number of compiled ciphers kept by Cipher.compile
+COMPILED_CACHE_SIZE = 1024
+
+# Cipher kinds accepted by Cipher
+CIPHER_KINDS = ('transposition', 'caesar', 'vigenere', 'hill')
+
+
+class Cipher:
+    """
+    A cipher bound to a key, with its key schedule computed once.
+
+    The schedule is the shift vector for Caesar and Vigenère, the column permutation and its
+    inverse for transposition, and the key matrix and its modular inverse for Hill, so encrypt()
+    and decrypt() only validate and transform the text.
+    Use Cipher.compile() to share instances for keys that are used repeatedly.
+    """
+
+    def __init__(self, kind: str, key, alphabet: a.Alphabet = a.SPANISH):
+        """
+        Computes the key schedule.
+
+        Parameters:
+            kind (str): The cipher: 'transposition', 'caesar', 'vigenere' or 'hill'.
+            key (int or str): The key of the cipher.
+            alphabet (Alphabet): The alphabet of the substitution ciphers. Defaults to the Spanish alphabet.
+
+        Raises:
+            ValueError: If the kind is unknown or the key is invalid.
+        """
+        if kind not in CIPHER_KINDS:
+            raise ValueError(f"Unsupported cipher: {kind!r}; choose one of {', '.join(CIPHER_KINDS)}.")
+
+        self.kind = kind
+        self.key = key
+        self.alphabet = alphabet
+
+        if kind == 'transposition':
+            self.order = transposition_order(key)
+            self.inverse_order = np.argsort(self.order)
+        elif kind == 'hill':
+            self.matrix = hill_key_matrix(key, alphabet)
+            self.inverse_matrix = modular_matrix_inverse(self.matrix, len(alphabet))
+        else:
+            self.encrypt_shifts = key_shifts(kind, key, alphabet)
+            self.decrypt_shifts = key_shifts(kind, key, alphabet, decrypt=True)
+
+    @classmethod
+    def compile(cls, kind: str, key, alphabet: a.Alphabet = a.SPANISH) -> 'Cipher':
+        """
+        Returns the cipher for the given kind and key, reusing a cached instance when possible.
+
+        The most recently used COMPILED_CACHE_SIZE ciphers are kept.
+
+        Parameters:
+            kind (str): The cipher: 'transposition', 'caesar', 'vigenere' or 'hill'.
+            key (int or str): The key of the cipher.
+            alphabet (Alphabet): The alphabet of the substitution ciphers. Defaults to the Spanish alphabet.
+
+        Returns:
+            Cipher: The compiled cipher.
+        """
+        return _compile(cls, kind, key, alphabet)
+
+    def __repr__(self):
+        return f"Cipher({self.kind!r}, {self.key!r})"
+
+    def _substitute(self, text: str, shifts) -> str:
+        """
+        Shifts every character of the text by the given key schedule.
+        """
+        indices = shift_indices(encode_text(text, self.alphabet), shifts, len(self.alphabet))
+        return self.alphabet.decode(indices)
+
+    @i.instrument(data='text')
+    def encrypt(self, text: str) -> str:
+        """
+        Encrypts a text with the precomputed key schedule.
+
+        Parameters:
+            text (str or np.ndarray): The text to be encrypted, or its alphabet positions.
+
+        Returns:
+            str: The encrypted text, identical to the matching *_cipher function.
+
+        Raises:
+            ValueError: If a substitution or Hill cipher receives characters outside the alphabet.
+        """
+        if self.kind == 'transposition':
+            return _transpose(text, self.order, self.alphabet)
+        if self.kind == 'hill':
+            return _hill(text, self.matrix, self.alphabet, pad=True)
+        return self._substitute(text, self.encrypt_shifts)
+
+    @i.instrument(data='text')
+    def decrypt(self, text: str) -> str:
+        """
+        Decrypts a text with the precomputed key schedule.
+
+        Parameters:
+            text (str or np.ndarray): The text to be decrypted, or its alphabet positions.
+
+        Returns:
+            str: The decrypted text, identical to the matching *_decipher function.
+
+        Raises:
+            ValueError: If a substitution or Hill cipher receives characters outside the alphabet,
+            or a Hill ciphertext is not made of whole blocks.
+        """
+        if self.kind == 'transposition':
+            return _untranspose(text, self.order, self.alphabet, self.inverse_order)
+        if self.kind == 'hill':
+            return _hill(text, self.inverse_matrix, self.alphabet, pad=False)
+        return self._substitute(text, self.decrypt_shifts)
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def _compile(cls, kind, key, alphabet):
+    """
+    Builds a Cipher; the cache keeps the most recently used (kind, key, alphabet) combinations.
+    """
+    return cls(kind, key, alphabet)
@@ -0,0 +1,674 @@
+import argparse
+import base64
+import bisect
+import hashlib
+import ipaddress
+import json
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from methods import cryptanalysis as ca
+from utils import alphabet as a
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Number of ciphertext letters every candidate key is scored on
+DEFAULT_PREFIX_LENGTH = 48
+
+# Number of trailing key letters enumerated inside a shard: a shard holds 27 ** 4 = 531441 keys
+ENUMERATED_LETTERS = 4
+
+# Survivors of the frequency prefilter scored by bigrams at once, to bound temporary arrays
+SCORE_CHUNK = 1 << 16
+
+# Number of standard deviations below the expected frequency score of a plaintext at which
+# candidates are pruned; the right key is pruned with a probability of about 0.1 %
+DEFAULT_PRUNE_Z = 3.0
+
+# Number of best candidates kept
+DEFAULT_TOP = 10
+
+# Seconds between two checkpoints
+CHECKPOINT_INTERVAL = 10.0
+
+# Seconds between two progress lines of the command line
+REPORT_INTERVAL = 0.5
+
+# Environment variable holding the authentication key of the coordinator and its socket workers
+AUTHKEY_VARIABLE = 'KEY_SEARCH_AUTHKEY'
+
+# Repository root, used as the working directory of spawned socket workers
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class KeySearch:
+    """
+    Exhaustive search of a Vigenère key of up to max_length letters, split into shards.
+
+    The keyspace of every key length L is cut into 27 ** (L - 4) shards: the leading letters of the key
+    are fixed by the shard and its last four letters are enumerated. Every candidate is scored on a
+    prefix of the ciphertext, deciphered with the same modular arithmetic as vigenere_decipher.
+
+    Candidates are pruned in two stages before any text is deciphered:
+        - The letter frequency score (sum of the log-frequencies of the deciphered letters) splits into
+          one term per key column, so a (L, 27) table gives the score of every key letter at every
+          column. A whole shard is skipped when even its best keys stay below the pruning threshold,
+          and the scores of all the keys of a shard are built with outer sums of the table.
+        - The keys above the threshold are deciphered at once as a (keys, prefix) matrix and ranked
+          by the bigram log-probability of their plaintext.
+
+    Keys that repeat a shorter key (e.g. 'ABAB') are skipped, since the shorter key gives the same text.
+
+    Instances only hold arrays and numbers, so they are sent as they are to worker processes.
+    """
+
+    def __init__(self, ciphertext: str, max_length: int, min_length: int = 1,
+                 prefix_length: int = DEFAULT_PREFIX_LENGTH, prune_z: float = DEFAULT_PRUNE_Z,
+                 top: int = DEFAULT_TOP, alphabet: a.Alphabet = a.SPANISH,
+                 frequencies=ca.SPANISH_FREQUENCIES, bigrams=None):
+        """
+        Parameters:
+            ciphertext (str): The ciphertext. Characters outside the alphabet are ignored.
+            max_length (int): The longest key length searched.
+            min_length (int): The shortest key length searched.
+            prefix_length (int): The number of ciphertext letters every key is scored on.
+            prune_z (float): The pruning threshold, in standard deviations below the frequency score
+                expected from a plaintext, or None to score every key with bigrams (much slower).
+            top (int): The number of best candidates kept.
+            alphabet (Alphabet): The alphabet of the ciphertext. Defaults to the Spanish alphabet.
+            frequencies (sequence of float): The expected relative frequency of each letter. Defaults to Spanish.
+            bigrams (np.ndarray): The bigram log-probability table. Defaults to cryptanalysis.spanish_bigrams().
+
+        Raises:
+            ValueError: If the key lengths are invalid or the ciphertext has no letters.
+        """
+        if not 1 <= min_length <= max_length:
+            raise ValueError("The key lengths must satisfy 1 <= min_length <= max_length.")
+
+        indices = alphabet.to_indices(ciphertext)
+        indices = indices[indices != a.INVALID_INDEX][:prefix_length]
+        if not len(indices):
+            raise ValueError("The ciphertext has no letters of the alphabet.")
+
+        self.letters = alphabet.letters
+        self.alphabet_size = len(alphabet)
+        self.prefix = indices.astype(np.uint8)
+        self.min_length = min_length
+        self.max_length = max_length
+        self.prune_z = prune_z
+        self.top = top
+
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.log_frequencies = np.log(np.maximum(frequencies, 1e-12))
+        self.bigrams = np.asarray(ca.spanish_bigrams() if bigrams is None else bigrams, dtype=np.float64)
+
+        # Mean and spread of the frequency score of a plaintext letter, for the pruning threshold
+        self.letter_mean = float((frequencies * self.log_frequencies).sum())
+        self.letter_std = float(np.sqrt((frequencies * self.log_frequencies ** 2).sum() - self.letter_mean ** 2))
+
+        # First shard of every key length, and the total number of shards
+        counts = [self.alphabet_size ** (length - self._enumerated(length))
+                  for length in range(min_length, max_length + 1)]
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+
+    def __len__(self):
+        """The number of shards."""
+        return self.offsets[-1]
+
+    @property
+    def threshold(self) -> float:
+        """The frequency score under which a candidate is pruned."""
+        if self.prune_z is None:
+            return -np.inf
+        length = len(self.prefix)
+        return length * self.letter_mean - self.prune_z * self.letter_std * np.sqrt(length)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the search, so a checkpoint is only resumed by the same search."""
+        description = json.dumps([self.letters, self.prefix.tolist(), self.min_length, self.max_length,
+                                  self.prune_z, ENUMERATED_LETTERS,
+                                  hashlib.blake2b(self.bigrams.tobytes(), digest_size=8).hexdigest(),
+                                  hashlib.blake2b(self.log_frequencies.tobytes(), digest_size=8).hexdigest()])
+        return hashlib.blake2b(description.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _enumerated(length: int) -> int:
+        return min(length, ENUMERATED_LETTERS)
+
+    def shard(self, shard_id: int) -> tuple:
+        """
+        Locates a shard in the keyspace.
+
+        Parameters:
+            shard_id (int): The shard number, between 0 and len(self) - 1.
+
+        Returns:
+            tuple: The key length and the alphabet positions of the leading key letters fixed by the shard.
+        """
+        position = bisect.bisect_right(self.offsets, shard_id) - 1
+        length = self.min_length + position
+        fixed = length - self._enumerated(length)
+        digits = np.unravel_index(shard_id - self.offsets[position], (self.alphabet_size,) * fixed)
+        return length, np.array(digits, dtype=np.uint8).reshape(fixed)
+
+    def column_scores(self, length: int):
+        """
+        Computes the frequency score contributed by every key letter at every key column.
+
+        Parameters:
+            length (int): The key length.
+
+        Returns:
+            np.ndarray: A (length, alphabet size) array; element [j, k] is the sum of the log-frequencies
+            of the prefix letters of column j deciphered with key letter k.
+        """
+        size = self.alphabet_size
+        # Deciphering shifts forward by the complement of the key letter, as vigenere_decipher does
+        shifts = (size - np.arange(size)) % size
+        plain = (self.prefix[:, np.newaxis] + shifts) % size
+        scores = self.log_frequencies[plain]
+
+        columns = np.zeros((length, size))
+        np.add.at(columns, np.arange(len(self.prefix)) % length, scores)
+        return columns
+
+    def search_shard(self, shard_id: int) -> tuple:
+        """
+        Scores every key of a shard.
+
+        Parameters:
+            shard_id (int): The shard number.
+
+        Returns:
+            tuple: The best candidates of the shard (a list of cryptanalysis.Candidate, best first),
+            the number of keys in the shard and the number of keys that passed the frequency prefilter.
+        """
+        length, fixed = self.shard(shard_id)
+        size = self.alphabet_size
+        enumerated = self._enumerated(length)
+        columns = self.column_scores(length)
+        threshold = self.threshold
+
+        base = columns[np.arange(len(fixed)), fixed].sum()
+        keys_in_shard = size ** enumerated
+
+        # Even the best keys of the shard stay under the threshold: no key needs to be scored
+        if base + columns[len(fixed):].max(axis=1).sum() < threshold:
+            return [], keys_in_shard, 0
+
+        # Frequency score of every enumerated suffix, by outer sums of the column tables
+        scores = columns[len(fixed)]
+        for column in range(len(fixed) + 1, length):
+            scores = np.add.outer(scores, columns[column]).ravel()
+        survivors = np.flatnonzero(scores >= threshold - base)
+
+        best = []
+        for start in range(0, len(survivors), SCORE_CHUNK):
+            chunk = survivors[start:start + SCORE_CHUNK]
+            keys = np.empty((len(chunk), length), dtype=np.uint8)
+            keys[:, :len(fixed)] = fixed
+            keys[:, len(fixed):] = np.stack(np.unravel_index(chunk, (size,) * enumerated), axis=1)
+
+            keys = keys[~_periodic(keys)]
+            if not len(keys):
+                continue
+
+            # Decipher the prefix with every key at once, with the arithmetic of vigenere_decipher
+            shifts = (size - keys) % size
+            plain = (self.prefix + shifts[:, np.arange(len(self.prefix)) % length]) % size
+            bigram_scores = self.bigrams[plain[:, :-1], plain[:, 1:]].sum(axis=1)
+
+            count = min(self.top, len(keys))
+            selected = np.argpartition(-bigram_scores, count - 1)[:count]
+            best.extend(ca.Candidate(self._key(keys[row]), float(bigram_scores[row])) for row in selected)
+
+        return _best(best, self.top), keys_in_shard, len(survivors)
+
+    def _key(self, digits) -> str:
+        return ''.join(self.letters[digit] for digit in digits.tolist())
+
+    def decipher_prefix(self, key: str) -> str:
+        """
+        Deciphers the scored prefix of the ciphertext with a candidate key.
+
+        Parameters:
+            key (str): The candidate key.
+
+        Returns:
+            str: The plaintext of the prefix.
+        """
+        shifts = np.array([(self.alphabet_size - self.letters.index(letter)) % self.alphabet_size
+                           for letter in key], dtype=np.uint8)
+        plain = (self.prefix + np.resize(shifts, len(self.prefix))) % self.alphabet_size
+        return ''.join(self.letters[index] for index in plain.tolist())
+
+
+def _periodic(keys):
+    """
+    Marks the keys that repeat a shorter key, e.g. 'ABAB', whose candidates are already covered.
+    """
+    length = keys.shape[1]
+    periodic = np.zeros(len(keys), dtype=bool)
+    for period in range(1, length):
+        if length % period == 0:
+            periodic |= (keys == np.tile(keys[:, :period], length // period)).all(axis=1)
+    return periodic
+
+
+def _best(candidates, top: int) -> list:
+    """
+    Keeps the best candidates, highest score first, without repeated keys.
+    """
+    unique = {}
+    for candidate in candidates:
+        if candidate.key not in unique or candidate.score > unique[candidate.key].score:
+            unique[candidate.key] = candidate
+    return sorted(unique.values(), key=lambda candidate: (-candidate.score, candidate.key))[:top]
+
+
+class Progress:
+    """
+    The shards already searched and the best candidates so far, saved to a checkpoint file so that
+    a killed search resumes where it stopped.
+
+    The checkpoint is a JSON file holding the fingerprint of the search, a bitmap of the finished shards
+    and the best candidates. It is written to a temporary file and renamed, so a crash while saving
+    leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, search: KeySearch, path: str = None, interval: float = CHECKPOINT_INTERVAL):
+        """
+        Loads the checkpoint, if the file exists.
+
+        Parameters:
+            search (KeySearch): The search.
+            path (str): The checkpoint file, or None to keep the progress in memory only.
+            interval (float): The minimum number of seconds between two checkpoints.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different search.
+        """
+        self.search = search
+        self.path = path
+        self.interval = interval
+        self.done = np.zeros(len(search), dtype=bool)
+        self.best = []
+        self.keys = 0
+        self.survivors = 0
+        self.saved = time.monotonic()
+        self.lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as checkpoint:
+                state = json.load(checkpoint)
+            if state['fingerprint'] != search.fingerprint:
+                raise ValueError(f"The checkpoint {path!r} belongs to a different search.")
+            bits = np.frombuffer(base64.b64decode(state['done']), dtype=np.uint8)
+            self.done = np.unpackbits(bits, count=len(search)).astype(bool)
+            self.best = [ca.Candidate(key, score) for key, score in state['best']]
+            self.keys = state['keys']
+            self.survivors = state['survivors']
+
+    @property
+    def finished(self) -> int:
+        """The number of shards already searched."""
+        return int(self.done.sum())
+
+    def pending(self) -> list:
+        """The shards still to be searched, in order."""
+        return np.flatnonzero(~self.done).tolist()
+
+    def record(self, shard_id: int, result: tuple):
+        """
+        Records the result of a shard, and saves a checkpoint if the last one is old enough.
+
+        Parameters:
+            shard_id (int): The shard number.
+            result (tuple): The value returned by KeySearch.search_shard.
+        """
+        candidates, keys, survivors = result
+        with self.lock:
+            if self.done[shard_id]:
+                return
+            self.done[shard_id] = True
+            self.best = _best(self.best + list(candidates), self.search.top)
+            self.keys += keys
+            self.survivors += survivors
+            if time.monotonic() - self.saved >= self.interval:
+                self._save()
+
+    def save(self):
+        """Saves a checkpoint now."""
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        self.saved = time.monotonic()
+        if self.path is None:
+            return
+        state = {
+            'fingerprint': self.search.fingerprint,
+            'done': base64.b64encode(np.packbits(self.done).tobytes()).decode('ascii'),
+            'best': [[candidate.key, candidate.score] for candidate in self.best],
+            'keys': self.keys,
+            'survivors': self.survivors,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as checkpoint:
+            json.dump(state, checkpoint)
+        os.replace(temporary, self.path)
+
+
+# Search held by every process of the worker pool
+_worker_search = None
+
+
+def _init_worker(search):
+    global _worker_search
+    _worker_search = search
+
+
+def _search_shard(shard_id):
+    return shard_id, _worker_search.search_shard(shard_id)
+
+
+def search_pool(search: KeySearch, progress: Progress, workers: int = None, on_progress=None) -> list:
+    """
+    Searches the pending shards with a pool of local worker processes.
+
+    The search is sent once to every worker when the pool starts, and only shard numbers and results
+    travel afterwards. At most two shards per worker are in flight, so a killed run loses little work.
+
+    Parameters:
+    search (KeySearch): The search.
+    progress (Progress): The shards already searched; it is updated and checkpointed.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    on_progress (callable): Called with the Progress after every shard.
+
+    Returns:
+    list of Candidate: The best candidates, best first.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = iter(progress.pending())
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(search,)) as pool:
+        futures = set()
+        while True:
+            while len(futures) < 2 * workers:
+                shard_id = next(pending, None)
+                if shard_id is None:
+                    break
+                futures.add(pool.submit(_search_shard, shard_id))
+            if not futures:
+                break
+
+            finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                progress.record(*future.result())
+                if on_progress is not None:
+                    on_progress(progress)
+
+    progress.save()
+    return progress.best
+
+
+def is_loopback(host: str) -> bool:
+    """
+    Returns whether a host name or address only accepts connections from the same machine.
+    """
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def search_socket(search: KeySearch, progress: Progress, address: tuple, authkey: bytes = None,
+                  spawn: int = 0, on_progress=None, ready=None) -> list:
+    """
+    Coordinates the search over a socket: workers connect, possibly from other nodes, receive the
+    search once, and then take one shard at a time until none is left.
+
+    A shard handed to a worker that disconnects before answering is handed to another one. If no
+    worker is connected to take it, the coordinator searches it itself.
+
+    The coordinator and its workers exchange pickled objects, so the authentication key is all that
+    keeps other clients from running code on either side. A listener reachable from other machines
+    requires an explicit key; on a loopback address a random key is generated when none is given,
+    and passed to the spawned workers through the environment.
+
+    Parameters:
+    search (KeySearch): The search.
+    progress (Progress): The shards already searched; it is updated and checkpointed.
+    address (tuple): The (host, port) to listen on; port 0 picks a free port.
+    authkey (bytes): The key the workers must know to connect, or None to generate one (loopback addresses only).
+    spawn (int): The number of local worker processes to start (see run_worker).
+    on_progress (callable): Called with the Progress after every shard.
+    ready (callable): Called with the listening address once workers can connect.
+
+    Returns:
+    list of Candidate: The best candidates, best first.
+
+    Raises:
+    ValueError: If no key is given for an address that is not a loopback address.
+    """
+    if not authkey:
+        if not is_loopback(address[0]):
+            raise ValueError(f"An authentication key is required to listen on {address[0]}; "
+                             f"pass --authkey or set {AUTHKEY_VARIABLE}.")
+        authkey = secrets.token_hex(16).encode('ascii')
+
+    pending = progress.pending()
+    pending.reverse()  # Popped from the end, in shard order
+    remaining = [len(pending)]
+    connected = [0]
+    requeued = [False]
+    condition = threading.Condition()
+
+    def finish(shard_id, result):
+        progress.record(shard_id, result)
+        if on_progress is not None:
+            on_progress(progress)
+        with condition:
+            remaining[0] -= 1
+            condition.notify_all()
+
+    def stranded():
+        # A shard came back from a worker that left, and no worker is connected to take it
+        return requeued[0] and pending and not connected[0]
+
+    def serve(connection):
+        shard_id = None
+        with condition:
+            connected[0] += 1
+        try:
+            connection.send(search)
+            while True:
+                with condition:
+                    shard_id = pending.pop() if pending else None
+                connection.send(shard_id)
+                if shard_id is None:
+                    return
+                finish(shard_id, connection.recv())
+                shard_id = None
+        except (EOFError, OSError):
+            # The worker left: its shard goes back to the queue
+            if shard_id is not None:
+                with condition:
+                    pending.append(shard_id)
+                    requeued[0] = True
+        finally:
+            connection.close()
+            with condition:
+                connected[0] -= 1
+                condition.notify_all()
+
+    listener = Listener(address, authkey=authkey)
+    processes = []
+    try:
+        if ready is not None:
+            ready(listener.address)
+        for _ in range(spawn if remaining[0] else 0):
+            processes.append(subprocess.Popen(
+                [sys.executable, '-m', 'methods.key_search', 'worker', f"{listener.address[0]}:{listener.address[1]}"],
+                cwd=ROOT, env=dict(os.environ, **{AUTHKEY_VARIABLE: authkey.decode('utf-8')})))
+
+        def accept():
+            while True:
+                try:
+                    connection = listener.accept()
+                except AuthenticationError:
+                    continue  # A client without the right key
+                except OSError:
+                    return  # The listener was closed
+                threading.Thread(target=serve, args=(connection,), daemon=True).start()
+
+        threading.Thread(target=accept, daemon=True).start()
+        while True:
+            with condition:
+                condition.wait_for(lambda: remaining[0] <= 0 or stranded())
+                if remaining[0] <= 0:
+                    break
+                shard_id = pending.pop()
+            finish(shard_id, search.search_shard(shard_id))
+    finally:
+        listener.close()
+        for process in processes:
+            process.wait()
+
+    progress.save()
+    return progress.best
+
+
+def run_worker(address: tuple, authkey: bytes) -> int:
+    """
+    Socket worker: connects to a coordinator and searches the shards it hands out until none is left.
+
+    Parameters:
+    address (tuple): The (host, port) of the coordinator.
+    authkey (bytes): The key shared with the coordinator.
+
+    Returns:
+    int: The number of shards searched.
+    """
+    with Client(address, authkey=authkey) as connection:
+        search = connection.recv()
+        count = 0
+        while (shard_id := connection.recv()) is not None:
+            connection.send(search.search_shard(shard_id))
+            count += 1
+    return count
+
+
+def _address(text: str) -> tuple:
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main(argv=None):
+    """
+    Command line entry point: searches the Vigenère key of a ciphertext, or runs a socket worker.
+
+    Parameters:
+    argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+    int: 0 if a candidate was found, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m methods.key_search',
+        description='Búsqueda exhaustiva de claves cortas de Vigenère, repartida en fragmentos y reanudable.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search_parser = commands.add_parser('search', help='Busca la clave de un texto cifrado.')
+    search_parser.add_argument('-i', '--input', help='Archivo con el texto cifrado (por defecto, la entrada estándar).')
+    search_parser.add_argument('--max-length', type=int, default=6, help='Longitud máxima de la clave.')
+    search_parser.add_argument('--min-length', type=int, default=1, help='Longitud mínima de la clave.')
+    search_parser.add_argument('--prefix-length', type=int, default=DEFAULT_PREFIX_LENGTH,
+                               help='Número de letras del texto cifrado con que se evalúa cada clave.')
+    search_parser.add_argument('--prune-z', type=float, default=DEFAULT_PRUNE_Z,
+                               help='Umbral de poda, en desviaciones típicas por debajo de la puntuación esperada.')
+    search_parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='Número de candidatas mostradas.')
+    search_parser.add_argument('--checkpoint', help='Archivo donde se guarda el progreso para reanudar la búsqueda.')
+    search_parser.add_argument('--workers', type=int, help='Número de procesos locales.')
+    search_parser.add_argument('--listen', help='Reparte los fragmentos por socket en HOST:PUERTO.')
+    search_parser.add_argument('--spawn', type=int, default=0,
+                               help='Con --listen, número de trabajadores locales que se inician.')
+    search_parser.add_argument('--authkey', default=os.environ.get(AUTHKEY_VARIABLE),
+                               help=f'Clave compartida con los trabajadores (por defecto, {AUTHKEY_VARIABLE}). '
+                                    'Obligatoria si --listen no es una dirección local.')
+
+    worker_parser = commands.add_parser('worker', help='Trabaja para un coordinador remoto.')
+    worker_parser.add_argument('address', help='HOST:PUERTO del coordinador.')
+    worker_parser.add_argument('--authkey', default=os.environ.get(AUTHKEY_VARIABLE),
+                               help=f'Clave compartida con el coordinador (por defecto, {AUTHKEY_VARIABLE}).')
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        if not args.authkey:
+            print(f"Error: falta la clave compartida; use --authkey o {AUTHKEY_VARIABLE}.", file=sys.stderr)
+            return 1
+        run_worker(_address(args.address), args.authkey.encode('utf-8'))
+        return 0
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as source:
+            ciphertext = source.read()
+    else:
+        ciphertext = sys.stdin.read()
+
+    try:
+        search = KeySearch(ciphertext.upper(), args.max_length, args.min_length, args.prefix_length,
+                           args.prune_z, args.top)
+        progress = Progress(search, args.checkpoint)
+    except ValueError as exp:
+        print(f"Error: {exp}", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    reported = [0.0]
+
+    def report(progress):
+        if time.perf_counter() - reported[0] >= REPORT_INTERVAL:
+            reported[0] = time.perf_counter()
+            print(f"\r{progress.finished}/{len(search)} fragmentos, {progress.keys} claves",
+                  end='', file=sys.stderr, flush=True)
+
+    def ready(address):
+        print(f"Esperando trabajadores en {address[0]}:{address[1]}", file=sys.stderr, flush=True)
+
+    # A terminated search saves its progress before exiting, as an interrupted one does
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    try:
+        if args.listen:
+            authkey = args.authkey.encode('utf-8') if args.authkey else None
+            best = search_socket(search, progress, _address(args.listen), authkey, args.spawn, report, ready)
+        else:
+            best = search_pool(search, progress, args.workers, report)
+    except ValueError as exp:
+        print(f"Error: {exp}", file=sys.stderr)
+        return 1
+    except (KeyboardInterrupt, SystemExit):
+        progress.save()
+        print(f"\nBúsqueda interrumpida en {progress.finished}/{len(search)} fragmentos.", file=sys.stderr)
+        return 130
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{progress.keys} claves en {elapsed:.1f} s; {progress.survivors} superaron la poda por frecuencias",
+          file=sys.stderr)
+    for candidate in best:
+        print(f"{candidate.key}\t{candidate.score:.2f}\t{search.decipher_prefix(candidate.key)}")
+    return 0 if best else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+from methods import crypto_methods as cm
+from utils import instrumentation as i
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Number of bytes of the transposition grid moved at once; it bounds the memory used besides the page cache
+BLOCK_SIZE = 1 << 22
+
+
+def _prepare(source: str, destination: str, length) -> tuple:
+    """
+    Measures the input file and creates the output file with its final length.
+
+    Parameters:
+    source (str): The path of the input file.
+    destination (str): The path of the output file.
+    length (callable): Computes the output length from the input length.
+
+    Returns:
+    tuple: The input and output lengths, in bytes.
+    """
+    with open(source, 'rb') as reader:
+        size = reader.seek(0, 2)
+    output_size = length(size)
+
+    # The output file is created (or truncated) even when there is nothing to write
+    with open(destination, 'wb') as writer:
+        writer.truncate(output_size)
+    return size, output_size
+
+
+def _map(path: str, mode: str, offset: int, length: int):
+    """
+    Memory-maps length bytes of a file from the given offset.
+
+    Every block maps only what it touches and drops the mapping afterwards, so the pages already
+    processed leave the process memory (they stay in the system's page cache).
+    """
+    return np.memmap(path, dtype=np.uint8, mode=mode, offset=offset, shape=(length,))
+
+
+@i.instrument()
+def transposition_cipher_file(source: str, destination: str, key: str, block_size: int = BLOCK_SIZE) -> int:
+    """
+    Applies the columnar transposition to a file without loading it into memory.
+
+    Both files are memory-mapped. The text is read sequentially, a block of grid rows at a time, and every
+    column of the block is written directly at its offset in the output. Only the pages of the current
+    block stay mapped, so the memory used is bounded by block_size however large the file is.
+
+    The file holds one byte per character, e.g. text written with the 'spanish27' codec, and the output
+    matches methods.buffers.cipher_buffer: the columns are not separated by spaces and the last row is
+    filled by wrapping to the beginning of the text.
+
+    Parameters:
+    source (str): The path of the file to encrypt.
+    destination (str): The path of the file to write.
+    key (str): The key used to define the column order.
+    block_size (int): The approximate number of bytes moved at once.
+
+    Returns:
+    int: The number of bytes written.
+    """
+    order = cm.Cipher.compile('transposition', key).order
+    columns = len(order)
+    length, output_size = _prepare(source, destination, lambda size: -(-size // columns) * columns)
+    if not length:
+        return 0
+
+    rows = output_size // columns
+    block_rows = max(block_size // columns, 1)
+
+    for start in range(0, rows, block_rows):
+        end = min(start + block_rows, rows)
+        if end * columns <= length:
+            block = _map(source, 'r', start * columns, (end - start) * columns).reshape(-1, columns)
+        else:
+            # The last row wraps around to the beginning of the text
+            positions = np.arange(start * columns, end * columns) % length
+            block = _map(source, 'r', 0, length)[positions].reshape(-1, columns)
+
+        # Output column j holds key column order[j] of every row, one after the other
+        grid = _map(destination, 'r+', 0, output_size).reshape(columns, rows)
+        grid[:, start:end] = block[:, order].T
+        del block, grid
+
+    return output_size
+
+
+@i.instrument()
+def transposition_decipher_file(source: str, destination: str, key: str, block_size: int = BLOCK_SIZE) -> int:
+    """
+    Reverts the columnar transposition of a file written by transposition_cipher_file without loading
+    it into memory.
+
+    Every block of output rows is assembled from one contiguous slice of each column, read from the
+    memory-mapped input, and written sequentially to the memory-mapped output.
+
+    Parameters:
+    source (str): The path of the file to decrypt.
+    destination (str): The path of the file to write.
+    key (str): The key used to define the column order.
+    block_size (int): The approximate number of bytes moved at once.
+
+    Returns:
+    int: The number of bytes written.
+
+    Raises:
+    ValueError: If the file length is not a multiple of the key length.
+    """
+    cipher = cm.Cipher.compile('transposition', key)
+    columns = len(cipher.order)
+
+    def output_length(size):
+        if size % columns:
+            raise ValueError("The text length must be a multiple of the key length.")
+        return size
+
+    length, output_size = _prepare(source, destination, output_length)
+    if not length:
+        return 0
+
+    rows = length // columns
+    # Key column j was written at the rank of key character j in the sorted key
+    ranks = cipher.inverse_order
+    block_rows = max(block_size // columns, 1)
+
+    for start in range(0, rows, block_rows):
+        end = min(start + block_rows, rows)
+        grid = _map(source, 'r', 0, length).reshape(columns, rows)
+        output = _map(destination, 'r+', start * columns, (end - start) * columns)
+        output[:] = grid[ranks, start:end].T.ravel()
+        del grid, output
+
+    return output_size
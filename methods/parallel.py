@@ -0,0 +1,266 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Inputs shorter than this (in characters) are processed in the calling process
+PARALLEL_THRESHOLD = 1 << 22
+
+# Number of characters converted at once inside a segment, to bound temporary arrays
+BLOCK_SIZE = 1 << 20
+
+# Ciphers that can be split into independent segments
+PARALLEL_METHODS = ('transposition', 'caesar', 'vigenere')
+
+
+def _substitute_segment(source, target, start, end, shifts, letters):
+    """
+    Applies a substitution cipher to the characters in source[start:end].
+
+    Parameters:
+        source (np.ndarray): The code points of the whole text.
+        target (np.ndarray): The array where the resulting code points are written.
+        start (int): The first position of the segment.
+        end (int): The position after the last character of the segment.
+        shifts (np.ndarray): The key shifts returned by crypto_methods.key_shifts.
+        letters (str): The letters of the alphabet.
+
+    Returns:
+        int: The position of the first character outside the alphabet, or -1 if there is none.
+    """
+    alphabet = a.get_alphabet(letters)
+
+    for block_start in range(start, end, BLOCK_SIZE):
+        block_end = min(block_start + BLOCK_SIZE, end)
+        indices = alphabet.lookup[np.minimum(source[block_start:block_end], len(alphabet.lookup) - 1)]
+
+        invalid = np.flatnonzero(indices == a.INVALID_INDEX)
+        if invalid.size:
+            return block_start + int(invalid[0])
+
+        # Start the key at the phase corresponding to the block position
+        phase_shifts = np.roll(shifts, -(block_start % len(shifts)))
+        indices = cm.shift_indices(indices, phase_shifts, len(alphabet))
+        target[block_start:block_end] = alphabet.codepoints[indices]
+
+    return -1
+
+
+def _transposition_cipher_segment(source, target, start, end, order):
+    """
+    Writes the ciphered characters of rows start to end of the transposition grid.
+
+    The target holds one row per key column, with one extra slot for the separating space.
+
+    Parameters:
+        source (np.ndarray): The code points of the text, without spaces.
+        target (np.ndarray): The array where the ciphered code points are written.
+        start (int): The first grid row of the segment.
+        end (int): The row after the last row of the segment.
+        order (np.ndarray): The column order returned by crypto_methods.transposition_order.
+
+    Returns:
+        int: Always -1, since transposition accepts any character.
+    """
+    columns = len(order)
+    grid = target.reshape(columns, -1)
+
+    for block_start in range(start, end, max(BLOCK_SIZE // columns, 1)):
+        block_end = min(block_start + max(BLOCK_SIZE // columns, 1), end)
+        positions = (np.arange(block_start, block_end) * columns + order[:, np.newaxis]) % len(source)
+        grid[:, block_start:block_end] = source[positions]
+
+    return -1
+
+
+def _transposition_decipher_segment(source, target, start, end, order):
+    """
+    Writes the deciphered characters of rows start to end of the transposition grid.
+
+    The target holds two slots per character: the character and the separating space.
+
+    Parameters:
+        source (np.ndarray): The code points of the ciphered text, without spaces.
+        target (np.ndarray): The array where the deciphered code points are written.
+        start (int): The first grid row of the segment.
+        end (int): The row after the last row of the segment.
+        order (np.ndarray): The column order returned by crypto_methods.transposition_order.
+
+    Returns:
+        int: Always -1, since transposition accepts any character.
+    """
+    columns = len(order)
+    rows = len(source) // columns
+    ranks = np.argsort(order)
+    grid = target.reshape(rows, columns, 2)
+
+    for block_start in range(start, end, max(BLOCK_SIZE // columns, 1)):
+        block_end = min(block_start + max(BLOCK_SIZE // columns, 1), end)
+        positions = ranks * rows + np.arange(block_start, block_end)[:, np.newaxis]
+        grid[block_start:block_end, :, 0] = source[positions]
+
+    return -1
+
+
+def _run_shared_segment(kernel, source_name, source_length, target_name, target_length, *args):
+    """
+    Worker entry point: attaches to the shared input and output buffers and runs a segment kernel.
+
+    Parameters:
+        kernel (callable): One of the segment functions of this module.
+        source_name (str): The name of the shared memory block holding the input code points.
+        source_length (int): The number of input code points.
+        target_name (str): The name of the shared memory block receiving the output code points.
+        target_length (int): The number of output code points.
+        *args: The remaining arguments of the kernel.
+
+    Returns:
+        int: The value returned by the kernel.
+    """
+    source_memory = shared_memory.SharedMemory(name=source_name)
+    target_memory = shared_memory.SharedMemory(name=target_name)
+    try:
+        source = np.ndarray(source_length, dtype=np.uint32, buffer=source_memory.buf)
+        target = np.ndarray(target_length, dtype=np.uint32, buffer=target_memory.buf)
+        result = kernel(source, target, *args)
+        del source, target
+        return result
+    finally:
+        source_memory.close()
+        target_memory.close()
+
+
+def _split(length, parts):
+    """
+    Splits range(length) into at most the given number of contiguous, non-empty segments.
+
+    Parameters:
+        length (int): The total length to split.
+        parts (int): The maximum number of segments.
+
+    Returns:
+        list of tuple: The (start, end) bounds of each segment.
+    """
+    bounds = np.linspace(0, length, min(parts, max(length, 1)) + 1).astype(int).tolist()
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def parallel_cipher(method: str, text: str, key, decrypt: bool = False, workers: int = None,
+                    executor: ProcessPoolExecutor = None, alphabet: a.Alphabet = a.SPANISH) -> str:
+    """
+    Encrypts or decrypts a large text by splitting it into position-aligned segments that are
+    processed in a pool of worker processes.
+
+    The text is handed to the workers through shared memory rather than pickled strings, and each
+    worker writes its segment directly into a shared output buffer. The result is identical to the
+    serial functions of crypto_methods. Texts shorter than PARALLEL_THRESHOLD are processed in the
+    calling process.
+
+    Parameters:
+        method (str): The cipher to apply: 'transposition', 'caesar' or 'vigenere'.
+        text (str): The text to be processed.
+        key (int or str): The key of the cipher.
+        decrypt (bool): If True, the text is decrypted instead of encrypted.
+        workers (int): The number of worker processes. Defaults to the number of CPUs.
+        executor (ProcessPoolExecutor): An existing pool to reuse instead of starting a new one.
+        alphabet (Alphabet): The alphabet of the substitution ciphers. Defaults to the Spanish alphabet.
+
+    Returns:
+        str: The processed text.
+
+    Raises:
+        ValueError: If the method is unknown, the key is invalid or the text contains characters
+        outside the alphabet.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if method == 'transposition':
+        text = text.replace(' ', '')
+        order = cm.transposition_order(key)
+        columns = len(order)
+        if decrypt:
+            if len(text) % columns:
+                raise ValueError("The text length must be a multiple of the key length.")
+            kernel = _transposition_decipher_segment
+            segments_length = len(text) // columns
+            target_length = 2 * len(text)
+        else:
+            kernel = _transposition_cipher_segment
+            segments_length = -(-len(text) // columns)
+            target_length = columns * (segments_length + 1)
+        args = (order,)
+    elif method in ('caesar', 'vigenere'):
+        kernel = _substitute_segment
+        segments_length = target_length = len(text)
+        args = (cm.key_shifts(method, key, alphabet, decrypt), alphabet.letters)
+    else:
+        raise ValueError(f"Unsupported cipher: {method!r}; choose one of {', '.join(PARALLEL_METHODS)}.")
+
+    source_bytes = text.encode('utf-32-le')
+    segments = _split(segments_length, workers)
+
+    if len(text) < PARALLEL_THRESHOLD or workers == 1:
+        # Small inputs: the pool start-up would cost more than the work itself
+        source = np.frombuffer(source_bytes, dtype=np.uint32)
+        target = np.full(target_length, ord(' '), dtype=np.uint32)
+        invalid = [kernel(source, target, start, end, *args) for start, end in segments]
+        result = target
+    else:
+        source_memory = shared_memory.SharedMemory(create=True, size=max(len(source_bytes), 1))
+        target_memory = shared_memory.SharedMemory(create=True, size=max(4 * target_length, 1))
+        try:
+            source_memory.buf[:len(source_bytes)] = source_bytes
+            del source_bytes
+            target = np.ndarray(target_length, dtype=np.uint32, buffer=target_memory.buf)
+            target.fill(ord(' '))
+
+            pool = executor or ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(_run_shared_segment, kernel, source_memory.name, len(text),
+                                       target_memory.name, target_length, start, end, *args)
+                           for start, end in segments]
+                invalid = [future.result() for future in futures]
+            finally:
+                if executor is None:
+                    pool.shutdown()
+
+            result = target.copy()
+            del target
+        finally:
+            source_memory.close()
+            source_memory.unlink()
+            target_memory.close()
+            target_memory.unlink()
+
+    # Report the first character outside the alphabet, as the serial functions do
+    invalid = [position for position in invalid if position >= 0]
+    if invalid:
+        raise ValueError(f"'{text[min(invalid)]}' is not in list")
+
+    if method == 'transposition':
+        result = result[:-1]
+    return result.tobytes().decode('utf-32-le')
+
+
+def encrypt_parallel(text: str, key, method: str = 'vigenere', **options) -> str:
+    """
+    Encrypts a large text using a pool of worker processes. See parallel_cipher for the available options.
+
+    Returns:
+        str: The encrypted text.
+    """
+    return parallel_cipher(method, text, key, decrypt=False, **options)
+
+
+def decrypt_parallel(text: str, key, method: str = 'vigenere', **options) -> str:
+    """
+    Decrypts a large text using a pool of worker processes. See parallel_cipher for the available options.
+
+    Returns:
+        str: The decrypted text.
+    """
+    return parallel_cipher(method, text, key, decrypt=True, **options)
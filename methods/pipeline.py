@@ -0,0 +1,194 @@
+from collections import namedtuple
+from functools import lru_cache
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import instrumentation as i
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Maximum number of plans kept per process
+PLAN_CACHE_SIZE = 16
+
+# Longest text whose plan is cached. A plan holds an int32 index map and a shift vector, about
+# 5 bytes per letter, so the cached plans take at most 16 * 5 MB; longer plans are rebuilt on every call
+PLAN_CACHE_MAX_LENGTH = 1 << 20
+
+# Ciphers that fold into a plan: permutations and shifts (Hill mixes the letters of every block)
+PIPELINE_KINDS = ('transposition', 'caesar', 'vigenere')
+
+# A fused pipeline for one text length: output = (input[gather] + shifts) % alphabet size
+Plan = namedtuple('Plan', ['gather', 'shifts'])
+
+# One cipher of a pipeline
+Stage = namedtuple('Stage', ['kind', 'key', 'decrypt'])
+
+
+class Pipeline:
+    """
+    A chain of ciphers, e.g. Vigenère followed by transposition, run as a single fused pass.
+
+    For a given text length the chain is compiled into a plan: all the permutations (transposition
+    stages) compose into one index map, and all the substitutions (Caesar and Vigenère stages),
+    carried through those permutations, fold into one shift vector. Running the pipeline is then one
+    gather and one modular add, however many stages it has, with no strings between stages.
+
+    The result equals calling the *_cipher functions one after the other, removing the spaces of the
+    transposition output before the next stage. The output has no separating spaces.
+    """
+
+    def __init__(self, stages, alphabet: a.Alphabet = a.SPANISH):
+        """
+        Validates the stages and computes their key schedules.
+
+        Parameters:
+            stages (sequence): The ciphers in the order they are applied, each as (kind, key) or
+                (kind, key, decrypt), where kind is one of PIPELINE_KINDS.
+            alphabet (Alphabet): The alphabet of the texts and keys. Defaults to the Spanish alphabet.
+
+        Raises:
+            ValueError: If there are no stages, or a kind or key is invalid.
+        """
+        if not stages:
+            raise ValueError("The pipeline must have at least one stage.")
+
+        self.stages = tuple(Stage(stage[0], stage[1], bool(stage[2]) if len(stage) > 2 else False)
+                            for stage in stages)
+        self.alphabet = alphabet
+        self._reverse = None
+
+        # Compiling every stage validates its kind and key once
+        for stage in self.stages:
+            if stage.kind not in PIPELINE_KINDS:
+                raise ValueError(f"The {stage.kind!r} cipher cannot be fused into a pipeline; "
+                                 f"choose one of {', '.join(PIPELINE_KINDS)}.")
+            cm.Cipher.compile(stage.kind, stage.key, alphabet)
+
+    def __repr__(self):
+        return f"Pipeline({[tuple(stage) for stage in self.stages]!r})"
+
+    def reverse(self) -> 'Pipeline':
+        """
+        Returns the pipeline that undoes this one: the inverse of every stage, in reverse order.
+
+        Returns:
+            Pipeline: The decryption pipeline.
+        """
+        if self._reverse is None:
+            self._reverse = Pipeline([(stage.kind, stage.key, not stage.decrypt)
+                                      for stage in reversed(self.stages)], self.alphabet)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def plan(self, length: int) -> Plan:
+        """
+        Returns the fused plan for texts of the given length. Plans for texts of up to
+        PLAN_CACHE_MAX_LENGTH letters are built on first use and cached.
+
+        Parameters:
+            length (int): The number of letters of the input text.
+
+        Returns:
+            Plan: The index map and shift vector of the whole pipeline.
+
+        Raises:
+            ValueError: If a transposition decryption stage receives a length that is not
+            a multiple of its key length.
+        """
+        if length > PLAN_CACHE_MAX_LENGTH:
+            return _build_plan(self.stages, self.alphabet, length)
+        return _cached_plan(self.stages, self.alphabet, length)
+
+    def run(self, indices):
+        """
+        Runs the pipeline on alphabet positions.
+
+        Parameters:
+            indices (np.ndarray): The alphabet position of every letter of the text.
+
+        Returns:
+            np.ndarray: The alphabet positions of the result.
+        """
+        gather, shifts = self.plan(len(indices))
+
+        # The one gather of the pipeline, widened when the sum of two positions does not fit in a byte
+        dtype = np.uint8 if len(self.alphabet) <= 128 else np.uint16
+        result = indices.astype(dtype, copy=False)[gather]
+
+        # The one modular add of the pipeline
+        result += shifts
+        result %= len(self.alphabet)
+        return result
+
+    @i.instrument(data='text')
+    def encrypt(self, text) -> str:
+        """
+        Applies every stage to the text in a single fused pass.
+
+        Parameters:
+            text (str or np.ndarray): The text, or its alphabet positions. Spaces are ignored.
+
+        Returns:
+            str: The encrypted text.
+
+        Raises:
+            ValueError: If the text contains characters outside the alphabet.
+        """
+        if isinstance(text, str):
+            text = text.replace(' ', '')
+        return self.alphabet.decode(self.run(cm.encode_text(text, self.alphabet)))
+
+    @i.instrument(data='text')
+    def decrypt(self, text) -> str:
+        """
+        Undoes every stage with the reverse pipeline, in a single fused pass.
+
+        Parameters:
+            text (str or np.ndarray): The encrypted text, or its alphabet positions. Spaces are ignored.
+
+        Returns:
+            str: The decrypted text, including the wrapped letters that filled the last transposition row.
+
+        Raises:
+            ValueError: If the text contains characters outside the alphabet.
+        """
+        return self.reverse().encrypt(text)
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _cached_plan(stages, alphabet, length):
+    return _build_plan(stages, alphabet, length)
+
+
+def _build_plan(stages, alphabet, length):
+    """
+    Composes the stages into one plan. Starting from the identity, a permutation P turns the plan
+    (gather, shifts) into (gather[P], shifts[P]), and a substitution adds its key, repeated along
+    the current length, to the shifts.
+    """
+    alphabet_size = len(alphabet)
+    dtype = np.uint8 if alphabet_size <= 128 else np.uint16
+    gather = np.arange(length)
+    shifts = np.zeros(length, dtype=dtype)
+
+    for stage in stages:
+        cipher = cm.Cipher.compile(stage.kind, stage.key, alphabet)
+
+        if stage.kind == 'transposition':
+            if stage.decrypt:
+                positions = cm.transposition_decipher_indices(len(gather), cipher.order, cipher.inverse_order)
+            else:
+                positions = cm.transposition_cipher_indices(len(gather), cipher.order)
+            positions = positions.ravel()
+            gather = gather[positions]
+            shifts = shifts[positions]
+        elif len(shifts):
+            key = cipher.decrypt_shifts if stage.decrypt else cipher.encrypt_shifts
+            shifts = cm.shift_indices(shifts, key.astype(dtype), alphabet_size)
+
+    # Smaller index types make the gather faster for texts of usual sizes
+    if len(gather) and gather.max() < np.iinfo(np.int32).max:
+        gather = gather.astype(np.int32)
+    gather.flags.writeable = False
+    shifts.flags.writeable = False
+    return Plan(gather, shifts)
@@ -0,0 +1,266 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from methods import crypto_methods as cm
+
+# Default memory budget of a cache, in bytes of cached results
+DEFAULT_MAX_BYTES = 1 << 26
+
+# Default number of seconds an entry stays valid
+DEFAULT_TTL = 600.0
+
+# Estimated bytes used by an entry besides its result: the key tuple, the digest and the dictionary slot
+ENTRY_OVERHEAD = 256
+
+# Ciphers where decrypting the result gives back exactly the original text, so both
+# directions can be stored at once (transposition and Hill pad their output)
+INVERTIBLE_METHODS = ('caesar', 'vigenere')
+
+# The crypto_methods entry point of every cipher and direction
+FUNCTIONS = {
+    ('transposition', False): cm.transposition_cipher,
+    ('transposition', True): cm.transposition_decipher,
+    ('caesar', False): cm.caesar_cipher,
+    ('caesar', True): cm.caesar_decipher,
+    ('vigenere', False): cm.vigenere_cipher,
+    ('vigenere', True): cm.vigenere_decipher,
+    ('hill', False): cm.hill_cipher,
+    ('hill', True): cm.hill_decipher,
+}
+
+
+def text_digest(text) -> bytes:
+    """
+    Computes a 128-bit BLAKE2b digest of a text, used instead of the text itself in the cache keys.
+
+    Parameters:
+    text (str or bytes-like): The text, or a contiguous buffer such as an array of alphabet positions.
+    Strings and buffers are hashed in separate domains, so they never share an entry.
+
+    Returns:
+    bytes: The digest.
+    """
+    if isinstance(text, str):
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16, person=b'str').digest()
+    return hashlib.blake2b(memoryview(text).cast('B'), digest_size=16, person=b'buffer').digest()
+
+
+class ResultCache:
+    """
+    A bounded memoization layer for the results of the ciphers, keyed by cipher, direction, key and
+    a digest of the text.
+
+    Entries are evicted in least recently used order once the results exceed max_bytes, and expire
+    ttl seconds after they are stored. Storing an encryption result of an invertible cipher also stores
+    the matching decryption, so decrypting the output again is answered from the cache.
+
+    The cache is safe to use from several threads (the GUI tasks and the service executor).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL, clock=time.monotonic):
+        """
+        Parameters:
+            max_bytes (int): The memory budget of the cached results, in bytes.
+            ttl (float): The number of seconds an entry stays valid, or None to never expire entries.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (result, size, expiry)
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(method: str, key, text, decrypt: bool = False):
+        """
+        Builds the cache key of an operation.
+
+        Parameters:
+            method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+            key (int or str): The key of the cipher.
+            text (str or bytes-like): The text to be processed.
+            decrypt (bool): Whether the text is decrypted.
+
+        Returns:
+            tuple: The cache key, or None if the operation cannot be cached (the key is not an int or a string).
+        """
+        if isinstance(key, bool) or not isinstance(key, (int, str)):
+            return None
+        return method, bool(decrypt), key, len(text), text_digest(text)
+
+    def get(self, method: str, key, text, decrypt: bool = False):
+        """
+        Looks up the result of an operation.
+
+        Parameters:
+            method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+            key (int or str): The key of the cipher.
+            text (str or bytes-like): The text to be processed.
+            decrypt (bool): Whether the text is decrypted.
+
+        Returns:
+            str: The cached result, or None if it is not cached.
+        """
+        cache_key = self.make_key(method, key, text, decrypt)
+        with self._lock:
+            entry = self._entries.get(cache_key) if cache_key is not None else None
+            if entry is not None and self._expired(entry):
+                self._remove(cache_key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, method: str, key, text, result, decrypt: bool = False):
+        """
+        Stores the result of an operation and, for invertible ciphers given a string, the result
+        of the opposite operation on it.
+
+        Results that are exceptions, and results larger than the whole budget, are not stored.
+
+        Parameters:
+            method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+            key (int or str): The key of the cipher.
+            text (str or bytes-like): The processed text.
+            result (str): The result of the operation.
+            decrypt (bool): Whether the text was decrypted.
+        """
+        if not isinstance(result, str):
+            return
+        cache_key = self.make_key(method, key, text, decrypt)
+        if cache_key is None:
+            return
+
+        inverse_key = None
+        if method in INVERTIBLE_METHODS and isinstance(text, str):
+            inverse_key = self.make_key(method, key, result, not decrypt)
+
+        with self._lock:
+            self._store(cache_key, result)
+            if inverse_key is not None:
+                self._store(inverse_key, text)
+            self._evict()
+
+    def cached_call(self, method: str, key, text, decrypt: bool, compute):
+        """
+        Returns the cached result of an operation, computing and storing it on a miss.
+
+        Parameters:
+            method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+            key (int or str): The key of the cipher.
+            text (str or bytes-like): The text to be processed.
+            decrypt (bool): Whether the text is decrypted.
+            compute (callable): Called without arguments to compute the result on a miss.
+
+        Returns:
+            str or Exception: The result; errors returned by compute are passed through uncached.
+        """
+        result = self.get(method, key, text, decrypt)
+        if result is None:
+            result = compute()
+            self.put(method, key, text, result, decrypt)
+        return result
+
+    def clear(self):
+        """Removes every entry; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The number of entries, bytes used and budget, hits, misses, hit ratio,
+            evictions (for size) and expirations (for age), all read at the same moment.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def _expired(self, entry) -> bool:
+        return entry[2] is not None and entry[2] <= self.clock()
+
+    def _store(self, cache_key, result):
+        size = sys.getsizeof(result) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        if cache_key in self._entries:
+            self._remove(cache_key)
+        expiry = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[cache_key] = (result, size, expiry)
+        self.size += size
+
+    def _remove(self, cache_key):
+        self.size -= self._entries.pop(cache_key)[1]
+
+    def _evict(self):
+        """
+        Drops the expired entries (at most once every ttl / 2 seconds, since it scans them all)
+        and then the least recently used ones until the results fit in the budget.
+        """
+        now = self.clock()
+        if self.ttl is not None and now >= self._next_sweep:
+            for cache_key in [cache_key for cache_key, entry in self._entries.items() if entry[2] <= now]:
+                self._remove(cache_key)
+                self.expirations += 1
+            self._next_sweep = now + self.ttl / 2
+
+        while self.size > self.max_bytes:
+            self.size -= self._entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+
+# Cache shared by the windows of the GUI
+CACHE = ResultCache()
+
+
+def cached_cipher(method: str, text, key, decrypt: bool = False, cache: ResultCache = CACHE):
+    """
+    Encrypts or decrypts a text with the crypto_methods entry point of the cipher, going through the cache.
+
+    Parameters:
+    method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+    text (str or np.ndarray): The text, or its alphabet positions.
+    key (int or str): The key of the cipher.
+    decrypt (bool): If True, the text is decrypted instead of encrypted.
+    cache (ResultCache): The cache to use. Defaults to the shared cache.
+
+    Returns:
+    str or Exception: The result of the cipher.
+
+    Raises:
+    ValueError: If the cipher is not supported.
+    """
+    function = FUNCTIONS.get((method, bool(decrypt)))
+    if function is None:
+        raise ValueError(f"Unsupported cipher: {method!r}; choose one of {', '.join(cm.CIPHER_KINDS)}.")
+    return cache.cached_call(method, key, text, decrypt, lambda: function(text, key))
@@ -0,0 +1,172 @@
+import sys
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Number of characters read from the input on every iteration
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Ciphers that can be applied chunk by chunk
+STREAMABLE_METHODS = ('caesar', 'vigenere')
+
+# Removes the spaces and line breaks of a chunk, as the records of the GUI and the command line are cleaned
+WHITESPACE = str.maketrans('', '', ' \t\r\n')
+
+
+class StreamCipher:
+    """
+    Encrypts or decrypts a text delivered in consecutive chunks.
+
+    The position reached in the key is carried from one chunk to the next, so the
+    concatenated output is identical to processing the whole text in one call.
+    """
+
+    def __init__(self, method, key, decrypt=False, passthrough=False, alphabet=a.SPANISH):
+        """
+        Precomputes the key shifts for the selected cipher.
+
+        Parameters:
+            method (str): The cipher to apply, either 'caesar' or 'vigenere'.
+            key (int or str): The Caesar shift or the Vigenère key.
+            decrypt (bool): If True, the chunks are decrypted instead of encrypted.
+            passthrough (bool): If True, characters outside the alphabet are copied unchanged
+                and do not advance the key. Otherwise they raise ValueError.
+            alphabet (Alphabet): The alphabet the text and key are written in.
+        """
+        if method not in STREAMABLE_METHODS:
+            raise ValueError(
+                f"The {method!r} cipher cannot be applied chunk by chunk; "
+                f"choose one of {', '.join(STREAMABLE_METHODS)}.")
+
+        self.alphabet = alphabet
+        self.passthrough = passthrough
+        self.shifts = cm.key_shifts(method, key, alphabet, decrypt)
+        self.offset = 0  # Key position where the next chunk starts
+
+    def process(self, chunk: str) -> str:
+        """
+        Encrypts or decrypts the next chunk of the text.
+
+        Parameters:
+            chunk (str or np.ndarray): The next piece of the text, or its alphabet positions
+                (only without passthrough).
+
+        Returns:
+            str: The processed chunk.
+        """
+        if self.passthrough:
+            codepoints = np.frombuffer(chunk.encode('utf-32-le'), dtype=np.uint32).copy()
+            indices = self.alphabet.to_indices(chunk)
+            valid = indices != a.INVALID_INDEX
+            letters = indices[valid]
+        else:
+            letters = cm.encode_text(chunk, self.alphabet)
+
+        # Start the key where the previous chunk left it
+        shifts = np.roll(self.shifts, -self.offset)
+        self.offset = (self.offset + len(letters)) % len(self.shifts)
+        letters = cm.shift_indices(letters, shifts, len(self.alphabet))
+
+        if self.passthrough:
+            codepoints[valid] = self.alphabet.codepoints[letters]
+            return codepoints.tobytes().decode('utf-32-le')
+        return self.alphabet.decode(letters)
+
+
+def read_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Reads a text file in fixed-size chunks.
+
+    Parameters:
+        file (TextIO): The open text file to read.
+        chunk_size (int): The number of characters per chunk.
+
+    Yields:
+        str: The consecutive chunks of the file.
+    """
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+def process_stream(source, destination, method, key, decrypt=False,
+                   chunk_size=DEFAULT_CHUNK_SIZE, passthrough=False, alphabet=a.SPANISH, upper=False,
+                   strip=False):
+    """
+    Encrypts or decrypts a text file chunk by chunk, using constant memory.
+
+    Parameters:
+        source (TextIO): The open text file to read.
+        destination (TextIO): The open text file where the result is written.
+        method (str): The cipher to apply, either 'caesar' or 'vigenere'.
+        key (int or str): The Caesar shift or the Vigenère key.
+        decrypt (bool): If True, the text is decrypted instead of encrypted.
+        chunk_size (int): The number of characters per chunk.
+        passthrough (bool): If True, characters outside the alphabet are copied unchanged.
+        alphabet (Alphabet): The alphabet the text and key are written in.
+        upper (bool): If True, every chunk is converted to uppercase before processing.
+        strip (bool): If True, spaces and line breaks are removed from every chunk before processing.
+            Ignored with passthrough, which copies them unchanged.
+
+    Returns:
+        int: The number of characters processed.
+
+    Raises:
+        ValueError: If the chunk size is not positive, or the text contains characters outside the alphabet.
+    """
+    if chunk_size < 1:
+        raise ValueError("The chunk size must be a positive number of characters.")
+
+    cipher = StreamCipher(method, key, decrypt, passthrough, alphabet)
+    processed = 0
+
+    for chunk in read_chunks(source, chunk_size):
+        processed += len(chunk)
+        if upper:
+            chunk = chunk.upper()
+        if strip and not passthrough:
+            chunk = chunk.translate(WHITESPACE)
+        destination.write(cipher.process(chunk))
+
+    return processed
+
+
+def encrypt_stream(source, destination, method, key, **options):
+    """
+    Encrypts a text file chunk by chunk. See process_stream for the available options.
+
+    Returns:
+        int: The number of characters processed.
+    """
+    return process_stream(source, destination, method, key, decrypt=False, **options)
+
+
+def decrypt_stream(source, destination, method, key, **options):
+    """
+    Decrypts a text file chunk by chunk. See process_stream for the available options.
+
+    Returns:
+        int: The number of characters processed.
+    """
+    return process_stream(source, destination, method, key, decrypt=True, **options)
+
+
+def main(argv=None):
+    """
+    Command line entry point, kept for existing scripts: the same as python -m cli with the text
+    format, which streams Caesar and Vigenère chunk by chunk.
+
+    Parameters:
+        argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status.
+    """
+    # Imported here since cli imports this module
+    import cli
+    return cli.main(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
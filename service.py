@@ -0,0 +1,499 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cli
+from methods import crypto_methods as cm
+from methods import result_cache as rc
+from utils import instrumentation as i
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Maximum number of queued requests processed by one vectorized call
+MAX_BATCH = 4096
+
+# Texts with at least this many characters are processed in the executor instead of the event loop
+OFFLOAD_THRESHOLD = 1 << 16
+
+# Largest accepted request body, in bytes
+MAX_BODY_SIZE = 1 << 26
+
+# Seconds the rest of a rejected request is read and discarded before its connection is closed
+LINGER_TIMEOUT = 1.0
+
+# Seconds covered by the recent throughput reported by /stats
+RATE_WINDOW = 5
+
+# Reason phrases of the status codes used by the service
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 414: 'URI Too Long', 431: 'Request Header Fields Too Large',
+           500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Exception raised to answer a request with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RateMeter:
+    """
+    Counts events in one-second buckets to report their recent rate.
+    """
+
+    def __init__(self, window: int = RATE_WINDOW):
+        """
+        Parameters:
+            window (int): The number of complete seconds averaged by rate().
+        """
+        self.window = window
+        self.buckets = {}  # Second -> number of events
+
+    def add(self, count: int = 1):
+        """
+        Records events that happened now.
+
+        Parameters:
+            count (int): The number of events.
+        """
+        second = int(time.monotonic())
+        self.buckets[second] = self.buckets.get(second, 0) + count
+        if len(self.buckets) > self.window + 1:
+            for old in [old for old in self.buckets if old < second - self.window]:
+                del self.buckets[old]
+
+    def rate(self) -> float:
+        """
+        Returns the average number of events per second over the last complete seconds of the window.
+        """
+        now = int(time.monotonic())
+        return sum(count for second, count in self.buckets.items()
+                   if now - self.window <= second < now) / self.window
+
+
+class CipherService:
+    """
+    Runs the ciphers for concurrent requests of an asyncio server.
+
+    Small requests are queued and coalesced: every time the batching task wakes up, it takes all the
+    queued requests (up to offload_threshold characters) and processes those that share a cipher and
+    direction with one vectorized call. Requests whose text has at least offload_threshold characters go straight to a thread pool,
+    so the event loop never blocks on them. Repeated requests are answered from a result cache
+    before being queued.
+    """
+
+    def __init__(self, max_batch: int = MAX_BATCH, offload_threshold: int = OFFLOAD_THRESHOLD, workers: int = None,
+                 cache_size: int = rc.DEFAULT_MAX_BYTES, cache_ttl: float = rc.DEFAULT_TTL):
+        """
+        Parameters:
+            max_batch (int): The maximum number of requests processed by one vectorized call.
+            offload_threshold (int): The text length from which a request is processed in the executor,
+                and the maximum number of characters of a batch.
+            workers (int): The number of threads of the executor. Defaults to the executor's default.
+            cache_size (int): The memory budget of the result cache, in bytes; 0 disables the cache.
+            cache_ttl (float): The number of seconds a cached result stays valid.
+        """
+        self.max_batch = max_batch
+        self.offload_threshold = offload_threshold
+        self.executor = ThreadPoolExecutor(workers)
+        self.cache = rc.ResultCache(cache_size, cache_ttl) if cache_size else None
+        self.queue = None
+        self.batcher = None
+        self.carried = None  # Request left out of the last batch because it would exceed its characters
+
+        self.started = time.monotonic()
+        self.rate = RateMeter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.max_batch_size = 0
+        self.offloaded = 0
+        self.offloaded_in_flight = 0
+        self.connections = 0
+
+    async def start(self):
+        """Starts the batching task in the running event loop."""
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self._run_batches())
+
+    async def stop(self):
+        """Stops the batching task and the executor."""
+        self.batcher.cancel()
+        try:
+            await self.batcher
+        except asyncio.CancelledError:
+            pass
+        self.executor.shutdown(wait=False)
+
+    async def submit(self, method: str, key, text: str, decrypt: bool = False) -> str:
+        """
+        Encrypts or decrypts a text, waiting for the batch it is coalesced into.
+
+        Parameters:
+            method (str): The cipher, one of crypto_methods.CIPHER_KINDS.
+            key (int or str): The key of the cipher.
+            text (str): The text; it is converted to uppercase and its spaces are removed, as in the GUI.
+            decrypt (bool): If True, the text is decrypted instead of encrypted.
+
+        Returns:
+            str: The processed text.
+
+        Raises:
+            ValueError: If the cipher, the key or the text is invalid.
+        """
+        if method not in cm.CIPHER_KINDS:
+            raise ValueError(f"Unsupported cipher: {method!r}; choose one of {', '.join(cm.CIPHER_KINDS)}.")
+        if not isinstance(text, str):
+            raise ValueError("The text must be a string.")
+        text = cli.clean_record(text)
+
+        if self.cache is not None:
+            cached = self.cache.get(method, key, text, decrypt)
+            if cached is not None:
+                return cached
+
+        if len(text) >= self.offload_threshold:
+            self.offloaded += 1
+            self.offloaded_in_flight += 1
+            try:
+                result, = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, cli.cipher_records, [text], [key], method, decrypt)
+            finally:
+                self.offloaded_in_flight -= 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait((method, decrypt, text, key, future))
+            result = await future
+
+        if isinstance(result, Exception):
+            raise ValueError(str(result))
+        if self.cache is not None:
+            self.cache.put(method, key, text, result, decrypt)
+        return result
+
+    async def _run_batches(self):
+        """
+        Processes the queued requests in batches until cancelled.
+
+        A batch runs on the event loop, so it is closed before its texts add up to offload_threshold
+        characters: no batch takes longer than a single text that would be sent to the executor.
+        """
+        while True:
+            if self.carried is not None:
+                batch, self.carried = [self.carried], None
+            else:
+                batch = [await self.queue.get()]
+            characters = len(batch[0][2])
+            # Let the connections that are ready enqueue their requests before the batch is closed
+            await asyncio.sleep(0)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                request = self.queue.get_nowait()
+                characters += len(request[2])
+                if characters > self.offload_threshold:
+                    self.carried = request
+                    break
+                batch.append(request)
+
+            # Requests that share a cipher and direction go through one vectorized call
+            groups = {}
+            for request in batch:
+                groups.setdefault((request[0], request[1]), []).append(request)
+
+            for (method, decrypt), requests in groups.items():
+                try:
+                    results = cli.cipher_records([request[2] for request in requests],
+                                                 [request[3] for request in requests], method, decrypt)
+                except Exception as exp:
+                    results = [exp] * len(requests)
+                for request, result in zip(requests, results):
+                    if not request[4].done():
+                        request[4].set_result(result)
+
+            self.batches += 1
+            self.batched_requests += len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the service.
+
+        Returns:
+            dict: The uptime, requests, errors, recent and average throughput (requests per second),
+            queue depth, batch sizes, offloaded requests, open connections and the result cache counters.
+        """
+        uptime = time.monotonic() - self.started
+        return {
+            'uptime': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'throughput': self.rate.rate(),
+            'average_throughput': self.requests / uptime if uptime else 0.0,
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'batches': self.batches,
+            'average_batch_size': self.batched_requests / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'offloaded': self.offloaded,
+            'offloaded_in_flight': self.offloaded_in_flight,
+            'connections': self.connections,
+            'cache': self.cache.stats() if self.cache is not None else None,
+        }
+
+    async def dispatch(self, verb: str, path: str, body: bytes):
+        """
+        Answers one request.
+
+        Endpoints:
+            POST /encrypt, POST /decrypt: a JSON object with 'method', 'key' and 'text'; answers {'text': ...}.
+            GET /stats: the counters of stats(), as JSON.
+            GET /metrics: the statistics of the instrumented functions, in the Prometheus text format.
+
+        Parameters:
+            verb (str): The HTTP method.
+            path (str): The requested path.
+            body (bytes): The request body.
+
+        Returns:
+            tuple: The status code, the content type and the response body.
+
+        Raises:
+            HTTPError: If the request cannot be answered.
+        """
+        if path in ('/encrypt', '/decrypt'):
+            if verb != 'POST':
+                raise HTTPError(405, "Use POST.")
+            try:
+                request = json.loads(body)
+                text = await self.submit(request.get('method', 'vigenere'), request.get('key'),
+                                         request.get('text'), decrypt=path == '/decrypt')
+            except (ValueError, AttributeError) as exp:
+                raise HTTPError(400, str(exp)) from None
+            return 200, 'application/json', json.dumps({'text': text}, ensure_ascii=False).encode('utf-8')
+
+        if path in ('/stats', '/metrics'):
+            if verb != 'GET':
+                raise HTTPError(405, "Use GET.")
+            if path == '/stats':
+                return 200, 'application/json', json.dumps(self.stats()).encode('utf-8')
+            return 200, 'text/plain; version=0.0.4', i.to_prometheus().encode('utf-8')
+
+        raise HTTPError(404, f"Unknown path: {path}")
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serves the requests of one keep-alive connection, one after another.
+        """
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    verb, path, body, keep_alive = request
+                except HTTPError as exp:
+                    # The connection cannot be reused after a malformed request
+                    write_response(writer, exp.status, 'application/json',
+                                   json.dumps({'error': str(exp)}).encode('utf-8'), keep_alive=False)
+                    await writer.drain()
+                    await linger(reader, writer)
+                    break
+
+                try:
+                    status, content_type, payload = await self.dispatch(verb, path, body)
+                except HTTPError as exp:
+                    status, content_type = exp.status, 'application/json'
+                    payload = json.dumps({'error': str(exp)}, ensure_ascii=False).encode('utf-8')
+                except Exception as exp:
+                    status, content_type = 500, 'application/json'
+                    payload = json.dumps({'error': str(exp)}, ensure_ascii=False).encode('utf-8')
+
+                self.requests += 1
+                self.errors += status != 200
+                self.rate.add()
+                write_response(writer, status, content_type, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def read_request(reader):
+    """
+    Reads one HTTP/1.x request.
+
+    Parameters:
+        reader (asyncio.StreamReader): The connection.
+
+    Returns:
+        tuple: The method, path, body and whether the connection stays open, or None if the client closed it.
+
+    Raises:
+        HTTPError: If the request is malformed, or its request line, a header line or its body is too large.
+    """
+    request_line = await read_line(reader, 414, "The request line is too long.")
+    if not request_line:
+        return None
+
+    try:
+        verb, path, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.") from None
+
+    headers = {}
+    while (line := await read_line(reader, 431, "A header line is too long.")) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length.") from None
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length.")
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, f"The body must not exceed {MAX_BODY_SIZE} bytes.")
+    body = await reader.readexactly(length) if length else b''
+
+    # HTTP/1.1 connections stay open unless closed explicitly; HTTP/1.0 ones only if requested
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return verb, path.split('?', 1)[0], body, keep_alive
+
+
+async def read_line(reader, status: int, message: str) -> bytes:
+    """
+    Reads one line of a request.
+
+    Parameters:
+        reader (asyncio.StreamReader): The connection.
+        status (int): The status answered if the line is longer than the limit of the stream.
+        message (str): The error message answered in that case.
+
+    Returns:
+        bytes: The line, with its line ending, or an empty string if the client closed the connection.
+
+    Raises:
+        HTTPError: If the line is longer than the limit of the stream.
+    """
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(status, message) from None
+
+
+async def linger(reader, writer):
+    """
+    Reads and discards what the client is still sending before its connection is closed. Closing a socket
+    with unread data resets the connection, which can drop the error response before the client reads it.
+
+    Parameters:
+        reader (asyncio.StreamReader): The connection.
+        writer (asyncio.StreamWriter): The connection.
+    """
+    writer.write_eof()
+
+    async def discard():
+        while await reader.read(1 << 16):
+            pass
+
+    try:
+        await asyncio.wait_for(discard(), LINGER_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+
+
+def write_response(writer, status: int, content_type: str, payload: bytes, keep_alive: bool = True):
+    """
+    Writes an HTTP/1.1 response.
+
+    Parameters:
+        writer (asyncio.StreamWriter): The connection.
+        status (int): The status code.
+        content_type (str): The media type of the payload.
+        payload (bytes): The response body.
+        keep_alive (bool): Whether the connection stays open afterwards.
+    """
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload)
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None, **options):
+    """
+    Runs the cipher service until cancelled.
+
+    Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        ready (callable): Called with the listening server once it accepts connections.
+        **options: The options of CipherService.
+    """
+    service = CipherService(**options)
+    await service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    try:
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    """
+    Command line entry point: starts the local cipher service.
+
+    Parameters:
+        argv (list of str): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m service',
+        description='Servicio HTTP local de cifrado, con conexiones persistentes y agrupación de peticiones.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH,
+                        help='Número máximo de peticiones procesadas en una sola llamada vectorizada.')
+    parser.add_argument('--offload-threshold', type=int, default=OFFLOAD_THRESHOLD,
+                        help='Longitud de texto a partir de la cual se procesa en un hilo aparte.')
+    parser.add_argument('--workers', type=int, help='Número de hilos para los textos grandes.')
+    parser.add_argument('--cache-size', type=int, default=rc.DEFAULT_MAX_BYTES,
+                        help='Memoria máxima de la caché de resultados, en bytes (0 la desactiva).')
+    parser.add_argument('--cache-ttl', type=float, default=rc.DEFAULT_TTL,
+                        help='Segundos que un resultado permanece en la caché.')
+    args = parser.parse_args(argv)
+
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Escuchando en http://{address[0]}:{address[1]}", flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, ready, max_batch=args.max_batch,
+                          offload_threshold=args.offload_threshold, workers=args.workers,
+                          cache_size=args.cache_size, cache_ttl=args.cache_ttl))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
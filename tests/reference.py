@@ -0,0 +1,53 @@
+"""
+Letter-by-letter implementations of the ciphers, written from their definitions, that the vectorized
+code paths are compared against.
+"""
+LETTERS = "ABCDEFGHIJKLMNÑOPQRSTUVWXYZ"
+
+
+def shift(text, shifts, sign=1):
+    return ''.join(LETTERS[(LETTERS.index(char) + sign * shifts[position % len(shifts)]) % len(LETTERS)]
+                   for position, char in enumerate(text))
+
+
+def caesar(text, key, decrypt=False):
+    return shift(text, [key], -1 if decrypt else 1)
+
+
+def vigenere(text, key, decrypt=False):
+    return shift(text, [LETTERS.index(char) for char in key], -1 if decrypt else 1)
+
+
+def column_order(key):
+    # Stable: repeated key letters keep their order
+    return sorted(range(len(key)), key=lambda column: key[column])
+
+
+def transposition(text, key):
+    text = text.replace(' ', '')
+    columns = len(key)
+    rows = -(-len(text) // columns)
+    # The last row is completed by wrapping to the beginning of the text
+    grid = [text[(row * columns + column) % len(text)] for row in range(rows) for column in range(columns)]
+    return ' '.join(''.join(grid[row * columns + column] for row in range(rows)) for column in column_order(key))
+
+
+def untransposition(text, key):
+    text = text.replace(' ', '')
+    columns = len(key)
+    rows = len(text) // columns
+    written = {column: text[rank * rows:(rank + 1) * rows] for rank, column in enumerate(column_order(key))}
+    return ''.join(written[column][row] for row in range(rows) for column in range(columns))
+
+
+def hill(text, key, inverse=None):
+    size = int(len(key) ** 0.5)
+    matrix = inverse or [[LETTERS.index(key[row * size + column]) for column in range(size)] for row in range(size)]
+    blocks = -(-len(text) // size)
+    text = ''.join(text[position % len(text)] for position in range(blocks * size))
+    output = []
+    for start in range(0, len(text), size):
+        block = [LETTERS.index(char) for char in text[start:start + size]]
+        output.extend(LETTERS[sum(matrix[row][column] * block[column] for column in range(size)) % len(LETTERS)]
+                      for row in range(size))
+    return ''.join(output)
@@ -0,0 +1,36 @@
+import pytest
+from utils import alphabet as a
+
+
+def test_behaves_like_the_list_of_letters():
+    letters = list("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ")
+    assert len(a.SPANISH) == 27
+    assert list(a.SPANISH) == letters
+    assert a.SPANISH[14] == 'Ñ'
+    assert 'Ñ' in a.SPANISH and 'a' not in a.SPANISH
+    assert [a.SPANISH.index(char) for char in letters] == list(range(27))
+    with pytest.raises(ValueError):
+        a.SPANISH.index('a')
+
+
+def test_encode_and_decode():
+    text = "HOLAÑANDUZ"
+    indices = a.SPANISH.encode(text)
+    assert indices.tolist() == [a.SPANISH.index(char) for char in text]
+    assert a.SPANISH.decode(indices) == text
+    assert a.SPANISH.to_indices("HOLA!").tolist()[-1] == a.INVALID_INDEX
+    assert a.SPANISH.is_valid("HOLA") and not a.SPANISH.is_valid("HOLA MUNDO")
+    with pytest.raises(ValueError, match="'1' is not in list"):
+        a.SPANISH.encode("HOLA1")
+
+
+def test_alphabets_are_shared_and_immutable():
+    assert a.get_alphabet("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ") is a.SPANISH
+    with pytest.raises(AttributeError):
+        a.SPANISH.letters = "ABC"
+
+
+@pytest.mark.parametrize('letters', ['', 'AAB'])
+def test_invalid_alphabets(letters):
+    with pytest.raises(ValueError):
+        a.get_alphabet(letters)
@@ -0,0 +1,65 @@
+import random
+import pytest
+import reference as r
+from methods import buffers as b
+from methods import crypto_methods as cm
+from utils import codec  # Registers the 'spanish27' codec
+
+
+def random_text(length, seed=0):
+    return ''.join(random.Random(seed).choices(r.LETTERS, k=length))
+
+
+@pytest.mark.parametrize('method, key', [('caesar', 3), ('vigenere', 'LIMON'), ('hill', 'GYBNQKURP')])
+@pytest.mark.parametrize('length', [1, 9, 1000])
+def test_buffer_matches_text_functions(method, key, length):
+    text = random_text(length, length)
+    encrypted = bytes(b.encrypt_buffer(text.encode('spanish27'), key, method))
+    assert encrypted.decode('spanish27') == getattr(cm, f"{method}_cipher")(text, key)
+    assert b.decrypt_buffer(encrypted, key, method).decode('spanish27') == \
+        getattr(cm, f"{method}_decipher")(encrypted.decode('spanish27'), key)
+
+
+@pytest.mark.parametrize('length', [5, 12, 1000])
+def test_transposition_buffer_matches_text_functions(length):
+    text = random_text(length, length)
+    encrypted = b.encrypt_buffer(text.encode('spanish27'), 'LLAVE', 'transposition').decode('spanish27')
+    assert encrypted == cm.transposition_cipher(text, 'LLAVE').replace(' ', '')
+    assert b.decrypt_buffer(encrypted.encode('spanish27'), 'LLAVE', 'transposition').decode('spanish27') == \
+        cm.transposition_decipher(encrypted, 'LLAVE').replace(' ', '')
+
+
+@pytest.mark.parametrize('method, key', [('caesar', 3), ('vigenere', 'LIMON'), ('transposition', 'CLAVE'),
+                                         ('hill', 'HILL')])
+def test_in_place(method, key):
+    data = bytearray(random_text(100).encode('spanish27'))
+    expected = bytes(b.encrypt_buffer(bytes(data), key, method))
+    assert b.encrypt_buffer(data, key, method, out=data) is data
+    assert data == expected
+
+
+def test_offset_continues_key():
+    data = random_text(100).encode('spanish27')
+    whole = bytes(b.encrypt_buffer(data, 'LIMON'))
+    parts = bytes(b.encrypt_buffer(data[:37], 'LIMON')) + bytes(b.encrypt_buffer(data[37:], 'LIMON', offset=37))
+    assert parts == whole
+
+
+def test_invalid_buffers():
+    with pytest.raises(ValueError):
+        b.encrypt_buffer(bytes([0, 27]), 'LIMON')
+    with pytest.raises(ValueError):
+        b.encrypt_buffer(bytes(10), 'LIMON', out=bytearray(9))
+    with pytest.raises(TypeError):
+        b.encrypt_buffer(bytes(10), 'LIMON', out=bytes(10))
+
+
+@pytest.mark.parametrize('method, key', [('vigenere', 'LIMON'), ('hill', 'GYBNQKURP')])
+def test_cipher_file_matches_buffers(tmp_path, method, key):
+    data = random_text(1000).encode('spanish27')
+    source, encrypted, decrypted = tmp_path / 'a', tmp_path / 'b', tmp_path / 'c'
+    source.write_bytes(data)
+    b.cipher_file(source, encrypted, method, key, chunk_size=64)
+    assert encrypted.read_bytes() == bytes(b.encrypt_buffer(data, key, method))
+    b.cipher_file(encrypted, decrypted, method, key, decrypt=True, chunk_size=64)
+    assert decrypted.read_bytes()[:len(data)] == data
@@ -0,0 +1,65 @@
+import io
+import json
+import pytest
+import cli
+from methods import crypto_methods as cm
+
+TEXT = "HOLA MUNDO\nESTO ES UNA PRUEBA\r\nDE VARIAS LINEAS\n"
+LETTERS = "HOLAMUNDOESTOESUNAPRUEBADEVARIASLINEAS"
+
+
+def run_text(method, key, text, decrypt=False):
+    output = io.StringIO()
+    cli.process_text(io.StringIO(text), output, method, key, decrypt)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('method, key', [('caesar', 3), ('vigenere', 'LIMON'),
+                                         ('transposition', 'CLAVE'), ('hill', 'GYBNQKURP')])
+def test_process_text_removes_whitespace(method, key):
+    expected = cm.Cipher.compile(method, cli.parse_key(method, key)).encrypt(LETTERS)
+    assert run_text(method, key, TEXT) == expected + '\n'
+
+
+def test_process_text_multiline_hill_round_trip():
+    ciphertext = run_text('hill', 'GYBNQKURP', TEXT).strip()
+    assert run_text('hill', 'GYBNQKURP', ciphertext[:len(ciphertext) // 2] + '\n' + ciphertext[len(ciphertext) // 2:],
+                    decrypt=True).startswith(LETTERS)
+
+
+@pytest.mark.parametrize('key, expected', [(3, 3), ('3', 3), (' -4 ', -4), (5.0, 5)])
+def test_parse_caesar_key(key, expected):
+    assert cli.parse_key('caesar', key) == expected
+
+
+@pytest.mark.parametrize('key', [True, False, 3.7, '3.7', 'TRES'])
+def test_parse_caesar_key_rejects_non_integers(key):
+    with pytest.raises(ValueError):
+        cli.parse_key('caesar', key)
+
+
+def test_jsonl_reports_invalid_caesar_keys():
+    source = io.BytesIO(b'{"text": "HOLA", "key": 3.7}\n{"text": "HOLA", "key": true}\n{"text": "HOLA", "key": 3}\n')
+    output = io.StringIO()
+    assert cli.process_jsonl(source, output, 'caesar') == 2
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert 'error' in records[0] and 'error' in records[1]
+    assert records[2] == {'text': cm.caesar_cipher("HOLA", 3)}
+
+
+def test_lines_report_undecodable_records():
+    source = io.BytesIO(b'HOLA\n\xff\xfeMUNDO\r\nADIOS')
+    output, errors = io.StringIO(), io.StringIO()
+    assert cli.process_lines(source, output, 'vigenere', 'LIMON', errors=errors) == 1
+    assert output.getvalue().split('\n') == [cm.vigenere_cipher("HOLA", 'LIMON'), '',
+                                             cm.vigenere_cipher("ADIOS", 'LIMON'), '']
+    assert 'línea 2' in errors.getvalue()
+
+
+def test_jsonl_reports_undecodable_records():
+    source = io.BytesIO(b'\xff\n{"id": 1, "text": "HOLA"}\n')
+    output = io.StringIO()
+    assert cli.process_jsonl(source, output, 'caesar', 3) == 1
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert 'UTF-8' in records[0]['error']
+    assert records[1] == {'id': 1, 'text': cm.caesar_cipher("HOLA", 3)}
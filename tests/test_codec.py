@@ -0,0 +1,39 @@
+import codecs
+import io
+import pytest
+import reference as r
+from utils import codec  # Registers the 'spanish27' codec
+
+
+def test_round_trip():
+    data = r.LETTERS.encode('spanish27')
+    assert list(data) == list(range(27))
+    assert data.decode('spanish27') == r.LETTERS
+
+
+def test_strict_errors():
+    with pytest.raises(UnicodeEncodeError) as error:
+        "HOLA MUNDO".encode('spanish27')
+    assert error.value.start == 4
+    with pytest.raises(UnicodeDecodeError) as error:
+        bytes([0, 1, 27]).decode('spanish27')
+    assert error.value.start == 2
+
+
+def test_ignore_errors():
+    assert "HOLA MUNDO!".encode('spanish27', 'ignore').decode('spanish27') == "HOLAMUNDO"
+    assert bytes([7, 200, 14, 27]).decode('spanish27', 'ignore') == "HÑ"
+
+
+def test_unknown_error_handler():
+    with pytest.raises(ValueError):
+        "HOLA!".encode('spanish27', 'replace')
+
+
+def test_stream_round_trip():
+    stream = io.BytesIO()
+    writer = codecs.getwriter('spanish27')(stream)
+    writer.write("HOLA")
+    writer.write("MUNDO")
+    stream.seek(0)
+    assert codecs.getreader('spanish27')(stream).read() == "HOLAMUNDO"
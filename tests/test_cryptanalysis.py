@@ -0,0 +1,44 @@
+import pytest
+from methods import crypto_methods as cm
+from methods import cryptanalysis as ca
+from files import file_loader as f
+from utils import misc as m
+from utils import alphabet as a
+
+
+@pytest.fixture(scope='module')
+def plaintext():
+    with open(f.load_file('spanish_corpus', 'txt'), encoding='utf-8') as corpus:
+        text = m.remove_accents(corpus.read()).upper()
+    return ''.join(character for character in text if character in a.SPANISH.letters)
+
+
+@pytest.mark.parametrize('key', [0, 1, 13, 26])
+def test_crack_caesar_finds_key(plaintext, key):
+    candidates = ca.crack_caesar(cm.caesar_cipher(plaintext, key))
+    assert candidates[0].key == key
+    assert sorted(candidate.key for candidate in candidates) == list(range(27))
+    assert candidates[0].score <= candidates[1].score
+
+
+@pytest.mark.parametrize('key', ['LIMON', 'CLAVE', 'MURCIELAGO'])
+def test_crack_vigenere_finds_key(plaintext, key):
+    analysis = ca.crack_vigenere(cm.vigenere_cipher(plaintext, key), max_period=20)
+    assert analysis.key == key
+    assert analysis.key_length == len(key)
+    assert set(analysis.timings) == {'encode', 'autocorrelation', 'key_length', 'key'}
+
+
+def test_recover_vigenere_key_with_known_length(plaintext):
+    indices = a.SPANISH.to_indices(cm.vigenere_cipher(plaintext, 'ÑANDU'))
+    assert ca.recover_vigenere_key(indices, 5) == 'ÑANDU'
+
+
+@pytest.mark.parametrize('key', ['CLAVE', 'SECRETO'])
+def test_solve_transposition_deciphers_text(plaintext, key):
+    ciphertext = cm.transposition_cipher(plaintext, key)
+    improvements = []
+    solution = ca.solve_transposition(ciphertext, len(key), restarts=8, workers=2,
+                                      on_improvement=improvements.append)
+    assert cm.transposition_decipher(ciphertext, solution.key) == cm.transposition_decipher(ciphertext, key)
+    assert improvements[-1] == solution
@@ -0,0 +1,136 @@
+import random
+import numpy as np
+import pytest
+import reference as r
+from methods import crypto_methods as cm
+from utils import alphabet as a
+from utils import entry_validator as ev
+from utils import misc as m
+
+
+def random_text(length, seed=0):
+    generator = random.Random(seed)
+    return ''.join(generator.choices(r.LETTERS, k=length))
+
+
+@pytest.mark.parametrize('length', [0, 1, 26, 27, 1000])
+@pytest.mark.parametrize('key', [0, 3, 26, 27, -5, 1000])
+def test_caesar_matches_reference(length, key):
+    text = random_text(length, key)
+    assert cm.caesar_cipher(text, key) == r.caesar(text, key)
+    assert cm.caesar_decipher(text, key) == r.caesar(text, key, decrypt=True)
+
+
+@pytest.mark.parametrize('length', [0, 1, 5, 1000])
+@pytest.mark.parametrize('key', ['A', 'LIMON', 'ÑANDU', 'CLAVESXYZ'])
+def test_vigenere_matches_reference(length, key):
+    text = random_text(length, len(key))
+    assert cm.vigenere_cipher(text, key) == r.vigenere(text, key)
+    assert cm.vigenere_decipher(cm.vigenere_cipher(text, key), key) == text
+
+
+def test_encoded_input_matches_text():
+    text = random_text(100)
+    assert cm.vigenere_cipher(a.SPANISH.encode(text), 'LIMON') == cm.vigenere_cipher(text, 'LIMON')
+
+
+def test_invalid_characters():
+    assert isinstance(cm.caesar_cipher("HOLA1", 3), Exception)
+    with pytest.raises(ValueError):
+        cm.vigenere_cipher("hola", 'LIMON')
+
+
+@pytest.mark.parametrize('length', [1, 4, 5, 6, 97])
+@pytest.mark.parametrize('key', ['CLAVE', 'LLAVE', 'A', 'ZYXWVUTSRQ', 'AAAA'])
+def test_transposition_matches_reference(length, key):
+    text = random_text(length, length)
+    ciphertext = cm.transposition_cipher(text, key)
+    assert ciphertext == r.transposition(text, key)
+    # The deciphered text separates its letters with spaces and keeps the wrapped letters of the last row
+    assert cm.transposition_decipher(ciphertext, key).replace(' ', '') == r.untransposition(ciphertext, key)
+    assert r.untransposition(ciphertext, key).startswith(text)
+
+
+def test_transposition_decipher_rejects_partial_rows():
+    with pytest.raises(ValueError):
+        cm.transposition_decipher("HOLAM", 'LIMONES')
+
+
+@pytest.mark.parametrize('method, keys', [('caesar', [3, 0, 26, 100, -1]),
+                                          ('vigenere', ['LIMON', 'A', 'ÑANDU', 'LIMON', 'CLAVESXYZ']),
+                                          ('hill', ['GYBNQKURP', 'HILL', 'GYBNQKURP', 'B', 'HILL'])])
+def test_batch_matches_single_calls(method, keys):
+    texts = [random_text(length, length) for length in (0, 1, 7, 100, 1000)]
+    single = {'caesar': cm.caesar_cipher, 'vigenere': cm.vigenere_cipher, 'hill': cm.hill_cipher}[method]
+    encrypted = cm.encrypt_batch(texts, keys, method)
+    assert encrypted == [single(text, key) for text, key in zip(texts, keys)]
+    decrypted = cm.decrypt_batch(encrypted, keys, method)
+    assert [result[:len(text)] for result, text in zip(decrypted, texts)] == texts
+
+
+def test_batch_needs_one_key_per_text():
+    with pytest.raises(ValueError):
+        cm.encrypt_batch(["HOLA", "ADIOS"], ['LIMON'])
+
+
+@pytest.mark.parametrize('kind, key', [('caesar', 5), ('vigenere', 'LIMON'), ('transposition', 'LLAVE'),
+                                       ('hill', 'GYBNQKURP')])
+def test_compiled_cipher_matches_functions(kind, key):
+    text = random_text(60, 1)
+    cipher = cm.Cipher.compile(kind, key)
+    assert cm.Cipher.compile(kind, key) is cipher
+    encrypt = getattr(cm, f"{kind}_cipher")
+    decrypt = getattr(cm, f"{kind}_decipher")
+    assert cipher.encrypt(text) == encrypt(text, key)
+    assert cipher.decrypt(cipher.encrypt(text)) == decrypt(encrypt(text, key), key)
+
+
+def test_compiled_transposition_inverse_order():
+    cipher = cm.Cipher.compile('transposition', 'LLAVE')
+    assert cipher.order[cipher.inverse_order].tolist() == list(range(5))
+    assert cm.transposition_decipher_indices(10, cipher.order, cipher.inverse_order).tolist() == \
+        cm.transposition_decipher_indices(10, cipher.order).tolist()
+
+
+def test_compile_rejects_unknown_ciphers():
+    with pytest.raises(ValueError):
+        cm.Cipher.compile('enigma', 'LIMON')
+
+
+@pytest.mark.parametrize('key', ['HILL', 'GYBNQKURP', 'B'])
+@pytest.mark.parametrize('length', [1, 4, 9, 100])
+def test_hill_matches_reference(key, length):
+    text = random_text(length, length)
+    encrypted = cm.hill_cipher(text, key)
+    assert encrypted == r.hill(text, key)
+    assert cm.hill_decipher(encrypted, key) == m.fill_text(text, len(encrypted))
+
+
+def test_hill_inverse_matrix():
+    matrix = cm.hill_key_matrix('GYBNQKURP')
+    inverse = cm.modular_matrix_inverse(matrix, 27)
+    assert ((inverse @ matrix) % 27).tolist() == np.identity(3, dtype=int).tolist()
+    text = random_text(90)
+    assert r.hill(r.hill(text, 'GYBNQKURP'), 'GYBNQKURP', inverse.tolist()) == text
+
+
+@pytest.mark.parametrize('key', ['DDCF', 'AAAA', 'HOLAS', ''])
+def test_hill_rejects_invalid_keys(key):
+    with pytest.raises(ValueError):
+        cm.hill_cipher("HOLAMUNDO", key)
+
+
+def test_hill_decipher_rejects_partial_blocks():
+    with pytest.raises(ValueError):
+        cm.hill_decipher("HOLAM", 'HILL')
+
+
+@pytest.mark.parametrize('key, error', [('gybn qkurp', None), ('DDCF', ev.NonInvertibleKeyError),
+                                        ('HOLAS', ev.InvalidKeyError), ('H1LL', ev.NotInAlphabetError),
+                                        (' ', ev.BlankInputError)])
+def test_validate_hill_key(key, error):
+    result = ev.validate_hill_key(key)
+    if error is None:
+        assert result == 'GYBNQKURP'
+    else:
+        assert isinstance(result, error)
@@ -0,0 +1,19 @@
+import pytest
+from utils import alphabet as a
+from utils import entry_validator as ev
+
+
+@pytest.mark.parametrize('text', ["hola mundo", "Ñandu", "ABC XYZ", "a"])
+def test_encode_input_matches_alphabet(text):
+    expected = a.SPANISH.to_indices(text.upper().replace(' ', ''))
+    assert ev.encode_input(text).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('text, error', [("", ev.BlankInputError), ("   ", ev.BlankInputError),
+                                         ("123", ev.NumericStringError), ("HOLA!", ev.NotInAlphabetError)])
+def test_encode_input_returns_errors(text, error):
+    assert isinstance(ev.encode_input(text), error)
+
+
+def test_encode_input_reports_first_invalid_position():
+    assert ev.encode_input("HO LA1 2").position == 5
@@ -0,0 +1,51 @@
+import pytest
+from methods import crypto_methods as cm
+from methods.pipeline import Pipeline
+from utils import instrumentation as i
+from utils import misc as m
+
+
+@pytest.fixture
+def instrumentation():
+    i.reset()
+    i.enable()
+    yield
+    i.disable()
+    i.reset()
+
+
+def test_methods_record_their_text(instrumentation):
+    cm.Cipher.compile('vigenere', 'LIMON').encrypt("HOLAMUNDO")
+    Pipeline([('caesar', 3)]).encrypt(text="HOLAMUNDOHOLA")
+    stats = i.snapshot()
+    assert stats['methods.crypto_methods.Cipher.encrypt']['bytes'] == 9
+    assert stats['methods.pipeline.Pipeline.encrypt']['bytes'] == 13
+
+
+def test_the_named_argument_is_measured(instrumentation):
+    m.fill_text("HOLA", 12)
+    assert i.snapshot()['utils.misc.fill_text']['bytes'] == 4
+
+
+def test_returned_errors_are_counted(instrumentation):
+    assert isinstance(cm.caesar_cipher("HOLA", 'TRES'), Exception)
+    cm.caesar_cipher("HOLA", 3)
+    stats = i.snapshot()['methods.crypto_methods.caesar_cipher']
+    assert (stats['calls'], stats['errors']) == (2, 1)
+
+
+def test_profiled_call_is_recorded(instrumentation, tmp_path):
+    i.capture_next_call(cm.vigenere_cipher, str(tmp_path / 'perfil.prof'))
+    assert cm.vigenere_cipher("HOLAMUNDO", 'LIMON') == cm.vigenere_cipher("HOLAMUNDO", 'LIMON')
+    assert (tmp_path / 'perfil.prof').exists()
+    assert i.snapshot()['methods.crypto_methods.vigenere_cipher']['bytes'] == 18
+
+
+def test_unknown_data_argument():
+    with pytest.raises(ValueError):
+        i.instrument(data='texto')(lambda text: text)
+
+
+def test_helpers_are_not_instrumented(instrumentation):
+    m.codepoints_to_text(m.text_to_codepoints("HOLA"))
+    assert i.snapshot() == {}
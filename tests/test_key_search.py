@@ -0,0 +1,92 @@
+import threading
+from multiprocessing.connection import Client
+import pytest
+from methods import crypto_methods as cm
+from methods import key_search as ks
+
+PLAINTEXT = ("ENUNLUGARDELAMANCHADECUYONOMBRENOQUIEROACORDARMENOHACEMUCHOTIEMPOQUEVIVIAUNHIDALGO"
+             "DELOSDELANZAENASTILLEROADARGAANTIGUAROCINFLACOYGALGOCORREDOR")
+KEY = 'SOL'
+AUTHKEY = b'test'
+
+
+@pytest.fixture
+def search():
+    return ks.KeySearch(cm.vigenere_cipher(PLAINTEXT, KEY), max_length=5, top=3)
+
+
+def run_socket(search, progress, workers):
+    """Runs search_socket in a thread, starting every worker function once the listener is ready."""
+    result = {}
+
+    def ready(address):
+        for worker in workers:
+            threading.Thread(target=worker, args=(address,), daemon=True).start()
+
+    thread = threading.Thread(target=lambda: result.setdefault('best', ks.search_socket(
+        search, progress, ('127.0.0.1', 0), AUTHKEY, ready=ready)), daemon=True)
+    thread.start()
+    thread.join(timeout=120)
+    assert not thread.is_alive(), "The coordinator did not finish"
+    return result['best']
+
+
+def test_every_shard_finds_the_key(search):
+    progress = ks.Progress(search)
+    for shard_id in progress.pending():
+        progress.record(shard_id, search.search_shard(shard_id))
+    assert progress.best[0].key == KEY
+    assert search.decipher_prefix(KEY) == PLAINTEXT[:len(search.decipher_prefix(KEY))]
+
+
+def test_pool_matches_serial_search(search):
+    serial = ks.Progress(search)
+    for shard_id in serial.pending():
+        serial.record(shard_id, search.search_shard(shard_id))
+    assert ks.search_pool(search, ks.Progress(search), workers=2) == serial.best
+
+
+def test_checkpoint_resume(search, tmp_path):
+    path = str(tmp_path / 'busqueda.json')
+    progress = ks.Progress(search, path)
+    shards = progress.pending()
+    for shard_id in shards[:len(shards) // 2]:
+        progress.record(shard_id, search.search_shard(shard_id))
+    progress.save()
+
+    resumed = ks.Progress(search, path)
+    assert resumed.finished == len(shards) // 2
+    assert resumed.pending() == shards[len(shards) // 2:]
+    for shard_id in resumed.pending():
+        resumed.record(shard_id, search.search_shard(shard_id))
+    assert resumed.best[0].key == KEY
+
+    other = ks.KeySearch(cm.vigenere_cipher(PLAINTEXT, 'LUZ'), max_length=5)
+    with pytest.raises(ValueError):
+        ks.Progress(other, path)
+
+
+def test_socket_workers(search):
+    best = run_socket(search, ks.Progress(search), [lambda address: ks.run_worker(address, AUTHKEY)] * 2)
+    assert best[0].key == KEY
+
+
+def test_worker_killed_mid_shard_is_recovered(search):
+    taken = []
+
+    def dying_worker(address):
+        # Takes a shard and disconnects without answering, as a killed worker does
+        with Client(address, authkey=AUTHKEY) as connection:
+            connection.recv()
+            taken.append(connection.recv())
+
+    progress = ks.Progress(search)
+    best = run_socket(search, progress, [dying_worker])
+    assert taken == [0]
+    assert progress.finished == len(search)
+    assert best[0].key == KEY
+
+
+def test_remote_listener_requires_a_key(search):
+    with pytest.raises(ValueError):
+        ks.search_socket(search, ks.Progress(search), ('0.0.0.0', 0))
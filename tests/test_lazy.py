@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import pytest
+from utils import lazy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the loaded submodules of NumPy (none while it is still lazy) and whether tkinter was imported
+CHECK = """
+import sys
+import {module}
+print(sum(name.startswith('numpy.') for name in sys.modules), 'tkinter' in sys.modules)
+"""
+
+
+@pytest.mark.parametrize('module', ['cli', 'main', 'methods.crypto_methods', 'methods.cryptanalysis'])
+def test_import_does_not_load_numpy(module):
+    output = subprocess.run([sys.executable, '-c', CHECK.format(module=module)], capture_output=True,
+                            text=True, check=True, cwd=ROOT).stdout.split()
+    assert output == ['0', 'False']
+
+
+def test_lazy_import():
+    assert lazy.lazy_import('json').dumps([1]) == '[1]'
+    with pytest.raises(ModuleNotFoundError):
+        lazy.lazy_import('not_a_module_name')
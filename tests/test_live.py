@@ -0,0 +1,67 @@
+import random
+import pytest
+import reference as r
+from gui import live as l
+from methods import crypto_methods as cm
+from utils import entry_validator as e
+
+
+def apply(output, patch):
+    if patch.end is None:
+        return patch.text
+    return output[:patch.start] + patch.text + output[patch.end:]
+
+
+def random_edits(seed, count=200):
+    """Yields the text after each random insertion, deletion or replacement."""
+    generator = random.Random(seed)
+    text = "HOLA MUNDO"
+    for _ in range(count):
+        start = generator.randrange(len(text) + 1)
+        end = min(len(text), start + generator.randrange(4))
+        inserted = ''.join(generator.choices(r.LETTERS.lower() + ' ', k=generator.randrange(6)))
+        candidate = text[:start] + inserted + text[end:]
+        if candidate.replace(' ', ''):
+            text = candidate
+            yield text
+
+
+@pytest.mark.parametrize('method, key', [('caesar', 3), ('vigenere', 'LIMON'), ('vigenere', 'A'),
+                                         ('transposition', 'CLAVE')])
+@pytest.mark.parametrize('decrypt', [False, True])
+def test_patches_match_full_recomputation(method, key, decrypt):
+    function = getattr(cm, f"{method}_{'decipher' if decrypt else 'cipher'}")
+    cipher = l.LiveCipher(method, function, decrypt=decrypt)
+    output, partial = '', 0
+    for text in random_edits(len(str(key)) + decrypt):
+        if method == 'transposition' and decrypt and len(text.replace(' ', '')) % len(key):
+            continue
+        patch = cipher.update(text, key)
+        partial += patch.end is not None
+        output = apply(output, patch)
+        assert output == function(text.upper().replace(' ', ''), key)
+    assert bool(partial) == cipher.incremental
+
+
+def test_key_change_recomputes():
+    cipher = l.LiveCipher('vigenere', cm.vigenere_cipher)
+    cipher.update("HOLA", 'LIMON')
+    assert cipher.update("HOLA", 'CLAVE') == l.Patch(0, None, cm.vigenere_cipher("HOLA", 'CLAVE'))
+
+
+def test_invalid_text_is_reported():
+    cipher = l.LiveCipher('caesar', cm.caesar_cipher)
+    cipher.update("HOLA", 3)
+    assert isinstance(cipher.update("HOLA1", 3), e.NotInAlphabetError)
+    assert cipher.update("HOLAS", 3) == l.Patch(0, None, cm.caesar_cipher("HOLAS", 3))
+
+
+@pytest.mark.parametrize('first, second', [("", ""), ("HOLA", "HOLA"), ("HOLA", "HOJA"), ("ABC", "XYZ"),
+                                           ("HOLA", "HOLAS"), ("AAAA", "AAA")])
+def test_common_prefix_and_suffix(first, second):
+    prefix = next((i for i, (x, y) in enumerate(zip(first, second)) if x != y), min(len(first), len(second)))
+    assert l.common_prefix_length(first, second) == prefix
+    limit = min(len(first), len(second)) - prefix
+    suffix = next((i for i, (x, y) in enumerate(zip(first[::-1], second[::-1])) if x != y),
+                  min(len(first), len(second)))
+    assert l.common_suffix_length(first, second, limit) == min(suffix, limit)
@@ -0,0 +1,65 @@
+import itertools
+import random
+import numpy as np
+import pytest
+import reference as r
+from utils import misc as m
+
+
+def random_text(length, seed=0):
+    return ''.join(random.Random(seed).choices(r.LETTERS + ' ', k=length))
+
+
+@pytest.mark.parametrize('length', [1, 4, 5, 37])
+@pytest.mark.parametrize('columns', [1, 3, 5])
+def test_split_sentence_into_columns_matches_lists(length, columns):
+    sentence = random_text(length, length * columns)
+    letters = np.array(list(sentence.replace(' ', '')))
+    if not letters.size:
+        return
+    rows = -(-len(letters) // columns)
+    expected = np.pad(letters, (0, rows * columns - len(letters)), mode='wrap').reshape(rows, columns)
+    assert m.split_sentence_into_columns(sentence, columns).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('words', [['HOLA', 'MUND', 'OÑAS'], ['ÑANDU'], ['', '']])
+def test_lists_to_columns_and_back(words):
+    columns = m.lists_to_columns(words)
+    assert columns.tolist() == np.array([list(word) for word in words]).T.tolist()
+    if columns.size:
+        assert m.columns_to_words(columns) == words
+
+
+def test_lists_to_columns_rejects_ragged_rows():
+    with pytest.raises(ValueError):
+        m.lists_to_columns(['AB', 'C'])
+
+
+def test_columns_to_words_skips_empty_cells():
+    grid = np.array([['H', 'O'], ['', 'L'], ['A', '']])
+    assert m.columns_to_words(grid) == ['HA', 'OL']
+
+
+@pytest.mark.parametrize('length', [0, 3, 4, 11])
+def test_fill_text(length):
+    assert m.fill_text("HOLA", length) == ''.join(itertools.islice(itertools.cycle("HOLA"), length))
+    assert m.fill_text(np.arange(4), length).tolist() == list(itertools.islice(itertools.cycle(range(4)), length))
+
+
+def test_codepoints_round_trip():
+    text = "ÑANDÚ hola 😀"
+    assert m.codepoints_to_text(m.text_to_codepoints(text)) == text
+
+
+def test_remove_accents_keeps_enye():
+    assert m.remove_accents("Canción Ñandú pingüino") == "CANCION ÑANDU PINGUINO"
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 5])
+def test_integer_determinant(size):
+    generator = np.random.default_rng(size)
+    for _ in range(20):
+        matrix = generator.integers(-30, 30, (size, size))
+        assert m.integer_determinant(matrix) == (round(np.linalg.det(matrix)) if size else 1)
+    assert m.integer_determinant([[0, 1], [1, 0]]) == -1
+    assert m.integer_determinant([[2, 4], [1, 2]]) == 0
@@ -0,0 +1,36 @@
+import random
+import pytest
+import reference as r
+from methods import buffers as b
+from methods import out_of_core as ooc
+
+
+@pytest.mark.parametrize('key', ['CLAVE', 'LLAVE', 'A'])
+@pytest.mark.parametrize('length, block_size', [(1, 8), (999, 7), (1000, 64), (1000, 1 << 20)])
+def test_file_matches_buffers(tmp_path, key, length, block_size):
+    data = bytes(random.Random(length).choices(range(len(r.LETTERS)), k=length))
+    source, encrypted, decrypted = tmp_path / 'a', tmp_path / 'b', tmp_path / 'c'
+    source.write_bytes(data)
+
+    written = ooc.transposition_cipher_file(source, encrypted, key, block_size=block_size)
+    expected = bytes(b.encrypt_buffer(data, key, 'transposition'))
+    assert encrypted.read_bytes() == expected
+    assert written == len(expected)
+
+    ooc.transposition_decipher_file(encrypted, decrypted, key, block_size=block_size)
+    assert decrypted.read_bytes() == bytes(b.decrypt_buffer(expected, key, 'transposition'))
+    assert decrypted.read_bytes()[:length] == data
+
+
+def test_empty_file(tmp_path):
+    source, destination = tmp_path / 'a', tmp_path / 'b'
+    source.write_bytes(b'')
+    assert ooc.transposition_cipher_file(source, destination, 'CLAVE') == 0
+    assert destination.read_bytes() == b''
+
+
+def test_decipher_rejects_partial_rows(tmp_path):
+    source = tmp_path / 'a'
+    source.write_bytes(bytes(7))
+    with pytest.raises(ValueError):
+        ooc.transposition_decipher_file(source, tmp_path / 'b', 'CLAVE')
@@ -0,0 +1,28 @@
+import random
+import pytest
+import reference as r
+from methods import crypto_methods as cm
+from methods import parallel as p
+
+
+@pytest.fixture(autouse=True)
+def always_parallel(monkeypatch):
+    # Small texts are processed in the calling process unless the threshold is lowered
+    monkeypatch.setattr(p, 'PARALLEL_THRESHOLD', 0)
+    monkeypatch.setattr(p, 'BLOCK_SIZE', 64)
+
+
+@pytest.mark.parametrize('method, key', [('caesar', 7), ('vigenere', 'LIMON'), ('transposition', 'LLAVE')])
+@pytest.mark.parametrize('length', [1, 999, 5000])
+def test_parallel_matches_serial(method, key, length):
+    text = ''.join(random.Random(length).choices(r.LETTERS, k=length))
+    serial_encrypt = getattr(cm, f"{method}_cipher")
+    serial_decrypt = getattr(cm, f"{method}_decipher")
+    encrypted = p.encrypt_parallel(text, key, method, workers=3)
+    assert encrypted == serial_encrypt(text, key)
+    assert p.decrypt_parallel(encrypted, key, method, workers=3) == serial_decrypt(encrypted, key)
+
+
+def test_invalid_characters_are_reported():
+    with pytest.raises(ValueError):
+        p.encrypt_parallel("HOLA1" * 100, 'LIMON', 'vigenere', workers=2)
@@ -0,0 +1,47 @@
+import random
+import pytest
+from methods import crypto_methods as cm
+from methods import pipeline as p
+from utils import alphabet as a
+
+STAGES = [('vigenere', 'LIMON'), ('transposition', 'CLAVE'), ('caesar', 3)]
+
+
+def chained(stages, text):
+    """Applies the stages one after the other with the reference functions."""
+    functions = {
+        ('transposition', False): cm.transposition_cipher, ('transposition', True): cm.transposition_decipher,
+        ('caesar', False): cm.caesar_cipher, ('caesar', True): cm.caesar_decipher,
+        ('vigenere', False): cm.vigenere_cipher, ('vigenere', True): cm.vigenere_decipher,
+    }
+    for kind, key, *decrypt in stages:
+        text = functions[kind, bool(decrypt and decrypt[0])](text, key).replace(' ', '')
+    return text
+
+
+@pytest.mark.parametrize('length', [1, 5, 20, 97, 1000])
+def test_pipeline_matches_chained_ciphers(length):
+    random.seed(length)
+    text = ''.join(random.choices(a.SPANISH.letters, k=length))
+    assert p.Pipeline(STAGES).encrypt(text) == chained(STAGES, text)
+
+
+def test_pipeline_round_trip():
+    text = "HOLAMUNDOESTOESUNAPRUEBA"
+    pipeline = p.Pipeline(STAGES)
+    assert pipeline.decrypt(pipeline.encrypt(text)).startswith(text)
+
+
+def test_long_plans_are_not_cached(monkeypatch):
+    monkeypatch.setattr(p, 'PLAN_CACHE_MAX_LENGTH', 10)
+    p._cached_plan.cache_clear()
+    pipeline = p.Pipeline(STAGES)
+    assert pipeline.encrypt("HOLAMUNDOHOLAMUNDO") == chained(STAGES, "HOLAMUNDOHOLAMUNDO")
+    assert p._cached_plan.cache_info().currsize == 0
+    pipeline.encrypt("HOLA")
+    assert p._cached_plan.cache_info().currsize == 1
+
+
+def test_invalid_stage():
+    with pytest.raises(ValueError):
+        p.Pipeline([('hill', 'GYBNQKURP')])
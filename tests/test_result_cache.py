@@ -0,0 +1,58 @@
+import threading
+from methods import crypto_methods as cm
+from methods import result_cache as rc
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cached_cipher_matches_reference_and_stores_inverse():
+    cache = rc.ResultCache()
+    result = rc.cached_cipher('vigenere', "HOLAMUNDO", 'LIMON', cache=cache)
+    assert result == cm.vigenere_cipher("HOLAMUNDO", 'LIMON')
+    assert rc.cached_cipher('vigenere', result, 'LIMON', decrypt=True, cache=cache) == "HOLAMUNDO"
+    assert cache.stats()['hits'] == 1
+
+
+def test_entries_expire():
+    clock = Clock()
+    cache = rc.ResultCache(ttl=10, clock=clock)
+    cache.put('caesar', 3, "HOLA", "KRÑD")
+    clock.now = 11
+    assert cache.get('caesar', 3, "HOLA") is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = rc.ResultCache(max_bytes=3 * (rc.ENTRY_OVERHEAD + 60), ttl=None)
+    for number in range(10):
+        cache.put('transposition', 'CLAVE', f"TEXTO{number}", "X" * 8)
+    assert cache.stats()['bytes'] <= cache.max_bytes
+    assert cache.get('transposition', 'CLAVE', "TEXTO9") == "X" * 8
+    assert cache.get('transposition', 'CLAVE', "TEXTO0") is None
+
+
+def test_stats_are_consistent_under_concurrent_lookups():
+    cache = rc.ResultCache()
+    cache.put('caesar', 3, "HOLA", "KRÑD")
+
+    def lookups():
+        for _ in range(2000):
+            cache.get('caesar', 3, "HOLA")
+            cache.get('caesar', 3, "ADIOS")
+
+    threads = [threading.Thread(target=lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(200):
+        stats = cache.stats()
+        assert stats['hit_ratio'] == (stats['hits'] / (stats['hits'] + stats['misses'])
+                                      if stats['hits'] + stats['misses'] else 0.0)
+    for thread in threads:
+        thread.join()
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 8000
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import service
+from benchmarks import load_generator as lg
+from methods import crypto_methods as cm
+
+
+def with_server(client, **options):
+    """Starts the service on a free port, runs client(host, port) and stops the service."""
+    async def main():
+        cipher_service = service.CipherService(**options)
+        await cipher_service.start()
+        server = await asyncio.start_server(cipher_service.handle_connection, '127.0.0.1', 0)
+        try:
+            return await client(*server.sockets[0].getsockname()[:2])
+        finally:
+            server.close()
+            await server.wait_closed()
+            await cipher_service.stop()
+    return asyncio.run(main())
+
+
+async def raw_request(host, port, data: bytes):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(data)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        return status, await reader.read()
+    finally:
+        writer.close()
+
+
+def test_concurrent_requests_match_the_ciphers():
+    texts = [f"HOLAMUNDO{'X' * count}" for count in range(50)]
+
+    async def client(host, port):
+        async def one(text, method, key):
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                body = json.dumps({'method': method, 'key': key, 'text': text}).encode('utf-8')
+                return await lg.request(reader, writer, 'POST', '/encrypt', body)
+            finally:
+                writer.close()
+        return await asyncio.gather(*(one(text, 'vigenere', 'LIMON') for text in texts),
+                                    one("HOLAMUNDO", 'hill', 'GYBNQKURP'))
+
+    responses = with_server(client, cache_size=0)
+    assert all(status == 200 for status, _ in responses)
+    results = [json.loads(body)['text'] for _, body in responses]
+    assert results[:-1] == [cm.vigenere_cipher(text, 'LIMON') for text in texts]
+    assert results[-1] == cm.hill_cipher("HOLAMUNDO", 'GYBNQKURP')
+
+
+def test_batches_are_bounded_by_characters():
+    cipher_service = service.CipherService(offload_threshold=100, cache_size=0)
+
+    async def main():
+        await cipher_service.start()
+        try:
+            texts = ['A' * 60] * 10
+            results = await asyncio.gather(*(cipher_service.submit('caesar', 3, text) for text in texts))
+        finally:
+            await cipher_service.stop()
+        return results
+
+    assert asyncio.run(main()) == ['D' * 60] * 10
+    assert cipher_service.max_batch_size == 1
+
+
+def test_oversized_lines_are_answered_with_an_error():
+    async def client(host, port):
+        long_header = b"POST /encrypt HTTP/1.1\r\nX-Relleno: " + b"A" * (1 << 17) + b"\r\n\r\n"
+        long_request_line = b"GET /" + b"A" * (1 << 17) + b" HTTP/1.1\r\n\r\n"
+        negative_length = b"POST /encrypt HTTP/1.1\r\nContent-Length: -1\r\n\r\n"
+        return [await raw_request(host, port, data) for data in (long_header, long_request_line, negative_length)]
+
+    assert [status for status, _ in with_server(client)] == [431, 414, 400]
+
+
+def test_stats_report_the_cache():
+    async def client(host, port):
+        body = json.dumps({'method': 'caesar', 'key': 3, 'text': "HOLA"}).encode('utf-8')
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in range(3):
+                await lg.request(reader, writer, 'POST', '/encrypt', body)
+            return await lg.request(reader, writer, 'GET', '/stats')
+        finally:
+            writer.close()
+
+    status, body = with_server(client)
+    assert status == 200
+    assert json.loads(body)['cache']['hits'] == 2
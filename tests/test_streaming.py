@@ -0,0 +1,47 @@
+import io
+import random
+import pytest
+from methods import crypto_methods as cm
+from methods import streaming as st
+from utils import alphabet as a
+
+
+def stream(text, method, key, **options):
+    output = io.StringIO()
+    st.process_stream(io.StringIO(text), output, method, key, **options)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 20])
+@pytest.mark.parametrize('method, key, function', [('caesar', 3, cm.caesar_cipher),
+                                                   ('vigenere', 'LIMON', cm.vigenere_cipher)])
+def test_chunks_match_the_whole_text(chunk_size, method, key, function):
+    random.seed(chunk_size)
+    text = ''.join(random.choices(a.SPANISH.letters, k=1000))
+    assert stream(text, method, key, chunk_size=chunk_size) == function(text, key)
+    assert stream(function(text, key), method, key, decrypt=True, chunk_size=chunk_size) == text
+
+
+def test_strip_removes_whitespace():
+    assert stream("hola mundo\nhola\r\n", 'vigenere', 'LIMON', chunk_size=3, upper=True, strip=True) == \
+        cm.vigenere_cipher("HOLAMUNDOHOLA", 'LIMON')
+
+
+def test_passthrough_keeps_other_characters():
+    result = stream("HOLA, MUNDO!\n", 'vigenere', 'LIMON', chunk_size=4, passthrough=True, strip=True)
+    letters = cm.vigenere_cipher("HOLAMUNDO", 'LIMON')
+    assert result == f"{letters[:4]}, {letters[4:]}!\n"
+
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        stream("HOLA", 'caesar', 3, chunk_size=0)
+
+
+def test_main_delegates_to_the_cli(tmp_path, capsys):
+    source = tmp_path / 'entrada.txt'
+    source.write_text("HOLA MUNDO\n", encoding='utf-8')
+    assert st.main(['encrypt', 'caesar', '3', '-i', str(source)]) == 0
+    assert capsys.readouterr().out == cm.caesar_cipher("HOLAMUNDO", 3) + '\n'
+    with pytest.raises(SystemExit):
+        st.main(['encrypt', 'caesar', '3', '--chunk-size', '0'])
@@ -0,0 +1,204 @@
+from functools import lru_cache
+from types import MappingProxyType
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Alphabet position used in lookup tables for characters outside the alphabet
+INVALID_INDEX = 255
+
+
+class Alphabet:
+    """
+    Immutable alphabet with precomputed tables to convert between characters and positions.
+
+    Every table is built once, so membership tests and lookups are O(1) and whole texts can be
+    converted with a single NumPy gather. The NumPy tables (codepoints and lookup) are built on
+    first use, so creating the predefined alphabets does not load NumPy.
+    Instances behave like the list returned by the former create_spanish_alphabet(),
+    supporting len(), iteration, indexing, 'in' and index().
+    """
+
+    __slots__ = ('letters', 'char_to_index', 'index_to_char',
+                 'translation_table', 'codepoints', 'lookup')
+
+    def __init__(self, letters: str):
+        """
+        Builds the lookup tables for the given letters.
+
+        Parameters:
+        letters (str): The letters of the alphabet, in order. Each letter must appear only once.
+
+        Raises:
+        ValueError: If the alphabet is empty, repeats a letter or has more than 255 letters.
+        """
+        if not letters:
+            raise ValueError("The alphabet must contain at least one letter.")
+        if len(set(letters)) != len(letters):
+            raise ValueError("The alphabet must not repeat letters.")
+        if len(letters) >= INVALID_INDEX:
+            raise ValueError("The alphabet must have fewer than 255 letters.")
+
+        object.__setattr__(self, 'letters', letters)
+        object.__setattr__(self, 'char_to_index', MappingProxyType(
+            {char: index for index, char in enumerate(letters)}))
+        object.__setattr__(self, 'index_to_char', tuple(letters))
+        # Table for str.translate mapping each letter to the character whose code is its position
+        object.__setattr__(self, 'translation_table', MappingProxyType(
+            {ord(char): index for index, char in enumerate(letters)}))
+
+    def __getattr__(self, name):
+        # Only called while a slot is unset: the NumPy tables are built on their first access
+        if name not in ('codepoints', 'lookup'):
+            raise AttributeError(f"'Alphabet' object has no attribute '{name}'")
+
+        # Unicode code point of every letter, indexed by its position in the alphabet
+        codepoints = np.frombuffer(self.letters.encode('utf-32-le'), dtype=np.uint32)
+
+        # Lookup table from code point to alphabet position; the last entry is always invalid
+        lookup = np.full(int(codepoints.max()) + 2, INVALID_INDEX, dtype=np.uint8)
+        lookup[codepoints] = np.arange(len(self.letters), dtype=np.uint8)
+        lookup.flags.writeable = False
+
+        object.__setattr__(self, 'codepoints', codepoints)
+        object.__setattr__(self, 'lookup', lookup)
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Alphabet objects are immutable.")
+
+    def __len__(self):
+        return len(self.letters)
+
+    def __iter__(self):
+        return iter(self.letters)
+
+    def __getitem__(self, index):
+        return self.index_to_char[index]
+
+    def __contains__(self, char):
+        return char in self.char_to_index
+
+    def __eq__(self, other):
+        return isinstance(other, Alphabet) and self.letters == other.letters
+
+    def __hash__(self):
+        return hash(self.letters)
+
+    def __repr__(self):
+        return f"Alphabet({self.letters!r})"
+
+    def index(self, char: str) -> int:
+        """
+        Returns the position of a character in the alphabet.
+
+        Parameters:
+        char (str): The character to look up.
+
+        Returns:
+        int: The position of the character.
+
+        Raises:
+        ValueError: If the character is not in the alphabet.
+        """
+        try:
+            return self.char_to_index[char]
+        except KeyError:
+            raise ValueError(f"'{char}' is not in list") from None
+
+    def to_indices(self, text: str):
+        """
+        Converts a text into the alphabet position of each character, marking any character
+        outside the alphabet with INVALID_INDEX instead of raising.
+
+        Parameters:
+        text (str): The text to be converted.
+
+        Returns:
+        np.ndarray: A uint8 array with the alphabet position of each character.
+        """
+        # Decode the text as an array of code points without creating per-character strings
+        return self.lookup_codepoints(np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32))
+
+    def lookup_codepoints(self, codepoints):
+        """
+        Converts an array of Unicode code points into alphabet positions, marking code points
+        outside the alphabet with INVALID_INDEX.
+
+        Parameters:
+        codepoints (np.ndarray): An array of code points.
+
+        Returns:
+        np.ndarray: A uint8 array with the alphabet position of each code point.
+        """
+        # Code points beyond the table are clipped onto its last entry, which is always invalid
+        return self.lookup[np.minimum(codepoints, len(self.lookup) - 1)]
+
+    def encode(self, text: str):
+        """
+        Converts a text into the alphabet position of each character.
+
+        Parameters:
+        text (str): The text to be converted. It must only contain letters of the alphabet.
+
+        Returns:
+        np.ndarray: A uint8 array with the alphabet position of each character.
+
+        Raises:
+        ValueError: If the text contains a character outside the alphabet.
+        """
+        indices = self.to_indices(text)
+
+        invalid = np.flatnonzero(indices == INVALID_INDEX)
+        if invalid.size:
+            raise ValueError(f"'{text[invalid[0]]}' is not in list")
+        return indices
+
+    def decode(self, indices) -> str:
+        """
+        Converts an array of alphabet positions back into text with a single gather.
+
+        Parameters:
+        indices (np.ndarray): An integer array with values between 0 and len(alphabet) - 1.
+
+        Returns:
+        str: The text formed by the letters at the given positions.
+        """
+        # The gathered code points are decoded from the array's memory, without an intermediate bytes copy
+        return str(self.codepoints[indices].data, 'utf-32-le')
+
+    def is_valid(self, text: str) -> bool:
+        """
+        Checks whether every character of the text belongs to the alphabet.
+
+        Parameters:
+        text (str): The text to check.
+
+        Returns:
+        bool: True if all characters are letters of the alphabet.
+        """
+        return not (self.to_indices(text) == INVALID_INDEX).any()
+
+
+@lru_cache(maxsize=None)
+def get_alphabet(letters: str) -> Alphabet:
+    """
+    Returns the shared Alphabet instance for the given letters, building it only on the first call.
+
+    Parameters:
+    letters (str): The letters of the alphabet, in order.
+
+    Returns:
+    Alphabet: The cached alphabet.
+    """
+    return Alphabet(letters)
+
+
+# Uppercase Spanish alphabet, including the letter 'Ñ'.
+SPANISH = get_alphabet("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ")
+
+# Plain 26-letter English alphabet.
+LATIN = get_alphabet("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# English letters followed by the decimal digits.
+ALPHANUMERIC = get_alphabet("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")
@@ -0,0 +1,117 @@
+import codecs
+from utils import alphabet as a
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
+
+# Name of the codec that stores every letter of the Spanish alphabet as its position, one byte each
+CODEC_NAME = 'spanish27'
+
+# Error handlers supported by the codec
+ERROR_HANDLERS = ('strict', 'ignore')
+
+
+def encode(text: str, errors: str = 'strict', alphabet: a.Alphabet = a.SPANISH):
+    """
+    Encodes a text as one byte per letter, holding the position of the letter in the alphabet
+    (0 to 26 for the Spanish alphabet), with a single lookup over the whole text.
+
+    Parameters:
+    text (str): The text to be encoded.
+    errors (str): 'strict' to raise on characters outside the alphabet, or 'ignore' to drop them.
+    alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+    tuple: The encoded bytes and the number of characters consumed, as codecs expects.
+
+    Raises:
+    UnicodeEncodeError: If errors is 'strict' and the text has a character outside the alphabet.
+    """
+    indices = alphabet.to_indices(text)
+
+    invalid = np.flatnonzero(indices == a.INVALID_INDEX)
+    if invalid.size:
+        if errors == 'strict':
+            start = int(invalid[0])
+            raise UnicodeEncodeError(CODEC_NAME, text, start, start + 1, "character not in the alphabet")
+        if errors != 'ignore':
+            raise ValueError(f"Unsupported error handler: {errors!r}; choose one of {', '.join(ERROR_HANDLERS)}.")
+        indices = np.delete(indices, invalid)
+
+    return indices.tobytes(), len(text)
+
+
+def decode(data, errors: str = 'strict', alphabet: a.Alphabet = a.SPANISH):
+    """
+    Decodes bytes holding alphabet positions back into text, with a single gather.
+
+    Parameters:
+    data (bytes-like): The encoded bytes.
+    errors (str): 'strict' to raise on bytes outside the alphabet, or 'ignore' to drop them.
+    alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+    tuple: The decoded text and the number of bytes consumed, as codecs expects.
+
+    Raises:
+    UnicodeDecodeError: If errors is 'strict' and a byte is not a position of the alphabet.
+    """
+    indices = np.frombuffer(data, dtype=np.uint8)
+
+    invalid = np.flatnonzero(indices >= len(alphabet))
+    if invalid.size:
+        if errors == 'strict':
+            start = int(invalid[0])
+            raise UnicodeDecodeError(CODEC_NAME, bytes(data), start, start + 1, "byte not in the alphabet")
+        if errors != 'ignore':
+            raise ValueError(f"Unsupported error handler: {errors!r}; choose one of {', '.join(ERROR_HANDLERS)}.")
+        indices = np.delete(indices, invalid)
+
+    return alphabet.decode(indices), len(indices) + len(invalid)
+
+
+class IncrementalEncoder(codecs.IncrementalEncoder):
+    def encode(self, input, final=False):
+        return encode(input, self.errors)[0]
+
+
+class IncrementalDecoder(codecs.IncrementalDecoder):
+    def decode(self, input, final=False):
+        return decode(input, self.errors)[0]
+
+
+class StreamWriter(codecs.StreamWriter):
+    def encode(self, input, errors='strict'):
+        return encode(input, errors)
+
+
+class StreamReader(codecs.StreamReader):
+    def decode(self, input, errors='strict'):
+        return decode(input, errors)
+
+
+def search(name: str):
+    """
+    Codec search function registered with codecs.register.
+
+    Parameters:
+    name (str): The normalized name of the requested encoding.
+
+    Returns:
+    codecs.CodecInfo: The codec information for CODEC_NAME (also accepted as 'spanish-27'), or None.
+    """
+    if name.replace('-', '_') not in (CODEC_NAME, 'spanish_27'):
+        return None
+    return codecs.CodecInfo(
+        name=CODEC_NAME,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader,
+    )
+
+
+# Importing this module is enough to use 'spanish27' with str.encode, bytes.decode and open()
+codecs.register(search)
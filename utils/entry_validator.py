@@ -1,4 +1,9 @@
+import math
+from utils import alphabet as a
 from utils import misc as m
+from utils import lazy
+
+np = lazy.lazy_import('numpy')
 
 # Custom exceptions to handle various input validation errors
 
@@ -20,8 +25,11 @@ class NotStringError(Exception):
 class NotInAlphabetError(Exception):
     """Exception raised when the input contains characters outside the Spanish alphabet."""
 
-    def __init__(self, message="La entrada contiene caracteres fuera del alfabeto español."):
+    def __init__(self, message="La entrada contiene caracteres fuera del alfabeto español.", position=None):
+        if position is not None:
+            message = f"{message} (posición {position + 1})"
         super().__init__(message)
+        self.position = position  # Index of the first invalid character, if known
 
 
 class BlankInputError(Exception):
@@ -45,6 +53,13 @@ class InvalidKeyError(Exception):
         super().__init__(message)
 
 
+class NonInvertibleKeyError(Exception):
+    """Exception raised when a Hill key has no inverse matrix, so the text could not be decrypted."""
+
+    def __init__(self, message="La matriz de la clave no es invertible módulo 27; elija una distinta."):
+        super().__init__(message)
+
+
 # Validation functions for input
 
 def validate_type(raw_input, expected_type):
@@ -87,10 +102,9 @@ def all_characters_in_alphabet(raw_input):
         raw_input if all characters are within the Spanish alphabet.
         Raises NotInAlphabetError if validation fails.
     """
-    alphabet = m.create_spanish_alphabet()  # Gets the Spanish alphabet
     # Convert to uppercase and remove spaces
     text_upper = raw_input.upper().replace(' ', '')
-    if not all(char in alphabet for char in text_upper):
+    if not a.SPANISH.is_valid(text_upper):
         # Returns exception if any character is outside the alphabet
         return NotInAlphabetError()
     return raw_input
@@ -110,3 +124,67 @@ def is_blank(raw_input):
     if raw_input.strip() == "":
         return BlankInputError()  # Returns exception if input is blank
     return raw_input
+
+
+def encode_input(raw_input, alphabet=a.SPANISH):
+    """
+    Validates a text and converts it into alphabet positions in a single vectorized pass,
+    so the cipher functions can use the result without scanning the text again.
+
+    The text is converted to uppercase and its spaces are removed, as in all_characters_in_alphabet.
+
+    Parameters:
+        raw_input (str): The input string to validate.
+        alphabet (Alphabet): The alphabet of the text. Defaults to the Spanish alphabet.
+
+    Returns:
+        np.ndarray with the alphabet position of every character if the input is valid.
+        Returns BlankInputError, NumericStringError or NotInAlphabetError (with the position of
+        the first invalid character) if validation fails.
+    """
+    if raw_input.strip() == "":
+        return BlankInputError()  # Returns exception if input is blank
+    if raw_input.isnumeric():
+        return NumericStringError()  # Returns exception if input is a numeric string
+
+    codepoints = m.text_to_codepoints(raw_input.upper())
+    indices = alphabet.lookup_codepoints(codepoints)
+
+    # Spaces are ignored; any other character outside the alphabet is reported
+    spaces = codepoints == ord(' ')
+    invalid = np.flatnonzero((indices == a.INVALID_INDEX) & ~spaces)
+    if invalid.size:
+        return NotInAlphabetError(position=int(invalid[0]))
+
+    return indices[~spaces]
+
+
+def validate_hill_key(raw_input, alphabet=a.SPANISH):
+    """
+    Checks that a text is a valid Hill cipher key: k * k letters of the alphabet (4, 9, 16...), read row by row,
+    whose matrix is invertible modulo the number of letters, i.e. its determinant shares no factor with it.
+
+    Parameters:
+        raw_input (str): The key to validate; it is converted to uppercase and its spaces are removed.
+        alphabet (Alphabet): The alphabet of the key. Defaults to the Spanish alphabet.
+
+    Returns:
+        The key in uppercase and without spaces if it is valid.
+        Returns BlankInputError, NotInAlphabetError, InvalidKeyError (if its length is not a perfect square)
+        or NonInvertibleKeyError if validation fails.
+    """
+    key = raw_input.upper().replace(' ', '')
+    if not key:
+        return BlankInputError()
+    if not alphabet.is_valid(key):
+        return NotInAlphabetError()
+
+    size = math.isqrt(len(key))
+    if size * size != len(key):
+        return InvalidKeyError("La longitud de la clave debe ser un cuadrado perfecto (4, 9, 16...).")
+
+    matrix = alphabet.encode(key).reshape(size, size)
+    if math.gcd(m.integer_determinant(matrix), len(alphabet)) != 1:
+        return NonInvertibleKeyError(
+            f"La matriz de la clave no es invertible módulo {len(alphabet)}; elija una distinta.")
+    return key
@@ -0,0 +1,338 @@
+import bisect
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the latency histogram buckets; a final bucket holds slower calls
+LATENCY_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+# Seconds between two stack samples of the sampling profiler
+SAMPLING_INTERVAL = 0.001
+
+
+class _State:
+    """Global switch and collected statistics, shared by every instrumented function."""
+
+    def __init__(self):
+        self.enabled = os.environ.get('CRYPTO_INSTRUMENTATION', '') not in ('', '0')
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.captures = {}  # Function name -> (mode, path) of the next call to profile
+
+
+_state = _State()
+
+
+class _Stats:
+    """Counters of a single instrumented function."""
+
+    __slots__ = ('calls', 'errors', 'seconds', 'bytes', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def enable():
+    """
+    Starts collecting statistics in every instrumented function.
+
+    Instrumentation can also be enabled at start-up with the CRYPTO_INSTRUMENTATION=1 environment variable.
+    """
+    _state.enabled = True
+
+
+def disable():
+    """Stops collecting statistics; instrumented functions then only pay for a flag check."""
+    _state.enabled = False
+
+
+def is_enabled() -> bool:
+    """Returns whether statistics are being collected."""
+    return _state.enabled
+
+
+def reset():
+    """Discards every collected statistic and pending profile capture."""
+    with _state.lock:
+        _state.stats.clear()
+        _state.captures.clear()
+
+
+def _size_of(value) -> int:
+    """
+    Returns the amount of data carried by an argument: bytes for arrays and buffers, characters for text,
+    records for lists.
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    try:
+        return len(value)
+    except TypeError:
+        return 0
+
+
+def _data_size(position, data, args, kwargs) -> int:
+    """
+    Returns the size of the data argument of a call, given by name or by position.
+    """
+    if data is None:
+        return 0
+    if data in kwargs:
+        return _size_of(kwargs[data])
+    return _size_of(args[position]) if position < len(args) else 0
+
+
+def _record(name: str, seconds: float, size: int, failed: bool):
+    """
+    Adds one call to the statistics of a function.
+
+    Parameters:
+        name (str): The name of the function.
+        seconds (float): The duration of the call.
+        size (int): The amount of data processed by the call.
+        failed (bool): Whether the call raised an exception.
+    """
+    with _state.lock:
+        stats = _state.stats.get(name)
+        if stats is None:
+            stats = _state.stats[name] = _Stats()
+        stats.calls += 1
+        stats.errors += failed
+        stats.seconds += seconds
+        stats.bytes += size
+        stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+@contextmanager
+def record(name: str, size: int = 0):
+    """
+    Context manager that records the enclosed block as one call of the given name.
+
+    Parameters:
+        name (str): The name under which the block is reported.
+        size (int): The amount of data processed by the block.
+    """
+    if not _state.enabled:
+        yield
+        return
+
+    failed = True
+    start = time.perf_counter()
+    try:
+        yield
+        failed = False
+    finally:
+        _record(name, time.perf_counter() - start, size, failed)
+
+
+def instrument(name: str = None, data: str = None):
+    """
+    Decorator that records the calls, time, data size and latency of a function while
+    instrumentation is enabled. When disabled, the only cost is a flag check per call.
+
+    A call counts as an error if it raises or returns an exception instance, as the ciphers
+    that report invalid keys the way the validators do.
+
+    Parameters:
+        name (str): The name under which the function is reported. Defaults to module.function.
+        data (str): The parameter holding the processed data, whose size (characters for text, bytes for
+            arrays and buffers, records for lists) is recorded. Without it, the size is not recorded.
+
+    Returns:
+        callable: The decorator.
+
+    Raises:
+        ValueError: If the function has no parameter named data.
+    """
+    def decorator(function):
+        label = name or f"{function.__module__}.{function.__qualname__}"
+        parameters = function.__code__.co_varnames[:function.__code__.co_argcount]
+        if data is not None and data not in parameters:
+            raise ValueError(f"{label} has no parameter named {data!r}.")
+        position = parameters.index(data) if data is not None else None
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return function(*args, **kwargs)
+            size = _data_size(position, data, args, kwargs)
+            if label in _state.captures:
+                return _profiled_call(label, function, args, kwargs, size)
+
+            failed = True
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+                failed = isinstance(result, Exception)
+                return result
+            finally:
+                _record(label, time.perf_counter() - start, size, failed)
+
+        wrapper.instrumented_name = label
+        return wrapper
+    return decorator
+
+
+def capture_next_call(function, path: str, mode: str = 'cprofile'):
+    """
+    Profiles the next call of an instrumented function while instrumentation is enabled.
+
+    Parameters:
+        function (callable or str): The instrumented function, or the name it is reported under.
+        path (str): The file where the profile is written: a pstats file for 'cprofile', or a text
+        file with one 'count stack' line per sampled stack for 'sampling'.
+        mode (str): 'cprofile' for a deterministic profile, or 'sampling' to sample the call stack
+        every SAMPLING_INTERVAL seconds, with a much smaller overhead.
+    """
+    if mode not in ('cprofile', 'sampling'):
+        raise ValueError("The capture mode must be 'cprofile' or 'sampling'.")
+    label = getattr(function, 'instrumented_name', function)
+    with _state.lock:
+        _state.captures[label] = (mode, path)
+
+
+def _profiled_call(label, function, args, kwargs, size):
+    """
+    Runs one call under the profiler armed by capture_next_call and records it as a regular call.
+    """
+    with _state.lock:
+        mode, path = _state.captures.pop(label, (None, None))
+    if mode is None:
+        return function(*args, **kwargs)
+
+    failed = True
+    start = time.perf_counter()
+    try:
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            try:
+                result = profiler.runcall(function, *args, **kwargs)
+            finally:
+                profiler.dump_stats(path)
+        else:
+            sampler = _Sampler(threading.get_ident())
+            sampler.start()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                sampler.stop(path)
+        failed = isinstance(result, Exception)
+        return result
+    finally:
+        _record(label, time.perf_counter() - start, size, failed)
+
+
+class _Sampler(threading.Thread):
+    """Background thread that periodically samples the call stack of another thread."""
+
+    def __init__(self, thread_id):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.samples = Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(SAMPLING_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{frame.f_code.co_filename}:{frame.f_code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self, path):
+        """Stops sampling and writes the collected stacks, most frequent first."""
+        self.done.set()
+        self.join()
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in self.samples.most_common():
+                output.write(f"{count} {stack}\n")
+
+
+def snapshot() -> dict:
+    """
+    Returns the collected statistics.
+
+    Returns:
+        dict: For every instrumented name, its calls, errors, total seconds, data size and latency
+        histogram (a list of [upper bound in seconds, calls] pairs, the last bound being '+Inf').
+    """
+    with _state.lock:
+        return {
+            name: {
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'seconds': stats.seconds,
+                'bytes': stats.bytes,
+                'histogram': [[bound, count] for bound, count in
+                              zip(LATENCY_BUCKETS + ('+Inf',), stats.histogram)],
+            }
+            for name, stats in _state.stats.items()
+        }
+
+
+def to_prometheus(stats: dict = None) -> str:
+    """
+    Formats the statistics in the Prometheus text exposition format.
+
+    Parameters:
+        stats (dict): The output of snapshot(). Defaults to the current statistics.
+
+    Returns:
+        str: The metrics text.
+    """
+    stats = snapshot() if stats is None else stats
+    lines = [
+        '# TYPE cipher_calls_total counter',
+        '# TYPE cipher_errors_total counter',
+        '# TYPE cipher_seconds_total counter',
+        '# TYPE cipher_bytes_total counter',
+        '# TYPE cipher_latency_seconds histogram',
+    ]
+
+    for name, values in stats.items():
+        label = f'function="{name}"'
+        lines.append(f'cipher_calls_total{{{label}}} {values["calls"]}')
+        lines.append(f'cipher_errors_total{{{label}}} {values["errors"]}')
+        lines.append(f'cipher_seconds_total{{{label}}} {values["seconds"]:.9f}')
+        lines.append(f'cipher_bytes_total{{{label}}} {values["bytes"]}')
+
+        cumulative = 0
+        for bound, count in values['histogram']:
+            cumulative += count
+            bound = bound if isinstance(bound, str) else f'{bound:g}'
+            lines.append(f'cipher_latency_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'cipher_latency_seconds_sum{{{label}}} {values["seconds"]:.9f}')
+        lines.append(f'cipher_latency_seconds_count{{{label}}} {values["calls"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_snapshot(path: str, format: str = 'json'):
+    """
+    Writes the current statistics to a local file.
+
+    Parameters:
+        path (str): The destination file.
+        format (str): 'json' or 'prometheus'.
+    """
+    if format not in ('json', 'prometheus'):
+        raise ValueError("The format must be 'json' or 'prometheus'.")
+
+    stats = snapshot()
+    with open(path, 'w', encoding='utf-8') as output:
+        if format == 'json':
+            json.dump(stats, output, indent=2)
+        else:
+            output.write(to_prometheus(stats))
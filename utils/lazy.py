@@ -0,0 +1,36 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Returns a module whose code only runs the first time one of its attributes is accessed.
+
+    Heavy dependencies such as NumPy are imported this way so that starting the application, or a
+    command line tool that exits early (e.g. with --help), does not pay for loading them.
+
+    Parameters:
+    name (str): The absolute name of the module, e.g. 'numpy'.
+
+    Returns:
+    module: The module, already loaded if it had been imported before.
+
+    Raises:
+    ModuleNotFoundError: If the module is not installed.
+    """
+    # A module that is already loaded gains nothing from deferring it
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    # The lazy loader replaces the module's class so that its first attribute access executes it
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,26 +1,42 @@
-import numpy as np
+import unicodedata
+from utils import alphabet as a
+from utils import instrumentation as i
+from utils import lazy
 
+np = lazy.lazy_import('numpy')
 
+
+@i.instrument(data='lists')
 def lists_to_columns(lists):
     """
     Converts a list of strings into a 2D NumPy array, where each string is treated as a row, 
     and each character in the string is a separate column.
     Then, it transposes the array, converting rows into columns.
 
+    The array is built from the code points of the joined strings, without a Python object per character.
+
     Parameters:
     lists (list of str): A list of words or strings where each word represents a row in the resulting array.
 
     Returns:
     np.ndarray: A 2D NumPy array where each original word's characters are now columns.
     """
-    # Convert each word in the list to a list of characters, then create a 2D NumPy array
-    array = np.array([list(word) for word in lists])
+    width = len(lists[0]) if len(lists) else 0
+
+    # Rows of different lengths (or no characters at all) keep the behaviour of np.array on lists
+    if not width or any(len(word) != width for word in lists):
+        return np.array([list(word) for word in lists]).T
+
+    # View the code points of all the words as a (rows, width) grid of one-character strings
+    # (copied once, since the code points of a str are read-only)
+    array = text_to_codepoints(''.join(lists)).copy().reshape(len(lists), width).view('<U1')
 
     # Transpose the array so rows become columns
     transposed_array = array.T
     return transposed_array
 
 
+@i.instrument(data='word')
 def word_to_alphabet_positions(word):
     """
     Converts each character in a given word to its corresponding position in the alphabet, 
@@ -37,20 +53,100 @@ def word_to_alphabet_positions(word):
     return [ord(char) - ord('A') for char in word.upper()]
 
 
+@i.instrument()
 def create_spanish_alphabet():
     """
-    Creates and returns a list containing the uppercase letters of the Spanish alphabet.ß
+    Returns the uppercase Spanish alphabet, including the letter 'Ñ'.
+
+    The alphabet is built once per process and shared by every caller. It behaves like a list
+    of characters (len(), iteration, indexing, 'in' and index()) with O(1) lookups.
 
     Returns:
-    list: A list of characters representing the uppercase Spanish alphabet.
+    Alphabet: The shared Spanish alphabet.
     """
-    # Create a list of the uppercase Spanish alphabet, including the letter 'Ñ'.
-    alphabet = list("ABCDEFGHIJKLMNÑOPQRSTUVWXYZ")
+    return a.SPANISH
 
-    # Return the alphabet as a list of characters.
-    return alphabet
 
+def text_to_codepoints(text):
+    """
+    Converts a text into an array with the Unicode code point of each character,
+    without creating a Python object per character.
+
+    Parameters:
+    text (str): The text to be converted.
+
+    Returns:
+    np.ndarray: A uint32 array with one code point per character.
+    """
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
 
+
+def codepoints_to_text(codepoints):
+    """
+    Converts an array of Unicode code points back into text.
+
+    Parameters:
+    codepoints (np.ndarray): An array of code points.
+
+    Returns:
+    str: The text formed by the given code points.
+    """
+    # Decode straight from the array's memory, without copying it into a bytes object first
+    return str(np.ascontiguousarray(codepoints, dtype=np.uint32).data, 'utf-32-le')
+
+
+@i.instrument(data='text')
+def remove_accents(text):
+    """
+    Converts a text to uppercase and removes its accents and other diacritics, keeping the letter 'Ñ'.
+
+    Parameters:
+    text (str): The text to be normalized.
+
+    Returns:
+    str: The uppercase text without diacritics.
+    """
+    # Protect 'Ñ' so that decomposing the text does not separate its tilde
+    text = text.upper().replace('Ñ', '\0')
+    decomposed = unicodedata.normalize('NFD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return stripped.replace('\0', 'Ñ')
+
+
+def integer_determinant(matrix):
+    """
+    Computes the exact determinant of an integer matrix with the fraction-free Bareiss elimination,
+    using Python integers so that no rounding or overflow can occur.
+
+    Parameters:
+    matrix (sequence of sequences or np.ndarray): A square matrix of integers.
+
+    Returns:
+    int: The determinant (1 for an empty matrix).
+    """
+    rows = [[int(value) for value in row] for row in matrix]
+    size = len(rows)
+    sign, previous = 1, 1
+
+    for k in range(size - 1):
+        # Bring a row with a nonzero pivot to position k, changing the sign of the determinant
+        if rows[k][k] == 0:
+            pivot = next((row for row in range(k + 1, size) if rows[row][k]), None)
+            if pivot is None:
+                return 0
+            rows[k], rows[pivot] = rows[pivot], rows[k]
+            sign = -sign
+
+        # Every division is exact in the Bareiss elimination
+        for row in range(k + 1, size):
+            for column in range(k + 1, size):
+                rows[row][column] = (rows[row][column] * rows[k][k] - rows[row][k] * rows[k][column]) // previous
+        previous = rows[k][k]
+
+    return sign * rows[-1][-1] if size else 1
+
+
+@i.instrument(data='text')
 def fill_text(text, length):
     """
     Fills the input text until it reaches the specified length by repeating the original text.
@@ -59,19 +155,25 @@ def fill_text(text, length):
     If the desired length is smaller than or equal to the text's length, it will return the original text.
 
     Parameters:
-    text (str): The text to be filled.
+    text (str or np.ndarray): The text to be filled, or an array such as its code points.
     length (int): The desired length of the output string.
 
     Returns:
-    str: The text filled up to the specified length.
+    str or np.ndarray: The text filled up to the specified length, of the same type as the input.
     """
+    if isinstance(text, np.ndarray):
+        # Arrays (code points or alphabet positions) are repeated with a single resize
+        return text[:length] if length <= len(text) else np.resize(text, length)
+
     # If the length is less than or equal to the original text, return the original text.
+    # Otherwise, repeating a str copies its native representation at once, which is faster than any array round trip.
     repeated_text = text[:length] if length <= len(
         text) else (text * (length // len(text) + 1))[:length]
 
     return repeated_text
 
 
+@i.instrument(data='sentence')
 def split_sentence_into_columns(sentence, columns):
     """
     Splits a sentence into columns, filling each column with consecutive letters from the sentence. 
@@ -85,33 +187,45 @@ def split_sentence_into_columns(sentence, columns):
     np.ndarray: A 2D NumPy array where each row contains a segment of the sentence, 
     with letters wrapped as necessary.
     """
-    # Remove spaces from the sentence and create a NumPy array of letters
-    letters = np.array(list(sentence.replace(" ", "")))
+    # Remove spaces from the sentence and view its code points as an array, without per-letter strings
+    letters = text_to_codepoints(sentence.replace(" ", ""))
 
     # Calculate the required number of rows based on the number of columns
-    rows = int(np.ceil(len(letters) / columns))
+    rows = -(-len(letters) // columns)
 
-    # Pad the letters array to ensure it fills the grid fully, wrapping extra letters if needed
-    padded_letters = np.pad(
-        letters, (0, rows * columns - len(letters)), mode='wrap')
+    # Repeat the letters from the start to fill the grid fully, wrapping extra letters if needed
+    padded_letters = np.resize(letters, rows * columns)
 
-    # Reshape the padded array into the specified number of rows and columns
-    result = padded_letters.reshape(rows, columns)
+    # Reshape the padded array into the specified number of rows and columns of one-character strings
+    result = padded_letters.reshape(rows, columns).view('<U1')
     return result
 
 
+@i.instrument(data='array')
 def columns_to_words(array):
     """
     Concatenates characters in each column of a 2D array into words, treating each column as a separate word. 
     Empty cells are ignored.
 
+    Arrays of one-character strings are decoded in a single pass and only sliced once per word.
+
     Parameters:
     array (np.ndarray): A 2D NumPy array where each column represents a separate word to be formed.
 
     Returns:
     list of str: A list of words created by concatenating characters in each column.
     """
-    # Join each character in each column to form a word, ignoring any empty cells
-    words = [''.join([char for char in array[:, i] if char])
-             for i in range(array.shape[1])]
+    # Arrays of other string types keep the character by character join
+    if array.dtype != np.dtype('<U1'):
+        return [''.join([char for char in array[:, i] if char])
+                for i in range(array.shape[1])]
+
+    # Lay the columns out one after the other as code points; empty cells are zeros
+    codepoints = np.ascontiguousarray(array.T).view(np.uint32)
+    filled = codepoints != 0
+
+    # Decode every column at once, then cut the text into one word per column
+    text = codepoints_to_text(codepoints[filled] if not filled.all() else codepoints.ravel())
+    lengths = filled.sum(axis=1)
+    words = [text[end - length:end] for end, length in zip(np.cumsum(lengths).tolist(), lengths.tolist())]
     return words